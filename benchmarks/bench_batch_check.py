@@ -0,0 +1,71 @@
+"""Benchmark: vectorized batch validation against looping check_board.
+
+Builds a batch of boards from a solved grid with cells blanked out and a
+tenth of the boards corrupted (fixed seed), then times
+``batch_check.check_boards`` on the whole batch against ``logic.check_board``
+on a sample of nested-list boards. Requires NumPy.
+
+Run from the repository root (the batch size is optional):
+
+    python benchmarks/bench_batch_check.py 1000000
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# pylint: disable=wrong-import-position
+import numpy as np
+
+import logic
+from batch_check import check_boards
+from constants import EXAMPLE_BOARD
+
+SEED = 1234
+SAMPLE = 20_000
+
+
+def make_boards(count: int) -> np.ndarray:
+    """Returns ``count`` boards, about 10% of them invalid."""
+
+    rng = np.random.default_rng(SEED)
+    boards = np.repeat(np.array(EXAMPLE_BOARD, dtype=np.uint8)[None], count, axis=0)
+    boards[rng.random(boards.shape) < 0.6] = 0
+
+    corrupt = rng.integers(0, count, count // 10)
+    rows = rng.integers(0, 9, len(corrupt))
+    cols = rng.integers(0, 9, len(corrupt))
+    boards[corrupt, rows, cols] = rng.integers(1, 10, len(corrupt))
+
+    return boards
+
+
+def main(count: int = 1_000_000) -> None:
+    """Prints boards per second for both validators."""
+
+    boards = make_boards(count)
+
+    start = time.perf_counter()
+    valid, _ = check_boards(boards)
+    vectorized = count / (time.perf_counter() - start)
+
+    sample = boards[:SAMPLE].tolist()
+    start = time.perf_counter()
+    looped = [logic.check_board(board) for board in sample]
+    scalar = len(sample) / (time.perf_counter() - start)
+
+    assert looped == valid[:SAMPLE].tolist()
+
+    print(f"boards: {count}, invalid: {count - int(valid.sum())}")
+    print(f"logic.check_board loop   {scalar:12,.0f} boards/s")
+    print(
+        f"batch_check.check_boards {vectorized:12,.0f} boards/s"
+        f"  {vectorized / scalar:5.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
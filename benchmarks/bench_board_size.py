@@ -0,0 +1,90 @@
+"""Benchmark: memory footprint and copy cost of Board against CompactBoard.
+
+Sizes are measured by walking every object reachable from a board with
+``sys.getsizeof``, counting each object once. Small ints and other shared
+singletons are left out since every board shares them. Copies are timed
+with ``deepcopy`` for :class:`board.Board` (what ``main.py`` uses) and
+:meth:`compact_board.CompactBoard.copy`.
+
+Run from the repository root:
+
+    python benchmarks/bench_board_size.py
+"""
+
+import os
+import sys
+import timeit
+from copy import deepcopy
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# pylint: disable=wrong-import-position
+from board import Board
+from compact_board import CompactBoard
+from utils import parse_puzzle_string
+
+PUZZLE = (
+    "050703060007000800000816000"
+    "000030000005000100730040086"
+    "906000204840572093000409000"
+)
+
+SHARED = (type, type(None), bool)
+
+
+def deep_size(obj, seen: set[int] | None = None) -> int:
+    """Bytes of every object reachable from ``obj`` that it owns."""
+
+    seen = set() if seen is None else seen
+    if id(obj) in seen or isinstance(obj, SHARED):
+        return 0
+    if isinstance(obj, int) and -5 <= obj <= 256:
+        return 0
+
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        size += sum(deep_size(k, seen) + deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size(item, seen) for item in obj)
+    elif isinstance(obj, Board):
+        size += deep_size(vars(obj), seen)
+    elif hasattr(type(obj), "__slots__"):
+        for cls in type(obj).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if hasattr(obj, name):
+                    size += deep_size(getattr(obj, name), seen)
+
+    return size
+
+
+def main() -> None:
+    """Prints bytes per board and copy latency for both classes."""
+
+    board = Board(parse_puzzle_string(PUZZLE))
+    for i in range(9):
+        for j in range(9):
+            if not board.state[i][j]:
+                board.set_marks(i, j, board.engine.candidates(i, j))
+
+    compact = CompactBoard.from_board(board)
+
+    sizes = {"Board": deep_size(board), "CompactBoard": deep_size(compact)}
+    copies = {
+        "Board": min(timeit.repeat(lambda: deepcopy(board), number=200, repeat=5))
+        / 200,
+        "CompactBoard": min(timeit.repeat(compact.copy, number=20000, repeat=5))
+        / 20000,
+    }
+
+    for name, size in sizes.items():
+        print(
+            f"{name:<13} {size:7,d} B/board  {sizes['Board'] / size:5.1f}x"
+            f"   copy {copies[name] * 1e6:8.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Microbenchmark: list-based move checks against the bitmask candidate engine.
+
+Compares the original ``logic.check_move`` implementation (fresh column and
+square lists plus ``list.count``) with the mask-based ``logic.check_move`` and
+with :class:`candidates.CandidateEngine` on a full 81x9 pencil-mark sweep, the
+work ``Board.check_pencil_marks`` does after every move.
+
+Run from the repository root:
+
+    python benchmarks/bench_candidates.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+)
+
+# pylint: disable=wrong-import-position
+import logic
+from candidates import CandidateEngine
+from utils import parse_puzzle_string
+
+PUZZLE = (
+    "050703060007000800000816000"
+    "000030000005000100730040086"
+    "906000204840572093000409000"
+)
+
+
+def legacy_check_move(state: list[list[int]], row: int, col: int, num: int) -> bool:
+    """The list-based check_move this benchmark measures against."""
+
+    sqr = (row // 3) * 3 + (col // 3)
+    srow, scol = (sqr // 3) * 3, (sqr % 3) * 3
+    column = [state[i][col] for i in range(9)]
+    square = [state[i][j] for i in range(srow, srow + 3) for j in range(scol, scol + 3)]
+    return (
+        state[row].count(num) == 0 and column.count(num) == 0 and square.count(num) == 0
+    )
+
+
+def sweep(check, state: list[list[int]]) -> int:
+    """Runs a check on every (cell, digit) pair, like a pencil-mark rescan."""
+
+    total = 0
+    for i in range(9):
+        for j in range(9):
+            for k in range(1, 10):
+                total += check(state, i, j, k)
+    return total
+
+
+def engine_sweep(engine: CandidateEngine) -> int:
+    """Same sweep answered from the incrementally maintained masks."""
+
+    total = 0
+    for i in range(9):
+        for j in range(9):
+            total += engine.candidates(i, j).bit_count()
+    return total
+
+
+def main(repeat: int = 200) -> None:
+    """Times each variant and prints the per-sweep cost and speedup."""
+
+    state = parse_puzzle_string(PUZZLE)
+    engine = CandidateEngine(state)
+
+    assert sweep(legacy_check_move, state) == sweep(logic.check_move, state)
+    assert sweep(logic.check_move, state) == engine_sweep(engine)
+
+    variants = {
+        "legacy check_move (lists)": lambda: sweep(legacy_check_move, state),
+        "logic.check_move (masks)": lambda: sweep(logic.check_move, state),
+        "CandidateEngine": lambda: engine_sweep(engine),
+    }
+
+    baseline = None
+    for name, func in variants.items():
+        seconds = min(timeit.repeat(func, number=repeat, repeat=5)) / repeat
+        baseline = baseline or seconds
+        print(f"{name:<28} {seconds * 1e6:10.1f} us/sweep  {baseline / seconds:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark: Dancing Links backend against the propagation solver.
+
+For every backend, reports solves/second on ``data/puzzles.txt`` and the
+latency of proving uniqueness (``count_solutions(grid, limit=2)``) per
+puzzle, plus the same proof on an empty board. ``dlx.select_first`` is left
+out: without the minimum-size heuristic some puzzles take seconds each.
+
+Run from the repository root:
+
+    python benchmarks/bench_dlx.py
+"""
+
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# pylint: disable=wrong-import-position
+import dlx
+import solver
+from utils import parse_puzzle_string
+
+BACKENDS = {
+    "solver": (solver.solve_many, solver.count_solutions),
+    "dlx select_min": (
+        lambda puzzles: dlx.solve_many(puzzles, select=dlx.select_min),
+        lambda grid: dlx.count_solutions(grid, select=dlx.select_min),
+    ),
+}
+
+
+def load_puzzles() -> list[str]:
+    """Reads the puzzle strings of the bundled file."""
+
+    with open(os.path.join(ROOT, "data", "puzzles.txt"), encoding="utf-8") as file:
+        return [line.split()[1] for line in file if line.strip()]
+
+
+def main() -> None:
+    """Runs every backend and prints one line per backend."""
+
+    puzzles = load_puzzles()
+    grids = [parse_puzzle_string(puzzle_str) for puzzle_str in puzzles]
+    empty = [[0] * 9 for _ in range(9)]
+
+    print(
+        f"{'backend':<18} {'solves/s':>9} {'p50 proof':>10} "
+        f"{'p95 proof':>10} {'max proof':>10} {'empty board':>12}"
+    )
+
+    for name, (solve_many, count_solutions) in BACKENDS.items():
+        start = time.perf_counter()
+        list(solve_many(puzzles))
+        rate = len(puzzles) / (time.perf_counter() - start)
+
+        latencies = []
+        for grid in grids:
+            start = time.perf_counter()
+            count_solutions(grid)
+            latencies.append((time.perf_counter() - start) * 1e3)
+
+        start = time.perf_counter()
+        count_solutions(empty)
+        empty_ms = (time.perf_counter() - start) * 1e3
+
+        quantiles = statistics.quantiles(latencies, n=20)
+        print(
+            f"{name:<18} {rate:9.0f} {quantiles[9]:8.2f}ms "
+            f"{quantiles[18]:8.2f}ms {max(latencies):8.2f}ms {empty_ms:10.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark: puzzle generation throughput.
+
+Generates puzzles in every difficulty band with ``generator.generate_many``
+and reports puzzles/minute and the average number of clues.
+
+``generate_many`` is also timed with ``workers`` processes, on ``count``
+puzzles per worker, and checked against the target of ``TARGET``
+puzzles/minute.
+
+Run from the repository root:
+
+    python benchmarks/bench_generator.py [count] [workers]
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# pylint: disable=wrong-import-position
+import generator
+
+TARGET = 20_000
+
+
+def main(count: int = 200, workers: int = os.cpu_count() or 1) -> None:
+    """Times generation in every band, then in parallel."""
+
+    for difficulty in (None, *generator.BANDS):
+        start = time.perf_counter()
+        puzzles = list(generator.generate_many(count, difficulty, seed=1))
+        seconds = time.perf_counter() - start
+
+        clues = sum(81 - puzzle_str.count("0") for puzzle_str, _ in puzzles)
+        print(
+            f"{difficulty or 'any':8} {len(puzzles) / seconds * 60:10.0f} puzzles/min"
+            f"  ({clues / len(puzzles):.1f} clues on average,"
+            f" {count - len(puzzles)} short)"
+        )
+
+    start = time.perf_counter()
+    puzzles = list(generator.generate_many(count * workers, None, workers, seed=1))
+    rate = len(puzzles) / (time.perf_counter() - start) * 60
+    print(
+        f"any x{workers:<3} {rate:10.0f} puzzles/min"
+        f"  (target {TARGET}: {'met' if rate >= TARGET else 'missed'})"
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,56 @@
+"""Benchmark: grading throughput on the bundled puzzle file.
+
+Grades every puzzle in ``data/puzzles.txt`` with ``grader.grade_many``,
+reporting puzzles/second, how often each technique was the hardest one a
+puzzle needed, and how far the scores are from the file's own ratings.
+
+Run from the repository root:
+
+    python benchmarks/bench_grader.py [workers]
+"""
+
+import os
+import sys
+import time
+from collections import Counter
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# pylint: disable=wrong-import-position
+import grader
+
+
+def load_rated() -> list[tuple[str, float]]:
+    """Reads the puzzle strings and ratings of the bundled file."""
+
+    with open(os.path.join(ROOT, "data", "puzzles.txt"), encoding="utf-8") as file:
+        rows = [line.split() for line in file if line.strip()]
+    return [(row[1], float(row[2])) for row in rows]
+
+
+def main(workers: int = 1) -> None:
+    """Grades the bundled file and compares with its ratings."""
+
+    rated = load_rated()
+    puzzles = [puzzle_str for puzzle_str, _ in rated]
+
+    start = time.perf_counter()
+    scores = list(grader.grade_many(puzzles, workers))
+    seconds = time.perf_counter() - start
+
+    print(f"grade_many ({workers} worker(s))  {len(puzzles) / seconds:8.0f} puzzles/s")
+
+    hardest = Counter(
+        max(result.techniques, key=grader.RATINGS.__getitem__)
+        for result in map(grader.grade_string, puzzles)
+    )
+    for technique, rating in grader.RATINGS.items():
+        print(f"  {technique:22} {rating:4.1f}  {hardest[technique]:6d}")
+
+    error = sum(abs(score - rating) for score, (_, rating) in zip(scores, rated))
+    print(f"mean |score - rating|  {error / len(rated):.2f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,57 @@
+"""Benchmark: latency of a hint at every position of a hinted game.
+
+Plays puzzles of ``data/puzzles.txt`` to the end by asking
+``hints.find_hint`` (without a budget) and applying each hint, timing every
+call. Reports the median and tail latencies in microseconds and how many
+games ran out of techniques.
+
+Run from the repository root:
+
+    python benchmarks/bench_hints.py [puzzles]
+"""
+
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# pylint: disable=wrong-import-position
+from board import Board
+from hints import apply_hint, find_hint
+from utils import parse_puzzle_string
+
+
+def main(puzzles: int = 200) -> None:
+    """Plays hinted games and prints the hint latencies."""
+
+    with open(os.path.join(ROOT, "data", "puzzles.txt"), encoding="utf-8") as file:
+        strings = [line.split()[1] for line in file if line.strip()]
+
+    timings = []
+    stuck = 0
+
+    for puzzle_str in random.Random(1234).sample(strings, puzzles):
+        board = Board(parse_puzzle_string(puzzle_str))
+        while board.zeroes:
+            start = time.perf_counter_ns()
+            hint = find_hint(board, budget=None)
+            timings.append(time.perf_counter_ns() - start)
+
+            if hint is None:
+                stuck += 1
+                break
+            apply_hint(board, hint)
+
+    timings.sort()
+    print(f"hints           {len(timings):8d}")
+    for label, quantile in (("median", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        print(f"{label:15} {timings[int(len(timings) * quantile)] / 1000:8.1f} us")
+    print(f"max             {timings[-1] / 1000:8.1f} us")
+    print(f"stuck games     {stuck:8d} / {puzzles}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
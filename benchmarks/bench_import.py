@@ -0,0 +1,107 @@
+"""Benchmark: streaming bulk import against per-row inserts.
+
+Writes a synthetic dump in the ``puzzles.txt`` layout (random 25-clue
+strings, fixed seed, so no two lines share a canonical form) and imports it
+with ``db_utils.import_puzzles``. The same dump then goes through the
+original one-``execute``-per-line loop for comparison.
+
+Canonical forms and solutions are computed by the backfills after the
+import; they are timed separately on the first ``annotate_lines`` lines, as
+they run at thousands of rows per second per process rather than the
+import's tens of thousands.
+
+Run from the repository root:
+
+    python benchmarks/bench_import.py [lines] [workers] [annotate_lines]
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# pylint: disable=wrong-import-position
+import db_utils
+
+SEED = 1234
+
+
+def write_dump(path: str, lines: int) -> None:
+    """Writes ``lines`` synthetic puzzle lines with ratings."""
+
+    rng = random.Random(SEED)
+    with open(path, "w", encoding="utf-8") as file:
+        for number in range(lines):
+            cells = ["0"] * 81
+            for idx in rng.sample(range(81), 25):
+                cells[idx] = str(rng.randint(1, 9))
+            puzzle_str = "".join(cells)
+            rating = round(rng.uniform(1.0, 4.0), 1)
+            file.write(f"{number:012x} {puzzle_str}  {rating}\n")
+
+
+def legacy_import(file_path: str, db_name: str) -> None:
+    """The per-line execute loop this benchmark measures against."""
+
+    sql = "INSERT OR IGNORE INTO puzzles (puzzle_string, difficulty) VALUES (?, ?);"
+    with open(file_path, "r", encoding="utf-8") as file, sqlite3.connect(
+        db_name
+    ) as conn:
+        cursor = conn.cursor()
+        for line in file:
+            _, puzzle_str, _, rating = line.strip().split(" ")
+            cursor.execute(
+                sql, (puzzle_str, db_utils.rating_to_difficulty(float(rating)))
+            )
+
+
+def main(
+    lines: int = 2_000_000, workers: int = 1, annotate_lines: int = 20_000
+) -> None:
+    """Times both import paths and the backfills and prints rows/second."""
+
+    with tempfile.TemporaryDirectory() as folder:
+        dump = os.path.join(folder, "dump.txt")
+        write_dump(dump, lines)
+
+        db_name = os.path.join(folder, "stream.db")
+        db_utils.setup_database(db_name)
+        report = db_utils.import_puzzles(dump, db_name)
+        print(
+            f"import_puzzles   {report.lines:>9} lines in {report.seconds:6.2f}s"
+            f"  {report.rate:10.0f} rows/s"
+        )
+
+        db_name = os.path.join(folder, "legacy.db")
+        db_utils.setup_database(db_name)
+        start = time.perf_counter()
+        legacy_import(dump, db_name)
+        seconds = time.perf_counter() - start
+        print(
+            f"per-line execute {lines:>9} lines in {seconds:6.2f}s"
+            f"  {lines / seconds:10.0f} rows/s"
+        )
+
+        dump = os.path.join(folder, "annotate.txt")
+        write_dump(dump, annotate_lines)
+
+        db_name = os.path.join(folder, "annotate.db")
+        db_utils.setup_database(db_name)
+        db_utils.import_puzzles(dump, db_name)
+        start = time.perf_counter()
+        db_utils.backfill_canonical(db_name, workers=workers)
+        db_utils.backfill_solution(db_name, workers=workers)
+        seconds = time.perf_counter() - start
+        print(
+            f"backfills        {annotate_lines:>9} lines in {seconds:6.2f}s"
+            f"  {annotate_lines / seconds:10.0f} rows/s  ({workers} workers)"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
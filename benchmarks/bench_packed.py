@@ -0,0 +1,97 @@
+"""Benchmark: packed binary puzzles against the text dump.
+
+Writes a synthetic dump in the ``puzzles.txt`` layout, converts it to the
+packed format and compares the file sizes, the cost of reading one puzzle
+by index, and a full sequential pass.
+
+Run from the repository root (the record count is optional):
+
+    python benchmarks/bench_packed.py 1000000
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# pylint: disable=wrong-import-position
+import packed
+from utils import parse_puzzle_line
+
+SEED = 1234
+
+
+def write_dump(path: str, rows: int) -> None:
+    """Writes ``rows`` random puzzles in the ``puzzles.txt`` layout."""
+
+    rng = random.Random(SEED)
+    with open(path, "w", encoding="utf-8") as file:
+        for number in range(rows):
+            puzzle = "".join(rng.choice("0000123456789") for _ in range(81))
+            file.write(f"{number:012x} {puzzle}  {rng.choice((1.2, 2.0, 3.1))}\n")
+
+
+def main(rows: int = 200_000) -> None:
+    """Prints footprint and access timings for both formats."""
+
+    rng = random.Random(SEED)
+
+    with tempfile.TemporaryDirectory() as folder:
+        txt_path = os.path.join(folder, "puzzles.txt")
+        packed_path = os.path.join(folder, "puzzles.sdkp")
+        write_dump(txt_path, rows)
+
+        start = time.perf_counter()
+        packed.convert_text(txt_path, packed_path)
+        convert = time.perf_counter() - start
+
+        txt_size, packed_size = os.path.getsize(txt_path), os.path.getsize(packed_path)
+        print(f"rows: {rows}, conversion: {convert:.2f}s")
+        print(f"text dump   {txt_size / rows:6.1f} B/puzzle")
+        print(
+            f"packed      {packed_size / rows:6.1f} B/puzzle"
+            f"  {txt_size / packed_size:4.2f}x smaller"
+        )
+
+        # The text dump has no index: reaching line i means reading the
+        # lines before it, so random access is timed against a line list
+        # already held in memory (the best case for text).
+        with open(txt_path, "r", encoding="utf-8") as file:
+            lines = file.readlines()
+
+        indices = [rng.randrange(rows) for _ in range(100_000)]
+
+        start = time.perf_counter()
+        for index in indices:
+            parse_puzzle_line(lines[index])
+        text_random = (time.perf_counter() - start) / len(indices)
+
+        with packed.PackedPuzzles(packed_path) as puzzles:
+            start = time.perf_counter()
+            for index in indices:
+                puzzles.puzzle(index)
+            packed_random = (time.perf_counter() - start) / len(indices)
+
+            start = time.perf_counter()
+            for record in puzzles.records():
+                packed.unpack_puzzle(record)
+            packed_scan = time.perf_counter() - start
+            del record
+
+        start = time.perf_counter()
+        with open(txt_path, "r", encoding="utf-8") as file:
+            for line in file:
+                parse_puzzle_line(line)
+        text_scan = time.perf_counter() - start
+
+        print(f"random read  text (in memory) {text_random * 1e6:6.2f} us", end="")
+        print(f"  packed (mmap) {packed_random * 1e6:6.2f} us")
+        print(f"full scan    text {text_scan:6.2f} s  packed {packed_scan:6.2f} s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
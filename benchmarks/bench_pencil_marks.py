@@ -0,0 +1,105 @@
+"""Benchmark: per-move pencil-mark maintenance.
+
+Times a set_cell/clear_cell cycle on a board whose empty cells are fully
+pencilled, with the original full rescan (729 ``logic.check_move`` calls on
+sets after every placement) against the incremental peer updates of
+:class:`board.Board`.
+
+Run from the repository root:
+
+    python benchmarks/bench_pencil_marks.py
+"""
+
+import os
+import sys
+import timeit
+from copy import deepcopy as copy
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# pylint: disable=wrong-import-position
+import logic
+from board import Board
+from utils import parse_puzzle_string
+
+PUZZLE = (
+    "050703060007000800000816000"
+    "000030000005000100730040086"
+    "906000204840572093000409000"
+)
+
+
+class LegacyBoard(Board):
+    """Board keeping its marks in plain sets, rescanned after every move."""
+
+    def __init__(self, initial_state: list[list[int]]):
+        super().__init__(initial_state)
+        self.legacy_marks = [[set() for _ in range(9)] for _ in range(9)]
+
+    def _remove_marks(self, idx: int, value: int) -> int:
+        for i in range(9):
+            for j in range(9):
+                if (i, j) in self.initial_cells:
+                    continue
+
+                current_marks = self.legacy_marks[i][j]
+                for k in range(1, 10):
+                    if not logic.check_move(self.state, i, j, k):
+                        if k in current_marks:
+                            current_marks.remove(k)
+        return 0
+
+    def _restore_marks(self, idx: int, value: int) -> int:
+        return 0
+
+
+def pencilled(board_class) -> Board:
+    """Returns a board with every empty cell holding all its candidates."""
+
+    board = board_class(parse_puzzle_string(PUZZLE))
+    for i in range(9):
+        for j in range(9):
+            if not board.state[i][j]:
+                mask = board.engine.candidates(i, j)
+                board.set_marks(i, j, mask)
+                if isinstance(board, LegacyBoard):
+                    board.legacy_marks[i][j] = set(board.pencil_marks[i][j])
+    return board
+
+
+def moves(board: Board) -> list[tuple[int, int, int]]:
+    """Every legal (row, col, digit) placement on the board."""
+
+    return [
+        (i, j, k)
+        for i in range(9)
+        for j in range(9)
+        for k in range(1, 10)
+        if not board.state[i][j] and board.engine.allows(i, j, k)
+    ]
+
+
+def main(repeat: int = 5) -> None:
+    """Prints the mean latency of a set/clear cycle for both boards."""
+
+    results = {}
+    for name, board_class in (("full rescan", LegacyBoard), ("incremental", Board)):
+        board = pencilled(board_class)
+        legal = moves(board)
+
+        def cycle(board=board, legal=legal):
+            for i, j, k in legal:
+                board.set_cell(i, j, k)
+                board.clear_cell(i, j)
+
+        seconds = min(timeit.repeat(cycle, number=1, repeat=repeat))
+        results[name] = seconds / len(legal)
+
+    baseline = results["full rescan"]
+    for name, seconds in results.items():
+        print(f"{name:<12} {seconds * 1e6:8.1f} us/move  {baseline / seconds:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
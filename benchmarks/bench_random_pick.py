@@ -0,0 +1,86 @@
+"""Benchmark: random puzzle selection latency against table size.
+
+Builds synthetic puzzle tables of growing size (three difficulties, fixed
+seed) and times ``db_utils.load_puzzle_from_db`` against the original
+``ORDER BY RANDOM() LIMIT 1`` query. The indexed pick should stay flat while
+the original grows with the number of rows.
+
+Run from the repository root (sizes are optional):
+
+    python benchmarks/bench_random_pick.py 1000 100000 1000000 10000000
+"""
+
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# pylint: disable=wrong-import-position
+import db_utils
+
+SEED = 1234
+DIFFICULTIES = ("easy", "medium", "hard")
+
+
+def build_db(db_name: str, rows: int) -> None:
+    """Fills a fresh database with ``rows`` synthetic puzzles."""
+
+    rng = random.Random(SEED)
+    db_utils.setup_database(db_name)
+
+    with sqlite3.connect(db_name) as conn:
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.executemany(
+            "INSERT INTO puzzles (puzzle_string, difficulty) VALUES (?, ?)",
+            ((f"{number:081d}", rng.choice(DIFFICULTIES)) for number in range(rows)),
+        )
+    conn.close()
+    db_utils.number_puzzles(db_name)
+
+
+def legacy_pick(db_name: str, difficulty: str) -> str:
+    """The ORDER BY RANDOM() query this benchmark measures against."""
+
+    with sqlite3.connect(f"file:{db_name}?mode=ro", uri=True) as conn:
+        return conn.execute(
+            "SELECT puzzle_string FROM puzzles "
+            "WHERE difficulty = ? ORDER BY RANDOM() LIMIT 1",
+            (difficulty,),
+        ).fetchone()[0]
+
+
+def mean_ms(func, repeat: int) -> float:
+    """Mean wall-clock milliseconds of ``repeat`` calls."""
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e3
+
+
+def main(sizes: list[int]) -> None:
+    """Prints the mean pick latency of both strategies for every size."""
+
+    print(f"{'rows':>10} {'indexed':>10} {'ORDER BY RANDOM()':>18}")
+
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as folder:
+            db_name = os.path.join(folder, "bench.db")
+            build_db(db_name, rows)
+
+            db_utils.load_puzzle_from_db("hard", db_name)  # warm the row count
+            indexed = mean_ms(
+                lambda: db_utils.load_puzzle_from_db("hard", db_name), 200
+            )
+            legacy = mean_ms(lambda: legacy_pick(db_name, "hard"), 5)
+
+            print(f"{rows:>10} {indexed:8.3f}ms {legacy:16.3f}ms")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 100_000, 1_000_000])
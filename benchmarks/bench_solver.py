@@ -0,0 +1,73 @@
+"""Benchmark: solver throughput on the bundled puzzle file.
+
+Solves every puzzle in ``data/puzzles.txt`` with ``solver.solve_many`` and
+proves uniqueness with ``solver.count_solutions``, reporting puzzles/second.
+
+``solve_many`` is also timed with ``workers`` processes, on the file
+repeated ``rounds`` times so that starting the pool does not dominate, and
+checked against the target of ``TARGET`` puzzles/second.
+
+Run from the repository root:
+
+    python benchmarks/bench_solver.py [workers] [rounds]
+"""
+
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# pylint: disable=wrong-import-position
+import solver
+from utils import parse_puzzle_string
+
+TARGET = 10_000
+
+
+def load_puzzles() -> list[str]:
+    """Reads the puzzle strings of the bundled file."""
+
+    with open(os.path.join(ROOT, "data", "puzzles.txt"), encoding="utf-8") as file:
+        return [line.split()[1] for line in file if line.strip()]
+
+
+def best_of(func, repeat: int = 5) -> float:
+    """Returns the fastest of ``repeat`` wall-clock runs of ``func``."""
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(workers: int = os.cpu_count() or 1, rounds: int = 20) -> None:
+    """Times batch solving and uniqueness proofs."""
+
+    puzzles = load_puzzles()
+    grids = [parse_puzzle_string(puzzle_str) for puzzle_str in puzzles]
+
+    unsolved = sum(result is None for result in solver.solve_many(puzzles))
+    seconds = best_of(lambda: list(solver.solve_many(puzzles)))
+    print(
+        f"solve_many       {len(puzzles) / seconds:10.0f} puzzles/s"
+        f"  ({unsolved} unsolved)"
+    )
+
+    seconds = best_of(lambda: [solver.count_solutions(grid) for grid in grids])
+    print(f"count_solutions  {len(puzzles) / seconds:10.0f} puzzles/s")
+
+    stream = puzzles * rounds
+    seconds = best_of(lambda: list(solver.solve_many(stream, workers)), repeat=3)
+    rate = len(stream) / seconds
+    print(
+        f"solve_many x{workers:<3}  {rate:10.0f} puzzles/s"
+        f"  (target {TARGET}: {'met' if rate >= TARGET else 'missed'})"
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,365 @@
+"""Benchmark suite: hot paths of the game, with a regression gate.
+
+Times the per-call cost of the functions the game leans on, with fixed
+seeds, the bundled ``data/puzzles.txt`` and a synthetic puzzle database
+(1M rows by default):
+
+- ``utils.parse_puzzle_string`` and ``logic.check_board`` on the bundled
+  puzzles
+- ``Board.set_cell`` (a set and clear pair) and ``Board.check_pencil_marks``
+  on a pencilled board
+- ``solver.solve`` on the bundled puzzles
+- ``db_utils.load_puzzle_from_db`` on the synthetic database
+- importing the headless core (the modules checked by
+  ``tests/test_import_time.py``) in a fresh interpreter
+
+Every case runs ``repeat`` rounds of a fixed number of calls; the fastest
+and the median round are reported in nanoseconds per call. Results can be
+written as JSON and compared against a stored baseline: the run fails (exit
+code 1) when a case is slower than its baseline by more than the
+threshold. Timings only compare on the same machine, so baselines are kept
+locally (``benchmarks/baseline.json`` is ignored by git). The core import
+also has an absolute budget (``--import-budget-ms``), checked even without
+a baseline.
+
+Run from the repository root:
+
+    python benchmarks/suite.py --save-baseline        # record a baseline
+    python benchmarks/suite.py --output results.json  # compare against it
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from itertools import cycle
+from typing import NamedTuple
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+# pylint: disable=wrong-import-position
+import db_utils
+import logic
+import solver
+from board import Board
+from utils import parse_puzzle_string
+
+SEED = 1234
+DIFFICULTIES = ("easy", "medium", "hard")
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# The headless core: everything but the Kivy UI (main, settings) and the
+# numpy-backed batch checker.
+CORE_MODULES: tuple[str, ...] = (
+    "board",
+    "candidates",
+    "logic",
+    "solver",
+    "utils",
+    "constants",
+    "db_utils",
+    "prefetch",
+    "packed",
+    "grader",
+    "generator",
+    "canonical",
+    "compact_board",
+    "dlx",
+    "hints",
+    "render",
+    "analysis",
+)
+IMPORT_CASE = "import core"
+
+PROBE = f"""
+import time
+start = time.perf_counter_ns()
+import {", ".join(CORE_MODULES)}
+print(time.perf_counter_ns() - start)
+"""
+
+
+class Case(NamedTuple):
+    """One benchmark
+
+    Attributes:
+        name: Name of the timed function, the key of its results
+
+        setup: Builds fresh state and returns the call to time; run once
+        before every round
+
+        number: Calls per round
+    """
+
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    number: int
+
+
+def load_puzzles() -> list[str]:
+    """Reads the puzzle strings of the bundled file."""
+
+    with open(os.path.join(ROOT, "data", "puzzles.txt"), encoding="utf-8") as file:
+        return [line.split()[1] for line in file if line.strip()]
+
+
+def build_db(db_name: str, rows: int) -> None:
+    """Fills a fresh database with ``rows`` synthetic puzzles."""
+
+    rng = random.Random(SEED)
+    db_utils.setup_database(db_name)
+
+    with sqlite3.connect(db_name) as conn:
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.executemany(
+            "INSERT INTO puzzles (puzzle_string, difficulty) VALUES (?, ?)",
+            ((f"{number:081d}", rng.choice(DIFFICULTIES)) for number in range(rows)),
+        )
+    conn.close()
+    db_utils.number_puzzles(db_name)
+
+
+def pencilled_board(puzzle_str: str) -> Board:
+    """Returns a board of the puzzle with every candidate pencilled in."""
+
+    board = Board(parse_puzzle_string(puzzle_str))
+    for i in range(9):
+        for j in range(9):
+            if not board.state[i][j]:
+                board.set_marks(i, j, board.engine.candidates(i, j))
+    return board
+
+
+def make_cases(puzzles: list[str], db_name: str) -> list[Case]:
+    """Builds the benchmark cases."""
+
+    grids = [parse_puzzle_string(puzzle_str) for puzzle_str in puzzles]
+    rng = random.Random(SEED)
+    sample = rng.sample(puzzles, 100)
+
+    def parse():
+        strings = cycle(puzzles)
+        return lambda: parse_puzzle_string(next(strings))
+
+    def check_board():
+        boards = cycle(grids)
+        return lambda: logic.check_board(next(boards))
+
+    def set_cell():
+        board = pencilled_board(puzzles[0])
+        solution = solver.solve(board.state)
+        moves = cycle(
+            (i, j, solution[i][j])
+            for i in range(9)
+            for j in range(9)
+            if not board.state[i][j]
+        )
+
+        def move():
+            i, j, num = next(moves)
+            board.set_cell(i, j, num)
+            board.clear_cell(i, j)
+
+        return move
+
+    def check_pencil_marks():
+        return pencilled_board(puzzles[0]).check_pencil_marks
+
+    def solve():
+        boards = cycle(parse_puzzle_string(puzzle_str) for puzzle_str in sample)
+        return lambda: solver.solve(next(boards))
+
+    def load_puzzle():
+        pick_rng = random.Random(SEED)
+        return lambda: db_utils.load_puzzle_from_db(
+            pick_rng.choice(DIFFICULTIES), db_name
+        )
+
+    return [
+        Case("utils.parse_puzzle_string", parse, 20_000),
+        Case("logic.check_board", check_board, 20_000),
+        Case("Board.set_cell", set_cell, 5_000),
+        Case("Board.check_pencil_marks", check_pencil_marks, 2_000),
+        Case("solver.solve", solve, 200),
+        Case("db_utils.load_puzzle_from_db", load_puzzle, 2_000),
+    ]
+
+
+def run_case(case: Case, repeat: int) -> dict[str, float | int]:
+    """Times a case and returns its results record."""
+
+    rounds = []
+    for _ in range(repeat):
+        call = case.setup()
+        start = time.perf_counter_ns()
+        for _ in range(case.number):
+            call()
+        rounds.append((time.perf_counter_ns() - start) / case.number)
+
+    return {
+        "best_ns": min(rounds),
+        "median_ns": statistics.median(rounds),
+        "number": case.number,
+        "repeat": repeat,
+    }
+
+
+def time_import(repeat: int) -> dict[str, float | int]:
+    """Times importing the core in fresh interpreters
+
+    Only the imports are timed, inside the child, with cached bytecode as
+    an installed app would run. The first run may compile the bytecode, so
+    it is not counted.
+    """
+
+    env = dict(os.environ, PYTHONPATH=os.path.join(ROOT, "src"))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+    rounds = [
+        int(
+            subprocess.run(
+                [sys.executable, "-c", PROBE],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+        )
+        for _ in range(repeat + 1)
+    ][1:]
+
+    return {
+        "best_ns": min(rounds),
+        "median_ns": statistics.median(rounds),
+        "number": 1,
+        "repeat": repeat,
+    }
+
+
+def compare(
+    results: dict[str, dict], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    """Prints every case against its baseline
+
+    Args:
+        results: The ``results`` section of this run
+        baseline: The ``results`` section of the baseline
+        threshold: Allowed slowdown as a fraction (0.25 is 25% slower)
+
+    Returns:
+        The names of the cases that regressed beyond the threshold.
+    """
+
+    regressions = []
+    for name, record in results.items():
+        if name not in baseline:
+            print(f"  {name:32} {'new':>10}")
+            continue
+
+        ratio = record["best_ns"] / baseline[name]["best_ns"]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"  {name:32} {ratio:9.2f}x{flag}")
+
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Runs the suite; returns 1 if a case regressed, 0 otherwise."""
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n", 1)[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", default="", help="run cases containing this")
+    parser.add_argument("--output", help="write the results as JSON here")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--import-budget-ms", type=float, default=30.0)
+    args = parser.parse_args(argv)
+
+    puzzles = load_puzzles()
+
+    with tempfile.TemporaryDirectory() as folder:
+        db_name = os.path.join(folder, "bench.db")
+        build_db(db_name, args.rows)
+
+        results = {}
+        for case in make_cases(puzzles, db_name):
+            if args.only not in case.name:
+                continue
+            results[case.name] = run_case(case, args.repeat)
+            print(
+                f"{case.name:34} {results[case.name]['best_ns']:12.0f} ns/call",
+                file=sys.stderr,
+            )
+
+        db_utils.close_connections()
+
+    if args.only in IMPORT_CASE:
+        results[IMPORT_CASE] = time_import(args.repeat)
+        print(
+            f"{IMPORT_CASE:34} {results[IMPORT_CASE]['best_ns']:12.0f} ns/call",
+            file=sys.stderr,
+        )
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "rows": args.rows,
+            "seed": SEED,
+        },
+        "results": results,
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    over_budget = (
+        IMPORT_CASE in results
+        and results[IMPORT_CASE]["best_ns"] > args.import_budget_ms * 1e6
+    )
+    if over_budget:
+        print(
+            f"Importing the core took over {args.import_budget_ms} ms",
+            file=sys.stderr,
+        )
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"Saved the baseline to {args.baseline}", file=sys.stderr)
+        return int(over_budget)
+
+    if not os.path.exists(args.baseline):
+        print("No baseline to compare against (see --save-baseline)", file=sys.stderr)
+        return int(over_budget)
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+
+    print(f"Against {args.baseline} (threshold {args.threshold:.0%}):")
+    regressions = compare(results, baseline["results"], args.threshold)
+    if regressions:
+        print(f"{len(regressions)} case(s) regressed: {', '.join(regressions)}")
+        return 1
+
+    return int(over_budget)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""Board analysis off the UI thread.
+
+Solving, grading or a hint search that needs the advanced techniques can
+take far longer than a frame. The :class:`AnalysisExecutor` runs such jobs
+on a daemon worker thread: the caller takes an immutable :class:`Snapshot`
+of the board, the job works on the snapshot only, and its result is handed
+back through a ``post`` function (``Clock.schedule_once`` in the app) so
+callbacks always run on the UI thread.
+
+Every snapshot carries the :attr:`Board.version` it was taken at. A job
+whose board has changed since is skipped if it has not started yet, and its
+result is dropped if it has, so the UI never applies an outdated analysis.
+:meth:`AnalysisExecutor.cancel` drops every job at once, e.g. when a new
+game replaces the board. Submitting a job under a key that is already
+queued replaces the queued one, so repeated taps do not pile up work.
+
+Functions:
+    snapshot: Take an immutable copy of a board's position.
+    candidates_job: Candidates of every cell.
+    solve_job: The solution of the position.
+    hint_job: The easiest next deduction, without a time budget.
+
+Classes:
+    Snapshot: Immutable position of a board at one version.
+    AnalysisExecutor: Runs jobs on a worker thread and posts fresh results.
+"""
+
+import threading
+from collections import namedtuple
+from collections.abc import Callable
+from functools import partial
+
+import solver
+from board import Board
+from candidates import CandidateEngine
+from hints import Hint, find_hint
+
+# Runs a callback on the UI thread; the default calls it right away.
+Post = Callable[[Callable[[], None]], None]
+
+
+class Snapshot(namedtuple("Snapshot", ("state", "marks", "version"))):
+    """Immutable position of a board
+
+    Attributes:
+        state: The 9x9 grid as a tuple of row tuples
+
+        marks: The pencil marks of every cell as digit masks
+
+        version: The :attr:`Board.version` the snapshot was taken at
+    """
+
+    __slots__ = ()
+
+    def grid(self) -> list[list[int]]:
+        """Returns a mutable copy of the grid."""
+
+        return [list(row) for row in self.state]
+
+
+def snapshot(board: Board) -> Snapshot:
+    """Takes an immutable copy of a board's position
+
+    Args:
+        board: The board to copy
+
+    Returns:
+        The snapshot, tagged with the board's current version.
+    """
+
+    return Snapshot(
+        tuple(tuple(row) for row in board.state), tuple(board.marks), board.version
+    )
+
+
+def candidates_job(snap: Snapshot) -> list[int]:
+    """Returns the candidate mask of every cell (0 for filled cells)."""
+
+    engine = CandidateEngine(snap.grid())
+    return [
+        0 if snap.state[idx // 9][idx % 9] else engine.candidates(idx // 9, idx % 9)
+        for idx in range(81)
+    ]
+
+
+def solve_job(snap: Snapshot) -> list[list[int]] | None:
+    """Returns the solution of the position, None if it has none."""
+
+    return solver.solve(snap.grid())
+
+
+def hint_job(snap: Snapshot) -> Hint | None:
+    """Returns the easiest next deduction, searching without a time budget."""
+
+    board = Board(snap.grid())
+    board.marks[:] = snap.marks
+    return find_hint(board, budget=None)
+
+
+class AnalysisExecutor:
+    """Runs board analysis on a worker thread and posts fresh results
+
+    Jobs run one at a time, in submission order. A result is posted only if
+    the board is still at the version of the job's snapshot and no
+    :meth:`cancel` came in between, checked both when the job finishes and
+    again when the posted callback runs.
+
+    Attributes:
+        completed: Number of results delivered
+
+        dropped: Number of jobs skipped or results discarded as stale
+    """
+
+    def __init__(self, post: Post | None = None):
+        """Initializes an idle executor; call :meth:`start` to run jobs
+
+        Args:
+            post: Runs a callback on the UI thread, e.g.
+                  ``lambda callback: Clock.schedule_once(lambda _: callback())``.
+                  Defaults to calling it on the worker thread
+        """
+
+        self.completed: int = 0
+        self.dropped: int = 0
+
+        self._post: Post = post or (lambda callback: callback())
+        self._pending: dict[object, tuple] = {}
+        self._generation: int = 0
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Starts the worker thread, if it is not already running."""
+
+        with self._cond:
+            if self._thread is not None:
+                return
+
+            self._stopped = False
+            self._thread = threading.Thread(
+                target=self._run, name="board-analysis", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float | None = 1.0) -> None:
+        """Stops the worker thread and forgets the queued jobs.
+
+        Args:
+            timeout: Seconds to wait for a job in progress to finish
+        """
+
+        with self._cond:
+            self._stopped = True
+            self._pending.clear()
+            thread, self._thread = self._thread, None
+            self._cond.notify_all()
+
+        if thread is not None:
+            thread.join(timeout)
+
+    def submit(
+        self,
+        board: Board,
+        job: Callable[[Snapshot], object],
+        on_result: Callable[[object], None],
+        key: object = None,
+    ) -> Snapshot:
+        """Queues an analysis of the board's current position
+
+        Must be called from the thread that changes the board.
+
+        Args:
+            board: The board to analyse; it is snapshotted right away
+            job: Computes a result from the snapshot, on the worker thread
+            on_result: Receives the result, through ``post``
+            key: Jobs with the same key replace each other while queued;
+                 defaults to the job itself
+
+        Returns:
+            The snapshot the job will work on.
+        """
+
+        snap = snapshot(board)
+
+        with self._cond:
+            key = job if key is None else key
+            if self._pending.pop(key, None) is not None:
+                self.dropped += 1
+            self._pending[key] = (self._generation, board, snap, job, on_result)
+            self._cond.notify_all()
+
+        return snap
+
+    def cancel(self) -> None:
+        """Drops every queued job and the result of the running one."""
+
+        with self._cond:
+            self.dropped += len(self._pending)
+            self._pending.clear()
+            self._generation += 1
+
+    def pending(self) -> int:
+        """Returns the number of queued jobs."""
+
+        with self._cond:
+            return len(self._pending)
+
+    def _fresh(self, generation: int, board: Board, snap: Snapshot) -> bool:
+        """Checks that a job is still wanted; counts it as dropped if not.
+
+        Must be called with the lock held.
+        """
+
+        if generation == self._generation and board.version == snap.version:
+            return True
+
+        self.dropped += 1
+        return False
+
+    def _deliver(
+        self, generation: int, board: Board, snap: Snapshot, on_result, result
+    ) -> None:
+        """Hands a result to its callback, unless it went stale on the way."""
+
+        with self._cond:
+            if not self._fresh(generation, board, snap):
+                return
+            self.completed += 1
+
+        on_result(result)
+
+    def _run(self) -> None:
+        """Worker loop: runs queued jobs until stopped."""
+
+        while True:
+            with self._cond:
+                while not self._stopped and not self._pending:
+                    self._cond.wait()
+
+                if self._stopped:
+                    return
+
+                key = next(iter(self._pending))
+                generation, board, snap, job, on_result = self._pending.pop(key)
+
+                if not self._fresh(generation, board, snap):
+                    continue
+
+            # The lock is released while computing so submit() never waits.
+            try:
+                result = job(snap)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                print(f"Analysis error in {getattr(job, '__name__', job)}: {e}")
+                continue
+
+            with self._cond:
+                if not self._fresh(generation, board, snap):
+                    continue
+
+            self._post(
+                partial(self._deliver, generation, board, snap, on_result, result)
+            )
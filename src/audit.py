@@ -0,0 +1,199 @@
+"""Bulk puzzle validation and uniqueness audit.
+
+Streams a puzzle dump in the ``puzzles.txt`` format (``id puzzle  rating``)
+through a pool of worker processes and writes one JSON verdict per line:
+
+- ``invalid``: the line holds no puzzle or its givens break the rules
+- ``unsolvable``: the givens are consistent but there is no solution
+- ``unique``: exactly one solution
+- ``multiple``: more than one solution
+
+Lines are read and dispatched in fixed-size chunks with a bounded number of
+chunks in flight, so memory stays flat whatever the size of the input, and
+the report keeps the input order.
+
+Usage:
+
+    python src/audit.py data/puzzles.txt -o report.jsonl --workers 8
+
+Functions:
+    classify: Return the verdict for a single puzzle string.
+    audit_chunk: Classify a chunk of numbered lines (runs in the workers).
+    audit_file: Audit a whole file and write the JSONL report.
+    main: Command-line entry point.
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter, deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import TextIO
+
+import dlx
+import logic
+import solver
+from utils import parse_puzzle_line, parse_puzzle_string
+
+VERDICTS: tuple[str, ...] = ("invalid", "unsolvable", "unique", "multiple")
+
+BACKENDS = {
+    "solver": solver.count_solutions,
+    "dlx": dlx.count_solutions,
+}
+
+
+def classify(puzzle_str: str, backend: str = "solver") -> str:
+    """Returns the audit verdict for a puzzle string
+
+    Args:
+        puzzle_str: The 81-character puzzle (0-9, where 0 is an empty cell)
+        backend: Name of the solver backend used to count solutions
+
+    Returns:
+        One of ``VERDICTS``.
+    """
+
+    grid = parse_puzzle_string(puzzle_str)
+    if grid == [[]] or not logic.check_board(grid):
+        return "invalid"
+
+    return VERDICTS[1 + BACKENDS[backend](grid, limit=2)]
+
+
+def audit_chunk(
+    lines: list[tuple[int, str]], backend: str = "solver"
+) -> list[tuple[str, str]]:
+    """Classifies a chunk of lines
+
+    Runs inside the worker processes, so it only takes and returns plain,
+    cheaply pickled data.
+
+    Args:
+        lines: (line number, raw line) pairs
+        backend: Name of the solver backend used to count solutions
+
+    Returns:
+        One (verdict, JSON-encoded record) pair per input line, in order.
+    """
+
+    records: list[tuple[str, str]] = []
+
+    for number, line in lines:
+        parsed = parse_puzzle_line(line)
+
+        if parsed is None:
+            record = {"line": number, "id": None, "puzzle": None, "verdict": "invalid"}
+        else:
+            puzzle_id, puzzle_str, _ = parsed
+            record = {
+                "line": number,
+                "id": puzzle_id,
+                "puzzle": puzzle_str,
+                "verdict": classify(puzzle_str, backend),
+            }
+
+        records.append((record["verdict"], json.dumps(record)))
+
+    return records
+
+
+def _chunks(file: TextIO, chunk_size: int) -> Iterator[list[tuple[int, str]]]:
+    """Reads a file lazily in chunks of numbered, non-blank lines."""
+
+    numbered = ((number, line) for number, line in enumerate(file, 1) if line.strip())
+
+    while True:
+        chunk = list(islice(numbered, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def audit_file(
+    file_path: str,
+    report: TextIO,
+    workers: int | None = None,
+    chunk_size: int = 1000,
+    backend: str = "solver",
+) -> Counter:
+    """Audits every puzzle of a dump and writes a JSONL report
+
+    At most two chunks per worker are in flight at any time; the oldest one
+    is always written out before another is submitted.
+
+    Args:
+        file_path: The path to the puzzle dump
+        report: Text stream receiving one JSON record per line
+        workers: Number of worker processes, defaults to the CPU count
+        chunk_size: Number of lines sent to a worker at once
+        backend: Name of the solver backend used to count solutions
+
+    Returns:
+        A counter of verdicts.
+    """
+
+    workers = workers or os.cpu_count() or 1
+    totals: Counter = Counter()
+    in_flight: deque[Future] = deque()
+
+    def drain_oldest() -> None:
+        for verdict, record in in_flight.popleft().result():
+            report.write(record + "\n")
+            totals[verdict] += 1
+
+    with open(file_path, "r", encoding="utf-8") as file, ProcessPoolExecutor(
+        max_workers=workers
+    ) as pool:
+        for chunk in _chunks(file, chunk_size):
+            if len(in_flight) >= 2 * workers:
+                drain_oldest()
+            in_flight.append(pool.submit(audit_chunk, chunk, backend))
+
+        while in_flight:
+            drain_oldest()
+
+    return totals
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point.
+
+    Args:
+        argv: Command-line arguments, defaults to ``sys.argv[1:]``
+
+    Returns:
+        The process exit code: 0 if every puzzle is unique, 1 otherwise.
+    """
+
+    parser = argparse.ArgumentParser(
+        description="Validate a puzzle dump and check every puzzle is unique."
+    )
+    parser.add_argument("file", help="puzzle dump in the puzzles.txt format")
+    parser.add_argument("-o", "--output", help="JSONL report path (default: stdout)")
+    parser.add_argument("-w", "--workers", type=int, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="solver")
+    args = parser.parse_args(argv)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as report:
+            totals = audit_file(
+                args.file, report, args.workers, args.chunk_size, args.backend
+            )
+    else:
+        totals = audit_file(
+            args.file, sys.stdout, args.workers, args.chunk_size, args.backend
+        )
+
+    summary = ", ".join(f"{verdict}: {totals[verdict]}" for verdict in VERDICTS)
+    print(summary, file=sys.stderr)
+
+    return 0 if totals["unique"] == sum(totals.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""Vectorized validation of many boards at once.
+
+:func:`logic.check_board` walks one nested-list board with Python loops,
+which is fine for the game but slow for auditing millions of puzzles. Here a
+batch of boards is an ``(N, 9, 9)`` uint8 NumPy array and every unit of every
+board is checked with the same bitmask trick as :mod:`candidates`, applied to
+whole arrays: OR the digit bits of a unit together, and the unit repeats a
+digit exactly when the mask has fewer bits set than the unit has filled
+cells.
+
+Units are numbered as in :mod:`solver`: rows 0-8, columns 9-17 and squares
+18-26 (numbered as a cellphone numpad).
+
+Requires NumPy, which the game itself does not need.
+
+Functions:
+    check_boards: Validate a batch of boards.
+    boards_from_strings: Build a batch from 81-character puzzle strings.
+    boards_from_packed: Build a batch straight from packed records.
+"""
+
+from collections.abc import Iterable
+
+import numpy as np
+
+from candidates import BIT
+from packed import CELL_BYTES, RECORD_SIZE
+from utils import is_puzzle_string
+
+# Values above 9 get a bit of their own, so they always flag their units.
+OUT_OF_RANGE: int = 1 << 9
+
+# Cell value (0-255) -> digit bit, 0 for empty cells.
+BITS = np.full(256, OUT_OF_RANGE, dtype=np.uint16)
+BITS[:10] = BIT
+
+POPCOUNT = np.array(
+    [mask.bit_count() for mask in range(2 * OUT_OF_RANGE)], dtype=np.uint8
+)
+
+
+def _squares(cells: np.ndarray) -> np.ndarray:
+    """Lays out the nine 3x3 squares of (N, 9, 9) boards as rows."""
+
+    count = len(cells)
+    return (
+        cells.reshape(count, 3, 3, 3, 3).transpose(0, 1, 3, 2, 4).reshape(count, 9, 9)
+    )
+
+
+def _bad_units(boards: np.ndarray) -> np.ndarray:
+    """Returns an (N, 27) mask of the units holding a repeated or
+    out-of-range value."""
+
+    bits = BITS[boards]
+    filled = boards != 0
+
+    bad = np.empty((len(boards), 27), dtype=bool)
+
+    for first, unit_bits, unit_filled in (
+        (0, bits, filled),
+        (9, bits.transpose(0, 2, 1), filled.transpose(0, 2, 1)),
+        (18, _squares(bits), _squares(filled)),
+    ):
+        mask = np.bitwise_or.reduce(unit_bits, axis=2)
+        bad[:, first : first + 9] = (
+            POPCOUNT[mask] != unit_filled.sum(axis=2, dtype=np.uint8)
+        ) | (mask >= OUT_OF_RANGE)
+
+    return bad
+
+
+def check_boards(
+    boards: np.ndarray, chunk_size: int = 16_384
+) -> tuple[np.ndarray, np.ndarray]:
+    """Validates a batch of boards
+
+    A board is valid when no row, column or square repeats a non-zero
+    digit, as in :func:`logic.check_board`. Values above 9 also make their
+    units invalid. Boards are processed ``chunk_size`` at a time so the
+    temporary arrays stay small.
+
+    Args:
+        boards: An (N, 9, 9) array of digits, 0 for empty cells
+        chunk_size: Number of boards encoded at once
+
+    Returns:
+        A boolean (N,) mask, True for valid boards, and an int8 (N,) array
+        with the index (0-26) of the first offending unit of every board,
+        -1 for valid boards.
+
+    Raises:
+        ValueError: If the array is not shaped (N, 9, 9).
+    """
+
+    boards = np.asarray(boards, dtype=np.uint8)
+    if boards.ndim != 3 or boards.shape[1:] != (9, 9):
+        raise ValueError(f"Expected an (N, 9, 9) array, got {boards.shape}")
+
+    valid = np.empty(len(boards), dtype=bool)
+    first_bad = np.empty(len(boards), dtype=np.int8)
+
+    for start in range(0, len(boards), chunk_size):
+        bad = _bad_units(boards[start : start + chunk_size])
+        chunk = slice(start, start + len(bad))
+
+        valid[chunk] = ~bad.any(axis=1)
+        first_bad[chunk] = np.where(valid[chunk], -1, bad.argmax(axis=1))
+
+    return valid, first_bad
+
+
+def boards_from_strings(puzzles: Iterable[str]) -> np.ndarray:
+    """Builds a batch from puzzle strings
+
+    Args:
+        puzzles: 81-character puzzle strings (0-9, where 0 is an empty cell)
+
+    Returns:
+        An (N, 9, 9) uint8 array.
+
+    Raises:
+        ValueError: If a string is not 81 digits long.
+    """
+
+    puzzles = list(puzzles)
+    if not all(map(is_puzzle_string, puzzles)):
+        raise ValueError("Every puzzle must be an 81-digit string")
+
+    digits = np.frombuffer("".join(puzzles).encode("ascii"), dtype=np.uint8)
+    return (digits - ord("0")).reshape(len(puzzles), 9, 9)
+
+
+def boards_from_packed(buffer) -> np.ndarray:
+    """Builds a batch straight from packed records
+
+    Args:
+        buffer: Whole records of the packed format, such as
+                ``packed.PackedPuzzles.buffer``
+
+    Returns:
+        An (N, 9, 9) uint8 array.
+
+    Raises:
+        ValueError: If the buffer does not hold whole records.
+    """
+
+    raw = np.frombuffer(buffer, dtype=np.uint8)
+    if len(raw) % RECORD_SIZE:
+        raise ValueError("The buffer does not hold whole packed records")
+
+    cells = raw.reshape(-1, RECORD_SIZE)[:, :CELL_BYTES]
+
+    nibbles = np.empty((len(cells), 2 * CELL_BYTES), dtype=np.uint8)
+    nibbles[:, 0::2] = cells >> 4
+    nibbles[:, 1::2] = cells & 0x0F
+
+    return nibbles[:, :81].reshape(-1, 9, 9)
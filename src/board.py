@@ -5,12 +5,127 @@ Sudoku board. The board is stored as a 9x9 nested list of integers where
 zeros represent empty cells. The class implements helper methods that
 validate and modify the board state.
 
+Pencil marks are kept as one 9-bit digit mask per cell (see
+:mod:`candidates`) and updated incrementally: a placement only touches the
+20 peers of its cell. :attr:`Board.pencil_marks` still exposes them as a 9x9
+grid of sets.
+
+Every change goes through a move journal of small deltas, so moves can be
+undone, redone or jumped between without copying the grid.
+
+The board also remembers which cells changed (digit or marks) since the
+last :meth:`Board.take_changes`, so a view can redraw only those.
+
+A board can be given the solution of its puzzle. Every placement is then
+compared with it as it is made, so mistakes are known right away, a cell
+can be revealed and the win check stays a counter check.
+
 Classes:
     Board: Encapsulates the board state and provides operations to modify it.
+    MarkSet: Set view of the pencil marks of one cell.
 """
 
+from collections.abc import Iterable, Iterator, MutableSet, Sequence
+from contextlib import contextmanager
+
 import logic
 import utils
+from candidates import BIT, PEERS, CandidateEngine, digits_of
+
+
+def _mask_of(digits: Iterable[int]) -> int:
+    """Returns the digit mask of an iterable of digits (1-9)."""
+
+    mask = 0
+    for num in digits:
+        mask |= BIT[num]
+    return mask
+
+
+class MarkSet(MutableSet):
+    """Set view of the pencil marks of one cell
+
+    Reads and writes go straight to the board's mask, so the view never gets
+    stale and supports the usual set operations (``in``, ``add``,
+    ``remove``, ``clear``, iteration, comparison with sets).
+
+    Attributes:
+        board: The board owning the marks
+
+        idx: The cell index (0-80)
+    """
+
+    __slots__ = ("board", "idx")
+
+    def __init__(self, board: "Board", idx: int):
+        self.board = board
+        self.idx = idx
+
+    def __contains__(self, num) -> bool:
+        return (
+            isinstance(num, int)
+            and 1 <= num <= 9
+            and bool(self.board.marks[self.idx] & BIT[num])
+        )
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(digits_of(self.board.marks[self.idx]))
+
+    def __len__(self) -> int:
+        return self.board.marks[self.idx].bit_count()
+
+    def __repr__(self) -> str:
+        return repr(set(self))
+
+    def add(self, value: int) -> None:
+        board = self.board
+        board._change_marks(  # pylint: disable=W0212
+            self.idx,
+            board.marks[self.idx] | BIT[value],
+            board._suppressed[self.idx] & ~BIT[value],  # pylint: disable=W0212
+        )
+
+    def discard(self, value: int) -> None:
+        if value in self:
+            board = self.board
+            board._change_marks(  # pylint: disable=W0212
+                self.idx,
+                board.marks[self.idx] ^ BIT[value],
+                board._suppressed[self.idx],  # pylint: disable=W0212
+            )
+
+    def clear(self) -> None:
+        self.board.set_marks(*divmod(self.idx, 9), 0)
+
+
+class _MarkRow(Sequence):
+    """One row of :attr:`Board.pencil_marks`; assigning a set to an item
+    replaces the marks of that cell."""
+
+    __slots__ = ("board", "row")
+
+    def __init__(self, board: "Board", row: int):
+        self.board = board
+        self.row = row
+
+    def __getitem__(self, col: int) -> MarkSet:
+        if not -9 <= col < 9:
+            raise IndexError("pencil mark column out of range")
+        return MarkSet(self.board, self.row * 9 + col % 9)
+
+    def __setitem__(self, col: int, digits: Iterable[int]) -> None:
+        self.board.set_marks(self.row, col % 9, _mask_of(digits))
+
+    def __len__(self) -> int:
+        return 9
+
+
+# Journal delta kinds. A delta is a flat tuple whose first item is its kind:
+#   (SET, idx, value, old marks, old suppressed marks, peers that lost value)
+#   (CLEAR, idx, value, peers that got value back)
+#   (MARKS, idx, old marks, old suppressed, new marks, new suppressed)
+# Peer sets are 81-bit cell bitmasks, so every delta has a bounded size.
+SET, CLEAR, MARKS = range(3)
 
 
 class Board:
@@ -27,22 +142,68 @@ class Board:
         initial_cells: A set of tuples representing
         the fixed starting cells
 
-        pencil_marks: A 2D array of sets representing
-        possible pencil marks for each cell
+        marks: The pencil marks of every cell (row-major) as digit masks
+
+        pencil_marks: A 9x9 grid of sets viewing ``marks``, kept for
+        code written against the original sets
+
+        engine: Row, column and square occupancy masks kept in
+        sync with the state
+
+        history: The move journal; each move is a tuple of deltas
+
+        cursor: The number of moves of :attr:`history` currently applied
+
+        changed: Cells whose digit or marks changed since the last
+        :meth:`take_changes`, as an 81-bit cell bitmask
+
+        version: Counter bumped by every change, so work based on an older
+        position can tell it is stale
+
+        solution: The solved grid, flat and row-major, or None if unknown
+
+        wrong: Filled cells whose digit disagrees with :attr:`solution`, as
+        an 81-bit cell bitmask
     """
 
-    def __init__(self, initial_state: list[list[int]] | None = None):
+    def __init__(
+        self,
+        initial_state: list[list[int]] | None = None,
+        solution: list[list[int]] | None = None,
+    ):
         """Initializes a new Sudoku board
 
         Args:
             initial_state: An optional 9x9 grid to start the puzzle.
                            If None, an empty 9x9 grid is created
+            solution: An optional 9x9 solved grid of the puzzle, enabling
+                      the mistake checks and :meth:`reveal_cell`
+
+        Raises:
+            ValueError: If the solution is not a 9x9 grid.
         """
 
         self.initial_cells: set[tuple[int, int]] = set()
-        self.pencil_marks: list[list[set[int]]] = [
-            [set() for _ in range(9)] for _ in range(9)
-        ]
+        self.marks: list[int] = [0] * 81
+        self.pencil_marks: list[_MarkRow] = [_MarkRow(self, row) for row in range(9)]
+
+        # Marks removed by placements, per cell, so clearing the placement
+        # can put them back.
+        self._suppressed: list[int] = [0] * 81
+
+        self.history: list[tuple[tuple[int, ...], ...]] = []
+        self.cursor: int = 0
+        self._group: list[tuple[int, ...]] | None = None
+        self._touched: set[int] = set()
+        self.changed: int = 0
+        self.version: int = 0
+        self.solution: list[int] | None = None
+        self.wrong: int = 0
+
+        if solution is not None:
+            if len(solution) != 9 or any(len(row) != 9 for row in solution):
+                raise ValueError("The solution must be a 9x9 grid")
+            self.solution = [num for row in solution for num in row]
 
         if initial_state is not None:
             self.state: list[list[int]] = initial_state
@@ -52,14 +213,86 @@ class Board:
             self.state: list[list[int]] = [[0 for _ in range(9)] for _ in range(9)]
             self.zeroes: int = 81
 
+        self.engine: CandidateEngine = CandidateEngine(self.state)
+
+        # Moves are checked one unit at a time from here on, so the starting
+        # grid is checked in full once. An inconsistent grid stays invalid:
+        # its clashing givens cannot be cleared.
+        self._consistent: bool = logic.check_board(self.state)
+
+        if self.solution is not None:
+            for idx in range(81):
+                self._check(idx, self.state[idx // 9][idx % 9])
+
     def is_solved(self) -> bool:
         """Checks if the board is in a solved state
 
+        Every move is validated as it is made, so this is a counter check.
+
+        Returns:
+            True if the board is valid, completely filled and, when the
+            solution is known, without mistakes, False otherwise
+        """
+
+        return self.zeroes == 0 and self._consistent and not self.wrong
+
+    def is_mistake(self, row: int, col: int) -> bool:
+        """Checks if a cell holds a digit other than the solution's
+
+        Args:
+            row: The 0-indexed row of the cell (0-8)
+            col: The 0-indexed column of the cell (0-8)
+
         Returns:
-            True if the board is valid and completely filled, False otherwise
+            True if the cell is wrong, False if it is right, empty or the
+            solution is unknown
         """
 
-        return logic.check_board(self.state) and self.zeroes == 0
+        return bool(self.wrong >> (row * 9 + col) & 1)
+
+    def mistakes(self) -> list[tuple[int, int]]:
+        """Returns the (row, col) of every wrong cell, in row-major order."""
+
+        return [(idx // 9, idx % 9) for idx in range(81) if self.wrong >> idx & 1]
+
+    def reveal_cell(self, row: int, col: int) -> bool:
+        """Fills a cell with its digit from the solution, as one move.
+
+        A wrong digit in the cell is replaced, and wrong copies of the
+        revealed digit in its row, column or square are cleared first.
+
+        Args:
+            row: The 0-indexed row of the cell (0-8)
+            col: The 0-indexed column of the cell (0-8)
+
+        Returns:
+            True if the cell was changed, False if the solution is unknown,
+            the cell already holds its digit or the board is invalid
+        """
+
+        if self.solution is None or not self._consistent:
+            return False
+
+        idx = row * 9 + col
+        value = self.solution[idx]
+        if (row, col) in self.initial_cells or self.state[row][col] == value:
+            return False
+
+        with self.grouped():
+            self.clear_cell(row, col)
+            for peer in PEERS[idx]:
+                if self.state[peer // 9][peer % 9] == value:
+                    self.clear_cell(peer // 9, peer % 9)
+            return self.set_cell(row, col, value)
+
+    def _check(self, idx: int, value: int) -> None:
+        """Flags a cell as wrong if its new digit disagrees with the
+        solution, and unflags it otherwise."""
+
+        if self.solution is not None and value and value != self.solution[idx]:
+            self.wrong |= 1 << idx
+        else:
+            self.wrong &= ~(1 << idx)
 
     def is_valid(self) -> bool:
         """Checks if the board is in a valid state
@@ -68,13 +301,15 @@ class Board:
             True if the board state adheres to Sudoku rules, False otherwise
         """
 
-        return logic.check_board(self.state)
+        return self._consistent
 
     def set_cell(self, row: int, col: int, value: int) -> bool:
         """Sets a cell on the board to a given value
 
         The move is only applied if the cell is not an initial cell, is
-        currently empty and the resulting board state remains valid.
+        currently empty and the resulting board state remains valid. Only
+        the cell's row, column and square are checked, through the
+        occupancy masks of :attr:`engine`.
 
         Args:
             row: The 0-indexed row of the cell (0-8)
@@ -91,14 +326,15 @@ class Board:
         if self.state[row][col] != 0:
             return False
 
-        self.state[row][col] = value
+        if not 1 <= value <= 9 or not self._consistent:
+            return False
 
-        if not self.is_valid():
-            self.state[row][col] = 0
+        if not self.engine.allows(row, col, value):
             return False
 
-        self.zeroes -= 1
-        self.check_pencil_marks()
+        idx = row * 9 + col
+        delta = (SET, idx, value, self.marks[idx], self._suppressed[idx])
+        self._record(delta + (self._place(idx, value),))
         return True
 
     def clear_cell(self, row: int, col: int) -> bool:
@@ -121,23 +357,314 @@ class Board:
         if self.state[row][col] == 0:
             return False
 
+        idx = row * 9 + col
+        value = self.state[row][col]
+        self._record((CLEAR, idx, value, self._unplace(idx)))
+        return True
+
+    def set_marks(self, row: int, col: int, mask: int) -> None:
+        """Replaces the pencil marks of a cell
+
+        Marks previously removed by placements are forgotten, so clearing
+        those placements will not bring them back.
+
+        Args:
+            row: The 0-indexed row of the cell (0-8)
+            col: The 0-indexed column of the cell (0-8)
+            mask: The new marks as a digit mask
+        """
+
+        self._change_marks(row * 9 + col, mask, 0)
+
+    def _change_marks(self, idx: int, mask: int, suppressed: int) -> None:
+        """Journals and applies new marks for a cell."""
+
+        old = (self.marks[idx], self._suppressed[idx])
+        if old == (mask, suppressed):
+            return
+
+        self.marks[idx] = mask
+        self._suppressed[idx] = suppressed
+        self._record((MARKS, idx) + old + (mask, suppressed))
+
+    def _place(self, idx: int, value: int) -> int:
+        """Writes a validated digit and updates the engine and marks.
+
+        Returns:
+            The bitmask of the peers whose marks lost the digit.
+        """
+
+        row, col = divmod(idx, 9)
+        self.state[row][col] = value
+        self.zeroes -= 1
+        self.engine.place(row, col, value)
+        self._check(idx, value)
+        return self._remove_marks(idx, value)
+
+    def _unplace(self, idx: int) -> int:
+        """Empties a filled cell and updates the engine and marks.
+
+        Returns:
+            The bitmask of the peers whose marks got the digit back.
+        """
+
+        row, col = divmod(idx, 9)
+        value = self.state[row][col]
+        self.engine.remove(row, col, value)
         self.state[row][col] = 0
         self.zeroes += 1
+        self._check(idx, 0)
+        return self._restore_marks(idx, value)
+
+    def _remove_marks(self, idx: int, value: int) -> int:
+        """Removes a newly placed digit from the marks of the cell's peers.
+
+        Returns:
+            The bitmask of the peers whose marks lost the digit.
+        """
+
+        bit = BIT[value]
+        marks, suppressed = self.marks, self._suppressed
+        changed = 0
+
+        marks[idx] = 0
+        suppressed[idx] = 0
+
+        for peer in PEERS[idx]:
+            if marks[peer] & bit:
+                marks[peer] ^= bit
+                suppressed[peer] |= bit
+                changed |= 1 << peer
+
+        return changed
+
+    def _restore_marks(self, idx: int, value: int) -> int:
+        """Gives a cleared digit back to the peers it was removed from,
+        where no other placement still blocks it.
+
+        Returns:
+            The bitmask of the peers whose marks got the digit back.
+        """
+
+        bit = BIT[value]
+        marks, suppressed, used = self.marks, self._suppressed, self.engine.used
+        changed = 0
+
+        for peer in PEERS[idx]:
+            if suppressed[peer] & bit and not used(peer // 9, peer % 9) & bit:
+                marks[peer] |= bit
+                suppressed[peer] ^= bit
+                changed |= 1 << peer
+
+        return changed
+
+    def _mark_changed(self, delta: tuple[int, ...]) -> None:
+        """Flags the cell of a delta, and the peers whose marks it changed,
+        and counts a new version."""
+
+        self.version += 1
+        self.changed |= 1 << delta[1]
+        if delta[0] != MARKS:
+            self.changed |= delta[-1]
+
+    def take_changes(self) -> list[int]:
+        """Returns the cells changed since the last call and forgets them.
+
+        Changes made by assigning to :attr:`state` directly are not seen.
+
+        Returns:
+            The indices (row * 9 + col) of the changed cells, in order.
+        """
+
+        changed, self.changed = self.changed, 0
+
+        cells = []
+        while changed:
+            low = changed & -changed
+            cells.append(low.bit_length() - 1)
+            changed ^= low
+        return cells
+
+    def _record(self, delta: tuple[int, ...]) -> None:
+        """Adds a delta to the current group, or journals it as a move.
+
+        A new move drops the moves that were undone before it.
+        """
+
+        self._touched.add(delta[1])
+        self._mark_changed(delta)
+
+        if self._group is not None:
+            self._group.append(delta)
+            return
+
+        del self.history[self.cursor :]
+        self.history.append((delta,))
+        self.cursor += 1
+
+    @contextmanager
+    def grouped(self) -> Iterator[None]:
+        """Journals every change made inside the block as a single move.
+
+        Meant for actions that touch many cells at once, such as filling in
+        every pencil mark, so that one undo reverts all of it.
+        """
+
+        if self._group is not None:
+            yield
+            return
+
+        self._group = []
+        try:
+            yield
+        finally:
+            group, self._group = tuple(self._group), None
+            if group:
+                del self.history[self.cursor :]
+                self.history.append(group)
+                self.cursor += 1
+
+    def _revert(self, delta: tuple[int, ...]) -> None:
+        """Applies the inverse of a delta."""
+
+        kind, idx = delta[0], delta[1]
+        marks, suppressed = self.marks, self._suppressed
+        self._mark_changed(delta)
+
+        if kind == MARKS:
+            marks[idx], suppressed[idx] = delta[2], delta[3]
+            return
+
+        row, col = divmod(idx, 9)
+        value, peers = delta[2], delta[-1]
+        bit = BIT[value]
+
+        if kind == SET:
+            self.engine.remove(row, col, value)
+            self.state[row][col] = 0
+            self.zeroes += 1
+            marks[idx], suppressed[idx] = delta[3], delta[4]
+            self._check(idx, 0)
+        else:
+            self.state[row][col] = value
+            self.zeroes -= 1
+            self.engine.place(row, col, value)
+            self._check(idx, value)
+
+        for peer in PEERS[idx]:
+            if peers >> peer & 1:
+                marks[peer] ^= bit
+                suppressed[peer] ^= bit
+
+    def _apply(self, delta: tuple[int, ...]) -> None:
+        """Applies a delta again, from the state it was recorded in."""
+
+        kind, idx = delta[0], delta[1]
+        self._mark_changed(delta)
+
+        if kind == SET:
+            self._place(idx, delta[2])
+        elif kind == CLEAR:
+            self._unplace(idx)
+        else:
+            self.marks[idx], self._suppressed[idx] = delta[4], delta[5]
+
+    def undo(self) -> bool:
+        """Reverts the last applied move.
+
+        Returns:
+            True if a move was undone, False if there was none
+        """
+
+        if not self.cursor:
+            return False
+
+        self.cursor -= 1
+        for delta in reversed(self.history[self.cursor]):
+            self._revert(delta)
         return True
 
+    def redo(self) -> bool:
+        """Applies the next undone move again.
+
+        Returns:
+            True if a move was redone, False if there was none
+        """
+
+        if self.cursor == len(self.history):
+            return False
+
+        for delta in self.history[self.cursor]:
+            self._apply(delta)
+        self.cursor += 1
+        return True
+
+    def jump_to(self, move: int) -> None:
+        """Undoes or redoes moves until exactly ``move`` moves are applied.
+
+        Args:
+            move: The number of journaled moves to keep applied, from 0 (the
+                  starting position) to ``len(history)``
+
+        Raises:
+            IndexError: If there is no such move in the journal.
+        """
+
+        if not 0 <= move <= len(self.history):
+            raise IndexError(f"No move {move} in a journal of {len(self.history)}")
+
+        while self.cursor > move and self.undo():
+            pass
+        while self.cursor < move and self.redo():
+            pass
+
+    def reset(self) -> bool:
+        """Clears every player-filled cell and pencil mark, as one move.
+
+        Only cells the journal has seen change are visited, and the reset
+        itself can be undone.
+
+        Returns:
+            True if anything was cleared, False if the board was untouched
+        """
+
+        cursor = self.cursor
+
+        with self.grouped():
+            for idx in sorted(self._touched):
+                row, col = divmod(idx, 9)
+                if self.state[row][col]:
+                    self.clear_cell(row, col)
+
+            for idx in sorted(self._touched):
+                if self.marks[idx] or self._suppressed[idx]:
+                    self._change_marks(idx, 0, 0)
+
+        return self.cursor != cursor
+
     def check_pencil_marks(self):
-        """Updates pencil marks based on current board state."""
+        """Removes every pencil mark the current board state rules out.
 
-        for i in range(9):
-            for j in range(9):
-                if (i, j) in self.initial_cells:
-                    continue
-
-                current_marks: set[int] = self.pencil_marks[i][j]
-                for k in range(1, 10):
-                    if not logic.check_move(self.state, i, j, k):
-                        if k in current_marks:
-                            current_marks.remove(k)
+        A full rescan of the board. Moves made through :meth:`set_cell` keep
+        the marks up to date on their own; this is only needed after
+        changing :attr:`state` directly. The occupancy masks, the zero
+        count and the mistakes are rebuilt from :attr:`state` first, and
+        the removed marks are journaled as one move.
+        """
+
+        self.engine = CandidateEngine(self.state)
+        self.zeroes = utils.count_zeroes(self.state)
+        self._consistent = logic.check_board(self.state)
+        for idx in range(81):
+            self._check(idx, self.state[idx // 9][idx % 9])
+
+        with self.grouped():
+            for idx in range(81):
+                blocked = self.marks[idx] & self.engine.used(idx // 9, idx % 9)
+                if blocked:
+                    self._change_marks(
+                        idx, self.marks[idx] ^ blocked, self._suppressed[idx]
+                    )
 
     def __str__(self) -> str:
         """The string representation of the board."""
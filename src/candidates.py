@@ -0,0 +1,210 @@
+"""Bitmask candidate engine.
+
+Digits 1-9 are stored as bits 0-8 of a 9-bit mask, so "is 5 already in this
+row?" becomes a single ``&`` instead of building a list and counting. The
+:class:`CandidateEngine` keeps one occupancy mask per row, column and 3x3
+square and is updated incrementally as cells are set and cleared.
+
+Constants:
+    ALL_DIGITS: Mask with the bits of all nine digits set.
+    BIT: Lookup table from a digit (0-9) to its bit (0 for the empty cell).
+    SQUARE_OF: Square index (0-8) of every cell index (0-80).
+    PEERS: The 20 peer cell indices (same row, column or square) of every cell.
+
+Functions:
+    row_mask: Occupancy mask of a row of a nested-list board.
+    col_mask: Occupancy mask of a column of a nested-list board.
+    sqr_mask: Occupancy mask of a 3x3 square of a nested-list board.
+    has_duplicate: Detect duplicates among non-zero values using a bitmask.
+    digits_of: Expand a mask into the sorted list of digits it contains.
+
+Classes:
+    CandidateEngine: Incrementally maintained row/column/square masks.
+"""
+
+ALL_DIGITS: int = 0x1FF
+
+BIT: tuple[int, ...] = (0,) + tuple(1 << (num - 1) for num in range(1, 10))
+
+SQUARE_OF: tuple[int, ...] = tuple(
+    (idx // 27) * 3 + (idx % 9) // 3 for idx in range(81)
+)
+
+
+def _peers(idx: int) -> tuple[int, ...]:
+    row, col, sqr = idx // 9, idx % 9, SQUARE_OF[idx]
+    return tuple(
+        other
+        for other in range(81)
+        if other != idx
+        and (other // 9 == row or other % 9 == col or SQUARE_OF[other] == sqr)
+    )
+
+
+PEERS: tuple[tuple[int, ...], ...] = tuple(_peers(idx) for idx in range(81))
+
+
+def row_mask(state: list[list[int]], row: int) -> int:
+    """Returns the occupancy mask of a row
+
+    Args:
+        state: The board's current configuration
+        row: The row to inspect
+
+    Returns:
+        A mask with the bit of every digit present in the row set.
+    """
+
+    mask = 0
+    for num in state[row]:
+        mask |= BIT[num]
+    return mask
+
+
+def col_mask(state: list[list[int]], col: int) -> int:
+    """Returns the occupancy mask of a column
+
+    Args:
+        state: The board's current configuration
+        col: The column to inspect
+
+    Returns:
+        A mask with the bit of every digit present in the column set.
+    """
+
+    mask = 0
+    for row in state:
+        mask |= BIT[row[col]]
+    return mask
+
+
+def sqr_mask(state: list[list[int]], sqr: int) -> int:
+    """Returns the occupancy mask of a 3x3 square
+
+    Args:
+        state: The board's current configuration
+        sqr: The square to inspect, numbered as a cellphone numpad (0-8)
+
+    Returns:
+        A mask with the bit of every digit present in the square set.
+    """
+
+    row: int = (sqr // 3) * 3
+    col: int = (sqr % 3) * 3
+
+    mask = 0
+    for line in state[row : row + 3]:
+        mask |= BIT[line[col]] | BIT[line[col + 1]] | BIT[line[col + 2]]
+    return mask
+
+
+def has_duplicate(vector) -> bool:
+    """Checks if an iterable of digits contains duplicates of non zero values
+
+    Bitmask equivalent of :func:`utils.has_nonzero_duplicate`: a single pass
+    instead of one ``count`` per digit.
+
+    Args:
+        vector: The digits to check (0-9)
+
+    Returns:
+        True if a non-zero digit appears more than once, False otherwise
+    """
+
+    mask = 0
+    for num in vector:
+        bit = BIT[num]
+        if mask & bit:
+            return True
+        mask |= bit
+    return False
+
+
+def digits_of(mask: int) -> list[int]:
+    """Expands a candidate mask into its digits
+
+    Args:
+        mask: A 9-bit digit mask
+
+    Returns:
+        The digits whose bits are set, in ascending order.
+    """
+
+    return [num for num in range(1, 10) if mask & BIT[num]]
+
+
+class CandidateEngine:
+    """Row, column and square occupancy masks for a 9x9 board
+
+    The engine does not own the board; callers keep it in sync by calling
+    :meth:`place` and :meth:`remove` whenever they change a cell. It assumes
+    the digits it is given do not repeat within a unit, which is what
+    :class:`board.Board` guarantees for every move it accepts.
+
+    Attributes:
+        rows: One occupancy mask per row
+
+        cols: One occupancy mask per column
+
+        sqrs: One occupancy mask per 3x3 square
+    """
+
+    __slots__ = ("rows", "cols", "sqrs")
+
+    def __init__(self, state: list[list[int]] | None = None):
+        """Initializes the masks, optionally from an existing board
+
+        Args:
+            state: An optional 9x9 grid to read the occupied digits from.
+                   If None, every unit starts empty
+        """
+
+        self.rows: list[int] = [0] * 9
+        self.cols: list[int] = [0] * 9
+        self.sqrs: list[int] = [0] * 9
+
+        if state is not None:
+            for row in range(9):
+                for col in range(9):
+                    if state[row][col]:
+                        self.place(row, col, state[row][col])
+
+    def place(self, row: int, col: int, num: int) -> None:
+        """Marks a digit as present in the cell's row, column and square."""
+
+        bit = BIT[num]
+        self.rows[row] |= bit
+        self.cols[col] |= bit
+        self.sqrs[(row // 3) * 3 + col // 3] |= bit
+
+    def remove(self, row: int, col: int, num: int) -> None:
+        """Marks a digit as absent from the cell's row, column and square."""
+
+        bit = ~BIT[num]
+        self.rows[row] &= bit
+        self.cols[col] &= bit
+        self.sqrs[(row // 3) * 3 + col // 3] &= bit
+
+    def used(self, row: int, col: int) -> int:
+        """Returns the mask of digits that already block the given cell."""
+
+        return self.rows[row] | self.cols[col] | self.sqrs[(row // 3) * 3 + col // 3]
+
+    def candidates(self, row: int, col: int) -> int:
+        """Returns the mask of digits that could legally go in the given cell."""
+
+        return ALL_DIGITS & ~self.used(row, col)
+
+    def allows(self, row: int, col: int, num: int) -> bool:
+        """Checks whether placing a digit in the given cell would be valid.
+
+        Args:
+            row: Row index (0-8)
+            col: Column index (0-8)
+            num: Digit to validate (1-9)
+
+        Returns:
+            True if the digit is not yet in the cell's row, column or square.
+        """
+
+        return not self.used(row, col) & BIT[num]
@@ -0,0 +1,386 @@
+"""Canonical form of puzzles under the Sudoku symmetries.
+
+Relabelling the digits, transposing, swapping bands or stacks and swapping
+rows inside a band or columns inside a stack all turn a puzzle into an
+equivalent one. :func:`canonical_form` maps every puzzle of such a family to
+the same representative, so equivalent puzzles can be found with one
+indexed lookup.
+
+The representative is the transform with the smallest clue pattern (the
+81 cells read as empty/filled, row by row, empty first), and among those
+the smallest digit string once digits are relabelled 1, 2, 3... in order of
+first appearance.
+
+Trying all 2 * 6^8 cell transforms is far too slow. Instead the rows of the
+result are chosen one at a time, keeping only the partial row orders whose
+pattern prefix is still minimal. For a fixed row order the best column
+order needs no search: inside a stack, sorting the columns by their clue
+pattern (their "signature") is optimal, and so is sorting the stacks by
+the pattern they then form. Only the transforms left tied on the pattern
+are compared digit by digit.
+
+Puzzles have few symmetric patterns, so few transforms tie. Grids with
+every cell but at most one filled tie almost everywhere, so they take
+another route: for every column order and first row the other rows are
+picked greedily by their relabelled digits, and an order is dropped as
+soon as it falls behind. See :func:`_dense_form`.
+
+Functions:
+    canonical_form: Return the canonical puzzle string of a puzzle.
+    canonical_many: Canonicalize a stream of puzzles, optionally in parallel.
+"""
+
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import permutations, product
+from operator import itemgetter
+
+from utils import is_puzzle_string
+
+# SPREAD[sig] moves bit i of a 9-bit column signature to bit 3 * i, so the
+# three sorted signatures of a stack interleave into its row-major pattern.
+SPREAD: tuple[int, ...] = tuple(
+    sum(1 << 3 * bit for bit in range(9) if sig >> bit & 1) for sig in range(512)
+)
+
+_PATTERN: dict[int, int] = str.maketrans("123456789", "1" * 9)
+
+# A search state: (transposed, output rows so far, column signatures). The
+# nine signatures are packed in one int, column c at bit 10 * c.
+_State = tuple[int, tuple[int, ...], int]
+
+
+def _stacks(sigs: list[int]) -> list[tuple[int, list[int]]]:
+    """Orders the columns for a fixed row order
+
+    Returns:
+        The (pattern key, columns) of every stack in their best order, the
+        columns of each stack sorted by signature.
+    """
+
+    stacks = []
+    for first in (0, 3, 6):
+        cols = sorted(range(first, first + 3), key=sigs.__getitem__)
+        low, mid, high = (sigs[col] for col in cols)
+        stacks.append((SPREAD[low] << 2 | SPREAD[mid] << 1 | SPREAD[high], cols))
+
+    stacks.sort()
+    return stacks
+
+
+def _next_states(
+    states: list[_State], rows_of: tuple[tuple[int, ...], tuple[int, ...]]
+) -> list[_State]:
+    """Extends every state by one row and keeps the minimal ones."""
+
+    best = 1 << 9
+    kept: list[_State] = []
+
+    for transposed, rows, packed in states:
+        lines = rows_of[transposed]
+        if len(rows) % 3:
+            bands = [rows[-1] // 3]
+        else:
+            used = {row // 3 for row in rows}
+            bands = [band for band in range(3) if band not in used]
+
+            # Empty bands are interchangeable: only the first one is tried.
+            empty = [band for band in bands if not any(lines[3 * band : 3 * band + 3])]
+            bands = [band for band in bands if band not in empty[1:]]
+
+        for band in bands:
+            tried_empty = False
+
+            for row in range(3 * band, 3 * band + 3):
+                if row in rows:
+                    continue
+
+                # So are the empty rows of a band.
+                if not lines[row]:
+                    if tried_empty:
+                        continue
+                    tried_empty = True
+
+                # Column signatures packed 10 bits apart: one shift extends all.
+                extended = packed << 1 | lines[row]
+
+                # Inlined _stacks: only the keys are needed here, and the last
+                # row of the ordered pattern is the low triple of each key.
+                keys = []
+                for shift in (0, 30, 60):
+                    low, mid, high = sorted(
+                        (
+                            extended >> shift & 511,
+                            extended >> shift + 10 & 511,
+                            extended >> shift + 20 & 511,
+                        )
+                    )
+                    keys.append(SPREAD[low] << 2 | SPREAD[mid] << 1 | SPREAD[high])
+
+                first, second, third = sorted(keys)
+                value = (first & 7) << 6 | (second & 7) << 3 | (third & 7)
+
+                if value < best:
+                    best = value
+                    kept = []
+                if value == best:
+                    kept.append((transposed, rows + (row,), extended))
+
+    return kept
+
+
+def _column_orders(sigs: list[int]) -> list[tuple[int, ...]]:
+    """Every column order with the minimal pattern for these signatures.
+
+    Columns (and stacks) with equal signatures can be swapped without
+    changing the pattern; empty ones also without changing the digits, so
+    only filled ties are expanded.
+    """
+
+    stacks = _stacks(sigs)
+
+    def stack_orders(cols: list[int]) -> list[tuple[int, ...]]:
+        orders = [()]
+        start = 0
+        while start < 3:
+            end = start
+            while end < 3 and sigs[cols[end]] == sigs[cols[start]]:
+                end += 1
+            group = cols[start:end]
+            variants = list(permutations(group)) if sigs[group[0]] else [tuple(group)]
+            orders = [order + variant for order in orders for variant in variants]
+            start = end
+        return orders
+
+    # Runs of stacks with equal non-zero keys can come in any order.
+    arrangements = [()]
+    start = 0
+    while start < 3:
+        end = start
+        while end < 3 and stacks[end][0] == stacks[start][0]:
+            end += 1
+        group = stacks[start:end]
+        variants = list(permutations(group)) if group[0][0] else [tuple(group)]
+        arrangements = [
+            arrangement + variant
+            for arrangement in arrangements
+            for variant in variants
+        ]
+        start = end
+
+    orders = []
+    for arrangement in arrangements:
+        for parts in product(*(stack_orders(cols) for _, cols in arrangement)):
+            orders.append(sum(parts, ()))
+    return orders
+
+
+def _dense_orders(first_col: int | None) -> list[tuple[int, ...]]:
+    """Every column order, or those starting with ``first_col``."""
+
+    orders = []
+    for stacks in permutations(range(3)):
+        if first_col is not None and stacks[0] != first_col // 3:
+            continue
+        for parts in product(
+            *(permutations(range(3 * stack, 3 * stack + 3)) for stack in stacks)
+        ):
+            order = sum(parts, ())
+            if first_col is None or order[0] == first_col:
+                orders.append(order)
+    return orders
+
+
+def _relabel(line: str, seen: str) -> tuple[str, str]:
+    """Relabels a row, extending the digits seen so far in order of first
+    appearance.
+
+    Returns:
+        The relabelled row and the extended digits seen.
+    """
+
+    seen += "".join(dict.fromkeys(char for char in line if char not in seen + "0"))
+    return line.translate(str.maketrans(seen, "123456789"[: len(seen)])), seen
+
+
+def _dense_rows(lines: Sequence[str], first_row: int, bound: str | None) -> str | None:
+    """Best digit string for a fixed column order and first row
+
+    Rows are picked one at a time, smallest relabelled row first, within the
+    band constraints. Only rows that tie and leave the labels in different
+    states need to be followed further, which happens for grids that repeat
+    digits in a row.
+
+    Returns:
+        The digit string, or None once it cannot beat ``bound``.
+    """
+
+    digits, seen = _relabel(lines[first_row], "")
+    states = {(1 << first_row, seen)}
+
+    for step in range(1, 9):
+        best_line = None
+        next_states: set[tuple[int, str]] = set()
+
+        for used, seen in states:
+            # Finish the band in progress, or start an unused one.
+            if step % 3:
+                bands = [b for b in range(3) if used >> 3 * b & 7 not in (0, 7)]
+            else:
+                bands = [b for b in range(3) if not used >> 3 * b & 7]
+
+            for band in bands:
+                for row in range(3 * band, 3 * band + 3):
+                    if used >> row & 1:
+                        continue
+
+                    line, extended = _relabel(lines[row], seen)
+                    if best_line is None or line < best_line:
+                        best_line = line
+                        next_states = set()
+                    if line == best_line:
+                        next_states.add((used | 1 << row, extended))
+
+        digits += best_line
+        if bound is not None and digits > bound[: len(digits)]:
+            return None
+        states = next_states
+
+    return digits
+
+
+def _dense_form(puzzle_str: str) -> str | None:
+    """Canonical form of a grid with at most one empty cell
+
+    Every transform ties on the pattern (the empty cell, if any, comes
+    first), so the search runs over the digits instead: for every
+    orientation, column order and first row, :func:`_dense_rows` finds the
+    best order of the other rows, giving up as soon as it falls behind the
+    best string so far.
+
+    Returns:
+        The canonical string, or None if more than one cell is empty.
+    """
+
+    empty = puzzle_str.count("0")
+    if empty > 1:
+        return None
+
+    best = None
+    tried: set[tuple[str, ...]] = set()
+    for lines in (
+        [puzzle_str[row * 9 : row * 9 + 9] for row in range(9)],
+        [puzzle_str[row::9] for row in range(9)],
+    ):
+        if empty:
+            first_row, first_col = divmod("".join(lines).index("0"), 9)
+            first_rows = [first_row]
+        else:
+            first_rows, first_col = list(range(9)), None
+
+        for cols in _dense_orders(first_col):
+            getter = itemgetter(*cols)
+            permuted = tuple("".join(getter(line)) for line in lines)
+
+            # Repeated columns make many orders give the same rows.
+            if permuted in tried:
+                continue
+            tried.add(permuted)
+
+            for first_row in first_rows:
+                digits = _dense_rows(permuted, first_row, best)
+                if digits is not None and (best is None or digits < best):
+                    best = digits
+
+    return best
+
+
+def canonical_form(puzzle_str: str) -> str:
+    """Returns the canonical representative of a puzzle
+
+    Args:
+        puzzle_str: An 81-character puzzle string (0 or '.' for empty cells)
+
+    Returns:
+        The canonical 81-character puzzle string, equal for every puzzle
+        that is a relabelling, transposition or row/column/band/stack
+        permutation of this one.
+
+    Raises:
+        ValueError: If the string is not 81 digits or dots long.
+    """
+
+    puzzle_str = puzzle_str.replace(".", "0")
+    if not is_puzzle_string(puzzle_str):
+        raise ValueError(f"Not an 81-digit puzzle string: {puzzle_str!r}")
+
+    dense = _dense_form(puzzle_str)
+    if dense is not None:
+        return dense
+
+    pattern = puzzle_str.translate(_PATTERN)
+
+    # rows_of[transposed][row]: the filled cells of a row of the (transposed)
+    # grid, column c at bit 10 * c, like the packed signatures.
+    rows_of = tuple(
+        tuple(
+            sum(1 << 10 * col for col, char in enumerate(line) if char == "1")
+            for line in lines
+        )
+        for lines in (
+            [pattern[row * 9 : row * 9 + 9] for row in range(9)],
+            [pattern[row::9] for row in range(9)],
+        )
+    )
+
+    states: list[_State] = [(0, (), 0), (1, (), 0)]
+    for _ in range(9):
+        states = _next_states(states, rows_of)
+
+    best = None
+    for transposed, rows, packed in states:
+        sigs = [packed >> 10 * col & 511 for col in range(9)]
+        for cols in _column_orders(sigs):
+            if transposed:
+                order = [col * 9 + row for row in rows for col in cols]
+            else:
+                order = [row * 9 + col for row in rows for col in cols]
+
+            digits = "".join(map(puzzle_str.__getitem__, order))
+
+            # Relabel in order of first appearance.
+            seen = "".join(dict.fromkeys(digits.replace("0", "")))
+            digits = digits.translate(str.maketrans(seen, "123456789"[: len(seen)]))
+
+            if best is None or digits < best:
+                best = digits
+
+    return best
+
+
+def canonical_many(
+    puzzles: Iterable[str], workers: int = 1, chunk_size: int = 256
+) -> Iterator[str]:
+    """Canonicalizes a stream of puzzle strings
+
+    Args:
+        puzzles: 81-character puzzle strings
+        workers: Number of worker processes; 1 works in this process
+        chunk_size: Puzzles sent to a worker at once
+
+    Yields:
+        The canonical form of every puzzle, in input order.
+
+    Raises:
+        ValueError: If a string is not 81 digits or dots long.
+    """
+
+    if workers <= 1:
+        yield from map(canonical_form, puzzles)
+        return
+
+    from concurrent.futures import (  # pylint: disable=import-outside-toplevel
+        ProcessPoolExecutor,
+    )
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(canonical_form, puzzles, chunksize=chunk_size)
@@ -0,0 +1,292 @@
+"""Compact board representation.
+
+:class:`board.Board` favours the UI: nested lists for the cells, a set of
+tuples for the givens and set views for the pencil marks. That is a few
+kilobytes of small objects per board, which adds up for batch solving or for
+keeping many sessions alive. :class:`CompactBoard` holds the same game state
+in four flat fields:
+
+- ``cells``: a ``bytearray(81)`` of digits, row-major, 0 for empty
+- ``marks``: an ``array('H')`` of 81 pencil-mark digit masks
+- ``units``: an ``array('H')`` of 27 occupancy masks (rows 0-8, columns
+  9-17, squares 18-26, as in :mod:`solver`)
+- ``givens``: an 81-bit int, bit ``i`` set when cell ``i`` is a given
+
+Moves follow the same rules as :class:`board.Board`. Converting to and from
+nested lists (:attr:`CompactBoard.state`, :meth:`CompactBoard.from_grid`) and
+to and from :class:`board.Board` lets :mod:`logic` and the UI keep working.
+
+Classes:
+    CompactBoard: Flat, ``__slots__``-based board state.
+"""
+
+from array import array
+
+from board import Board
+from candidates import ALL_DIGITS, BIT, PEERS, SQUARE_OF, digits_of
+from utils import is_puzzle_string
+
+# Puzzle string byte -> cell digit ('.' is an empty cell), and back.
+_FROM_TEXT: bytes = bytes.maketrans(b"0123456789.", bytes(range(10)) + b"\0")
+_TO_TEXT: bytes = bytes.maketrans(bytes(range(10)), b"0123456789")
+
+# The row, column and square unit of every cell.
+_UNITS_OF: tuple[tuple[int, int, int], ...] = tuple(
+    (idx // 9, 9 + idx % 9, 18 + SQUARE_OF[idx]) for idx in range(81)
+)
+
+
+class CompactBoard:
+    """A Sudoku board in flat arrays
+
+    Attributes:
+        cells: The 81 cell digits, row-major, 0 for empty cells
+
+        marks: The pencil marks of every cell as digit masks
+
+        units: Occupancy masks of the 9 rows, 9 columns and 9 squares
+
+        givens: Bitmask of the fixed starting cells
+
+        zeroes: The number of empty cells
+
+        consistent: False if the starting grid already broke the rules, in
+        which case every move is rejected, as in :class:`board.Board`
+    """
+
+    __slots__ = ("cells", "marks", "units", "givens", "zeroes", "consistent")
+
+    def __init__(self, cells: bytes | bytearray | None = None):
+        """Initializes a board; every non-zero cell becomes a given
+
+        Args:
+            cells: 81 cell digits (0-9), row-major. If None, the board
+                   starts empty
+
+        Raises:
+            ValueError: If there are not exactly 81 digits.
+        """
+
+        self.cells: bytearray = bytearray(cells) if cells is not None else bytearray(81)
+        if len(self.cells) != 81 or max(self.cells) > 9:
+            raise ValueError("A board needs exactly 81 digits (0-9)")
+
+        self.marks: array = array("H", [0]) * 81
+        self.units: array = array("H", [0]) * 27
+        self.givens: int = 0
+        self.zeroes: int = 81
+        self.consistent: bool = True
+
+        units = self.units
+        for idx, num in enumerate(self.cells):
+            if not num:
+                continue
+
+            bit = BIT[num]
+            for unit in _UNITS_OF[idx]:
+                if units[unit] & bit:
+                    self.consistent = False
+                units[unit] |= bit
+
+            self.givens |= 1 << idx
+            self.zeroes -= 1
+
+    @classmethod
+    def from_string(cls, puzzle_str: str) -> "CompactBoard":
+        """Builds a board straight from an 81-character puzzle string
+
+        Args:
+            puzzle_str: The puzzle (0-9 or '.', where 0 and '.' are empty)
+
+        Returns:
+            The new board.
+
+        Raises:
+            ValueError: If the string is not 81 digits or dots long.
+        """
+
+        if not is_puzzle_string(puzzle_str, dots=True):
+            raise ValueError(f"Not an 81-digit puzzle string: {puzzle_str!r}")
+
+        return cls(puzzle_str.encode("ascii").translate(_FROM_TEXT))
+
+    @classmethod
+    def from_grid(cls, grid: list[list[int]]) -> "CompactBoard":
+        """Builds a board from a 9x9 nested-list grid."""
+
+        return cls(bytes(num for row in grid for num in row))
+
+    @classmethod
+    def from_board(cls, board: Board) -> "CompactBoard":
+        """Builds a board from a :class:`board.Board`, with its pencil marks.
+
+        Args:
+            board: The board to convert; its initial cells become the givens
+
+        Returns:
+            The new board.
+        """
+
+        compact = cls(bytes(num for row in board.state for num in row))
+        compact.givens = 0
+        for row, col in board.initial_cells:
+            compact.givens |= 1 << (row * 9 + col)
+        compact.marks = array("H", board.marks)
+        return compact
+
+    def to_string(self) -> str:
+        """Returns the 81-character puzzle string of the current cells."""
+
+        return self.cells.translate(_TO_TEXT).decode("ascii")
+
+    def to_board(self) -> Board:
+        """Returns an equivalent :class:`board.Board`, with its pencil marks.
+
+        Givens keep their status and filled non-given cells stay editable.
+        """
+
+        board = Board(self.state)
+        board.initial_cells = {
+            divmod(idx, 9) for idx in range(81) if self.givens >> idx & 1
+        }
+        for idx, mask in enumerate(self.marks):
+            board.marks[idx] = mask
+        return board
+
+    @property
+    def state(self) -> list[list[int]]:
+        """A new 9x9 nested-list copy of the cells, for :mod:`logic`."""
+
+        cells = self.cells
+        return [list(cells[row : row + 9]) for row in range(0, 81, 9)]
+
+    @property
+    def initial_cells(self) -> set[tuple[int, int]]:
+        """The givens as a set of (row, col) tuples, like :class:`board.Board`."""
+
+        return {divmod(idx, 9) for idx in range(81) if self.givens >> idx & 1}
+
+    def copy(self) -> "CompactBoard":
+        """Returns an independent copy: three buffer copies and a few ints."""
+
+        clone = CompactBoard.__new__(CompactBoard)
+        clone.cells = self.cells[:]
+        clone.marks = self.marks[:]
+        clone.units = self.units[:]
+        clone.givens = self.givens
+        clone.zeroes = self.zeroes
+        clone.consistent = self.consistent
+        return clone
+
+    def get(self, row: int, col: int) -> int:
+        """Returns the digit of a cell, 0 when empty."""
+
+        return self.cells[row * 9 + col]
+
+    def candidates(self, row: int, col: int) -> int:
+        """Returns the mask of digits that could legally go in a cell."""
+
+        units = self.units
+        first, second, third = _UNITS_OF[row * 9 + col]
+        return ALL_DIGITS & ~(units[first] | units[second] | units[third])
+
+    def is_solved(self) -> bool:
+        """Checks if the board is valid and completely filled."""
+
+        return self.zeroes == 0 and self.consistent
+
+    def is_valid(self) -> bool:
+        """Checks if the board state adheres to Sudoku rules."""
+
+        return self.consistent
+
+    def set_cell(self, row: int, col: int, value: int) -> bool:
+        """Sets a cell on the board to a given value
+
+        Same rules as :meth:`board.Board.set_cell`, and the digit is removed
+        from the pencil marks of the cell and its peers. Unlike
+        :class:`board.Board`, clearing the cell later does not bring those
+        marks back; that history is what this class leaves out.
+
+        Args:
+            row: The 0-indexed row of the cell (0-8)
+            col: The 0-indexed column of the cell (0-8)
+            value: The value to set the cell to (1-9)
+
+        Returns:
+            True if the cell was set successfully, False otherwise
+        """
+
+        idx = row * 9 + col
+
+        if self.givens >> idx & 1 or self.cells[idx]:
+            return False
+
+        if not 1 <= value <= 9 or not self.consistent:
+            return False
+
+        bit = BIT[value]
+        if not self.candidates(row, col) & bit:
+            return False
+
+        units = self.units
+        for unit in _UNITS_OF[idx]:
+            units[unit] |= bit
+
+        self.cells[idx] = value
+        self.zeroes -= 1
+
+        marks = self.marks
+        marks[idx] = 0
+        for peer in PEERS[idx]:
+            marks[peer] &= ~bit
+
+        return True
+
+    def clear_cell(self, row: int, col: int) -> bool:
+        """Clears a cell that is not a given and is currently filled.
+
+        Args:
+            row: The 0-indexed row of the cell (0-8)
+            col: The 0-indexed column of the cell (0-8)
+
+        Returns:
+            True if the cell was cleared successfully, False otherwise
+        """
+
+        idx = row * 9 + col
+        value = self.cells[idx]
+
+        if self.givens >> idx & 1 or not value:
+            return False
+
+        bit = ~BIT[value]
+        units = self.units
+        for unit in _UNITS_OF[idx]:
+            units[unit] &= bit
+
+        self.cells[idx] = 0
+        self.zeroes += 1
+        return True
+
+    def pencil_marks(self, row: int, col: int) -> list[int]:
+        """Returns the pencil marks of a cell as a sorted list of digits."""
+
+        return digits_of(self.marks[row * 9 + col])
+
+    def set_marks(self, row: int, col: int, mask: int) -> None:
+        """Replaces the pencil marks of a cell with a digit mask."""
+
+        self.marks[row * 9 + col] = mask
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompactBoard):
+            return NotImplemented
+        return (
+            self.cells == other.cells
+            and self.givens == other.givens
+            and self.marks == other.marks
+        )
+
+    def __str__(self) -> str:
+        return str(self.to_board())
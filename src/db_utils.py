@@ -6,46 +6,237 @@ store Sudoku puzzles and to load puzzles by difficulty.
 Functions:
     setup_database: Create the puzzles table when it does not exist.
     add_puzzles: Insert a small set of example puzzles into the database.
+    insert_puzzles: Insert a batch of labelled puzzles in one transaction.
+    rating_to_difficulty: Map an external numeric rating to a difficulty.
+    import_puzzles: Stream a puzzle dump into the database in batches.
+    add_puzzles_from_file: Import a puzzle dump (thin wrapper kept for callers).
+    backfill_difficulty: Grade puzzles with the human-style grader.
+    backfill_canonical: Fill the canonical column of older rows.
+    backfill_solution: Fill the solution column of older rows.
+    number_puzzles: Number the puzzles of every difficulty densely.
+    clear_row_counts: Forget the cached row counts used for random selection.
     load_puzzle_from_db: Load a random puzzle for a given difficulty.
+    load_solution: Load the stored solution of a puzzle.
+    close_connections: Close every pooled connection (app shutdown hook).
+
+Classes:
+    ConnectionPool: Thread-safe pool of reader and writer connections.
+
+The module is part of the headless core: it imports no Kivy, so scripts,
+tests and worker processes load it quickly. Resolving the database path of
+the installed app is left to ``main``.
+
+All helpers share one module-level :class:`ConnectionPool`, so connections
+(and the statements SQLite has already compiled on them) are reused across
+calls instead of being opened and parsed again every time.
 """
 
 import os
+import random
 import sqlite3
-from kivy.app import App
-from kivy.resources import resource_find
+import threading
+import time
+from collections import namedtuple
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from itertools import islice
+from operator import itemgetter
 
-from utils import parse_puzzle_string
+from canonical import canonical_form
+from grader import grade_many
+from packed import pack_puzzle, unpack_puzzle
+from solver import solve_many
+from utils import parse_puzzle_line, parse_puzzle_string
 
+# Per-connection settings used while bulk importing: a write-ahead log with
+# relaxed syncing and a 64 MiB page cache (negative values are KiB).
+IMPORT_PRAGMAS: tuple[str, ...] = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+)
 
-def get_db_path() -> str:
-    """Returns the absolute path to the database file.
 
-    Returns:
-        The database path as a string.
+# Prepared statements kept per connection, keyed by SQL text.
+CACHED_STATEMENTS: int = 64
+
+# Idle read-only connections kept per database file.
+MAX_IDLE_READERS: int = 4
+
+# The sequence number of a row inserted with the difficulty ``?2``: one past
+# the highest of its difficulty (a seek on idx_puzzles_seq), NULL for
+# unlabelled rows. Ignored duplicates use no number, so numbers stay dense.
+NEXT_SEQ_SQL: str = """
+    CASE WHEN ?2 IS NOT NULL THEN
+        (SELECT IFNULL(MAX(seq) + 1, 0) FROM puzzles WHERE difficulty = ?2)
+    END
     """
 
-    # Try on Android
-    res = resource_find("sudoku_puzzles.db")
-    if res:
-        return res
 
-    # Fallback for PC
-    app_dir = App.get_running_app().user_data_dir
-    return os.path.join(app_dir, "sudoku_puzzles.db")
+class ConnectionPool:
+    """Thread-safe pool of SQLite connections, keyed by database file.
 
+    Readers are read-only connections handed out one per caller and put back
+    afterwards, so concurrent threads never share one. Each database has a
+    single writer connection guarded by a lock, which serializes writes the
+    same way SQLite would. Connections are opened with
+    ``check_same_thread=False`` because a pooled connection may be returned
+    by a different thread than the one that opened it.
 
-def get_txt_path():
-    """Returns the absolute path to the puzzles.txt file."""
+    Attributes:
+        max_idle_readers: Idle readers kept per database; extra ones are
+        closed when returned
+    """
 
-    # Try on Android
-    res = resource_find("puzzles.txt")
-    if res:
-        return res
+    def __init__(self, max_idle_readers: int = MAX_IDLE_READERS):
+        """Initializes an empty pool
 
-    # Fallback for PC
-    return os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), "..", "data", "puzzles.txt"
-    )
+        Args:
+            max_idle_readers: Idle readers kept per database
+        """
+
+        self.max_idle_readers: int = max_idle_readers
+        self._lock = threading.Lock()
+        self._readers: dict[str, list[sqlite3.Connection]] = {}
+        self._writers: dict[str, sqlite3.Connection] = {}
+        self._writer_locks: dict[str, threading.RLock] = {}
+
+    @contextmanager
+    def reader(self, db_name: str) -> Iterator[sqlite3.Connection]:
+        """Checks out a read-only connection for the duration of the block.
+
+        Args:
+            db_name: The name of the database file.
+
+        Yields:
+            A read-only connection no other thread is using.
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened.
+        """
+
+        with self._lock:
+            idle = self._readers.setdefault(db_name, [])
+            conn = idle.pop() if idle else None
+
+        if conn is None:
+            conn = sqlite3.connect(
+                f"file:{db_name}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                cached_statements=CACHED_STATEMENTS,
+            )
+
+        try:
+            yield conn
+        finally:
+            with self._lock:
+                idle = self._readers.setdefault(db_name, [])
+                if len(idle) < self.max_idle_readers:
+                    idle.append(conn)
+                    conn = None
+
+            if conn is not None:
+                conn.close()
+
+    @contextmanager
+    def writer(self, db_name: str) -> Iterator[sqlite3.Connection]:
+        """Locks the writer connection of a database for the block.
+
+        The block runs as a transaction: it is committed when the block
+        exits normally and rolled back when it raises.
+
+        Args:
+            db_name: The name of the database file.
+
+        Yields:
+            The writer connection of the database.
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened.
+        """
+
+        with self._lock:
+            lock = self._writer_locks.setdefault(db_name, threading.RLock())
+
+        with lock:
+            conn = self._writers.get(db_name)
+            if conn is None:
+                conn = sqlite3.connect(
+                    db_name,
+                    check_same_thread=False,
+                    cached_statements=CACHED_STATEMENTS,
+                )
+                self._writers[db_name] = conn
+
+            with conn:
+                yield conn
+
+    def close_readers(self, db_name: str) -> None:
+        """Closes the idle readers of a database.
+
+        Args:
+            db_name: The name of the database file.
+        """
+
+        with self._lock:
+            idle = self._readers.pop(db_name, [])
+
+        for conn in idle:
+            conn.close()
+
+    def close(self) -> None:
+        """Closes every idle reader and every writer."""
+
+        with self._lock:
+            readers = [conn for idle in self._readers.values() for conn in idle]
+            writers = list(self._writers.items())
+            locks = dict(self._writer_locks)
+            self._readers.clear()
+
+        for conn in readers:
+            conn.close()
+
+        for db_name, conn in writers:
+            with locks[db_name]:
+                conn.close()
+                self._writers.pop(db_name, None)
+
+
+_pool = ConnectionPool()
+
+
+# (db_name, difficulty) -> (number of rows, whether they are all numbered)
+# of that difficulty, so a random pick does not count the rows each time.
+# Read by the prefetch worker and cleared by writers on other threads, so
+# every access holds the lock.
+_row_counts: dict[tuple[str, str], tuple[int, bool]] = {}
+_row_counts_lock = threading.Lock()
+
+
+class ImportReport(
+    namedtuple("ImportReport", ("lines", "inserted", "malformed", "seconds"))
+):
+    """Outcome of a bulk import.
+
+    Attributes:
+        lines: Number of non-blank lines read
+
+        inserted: Number of new rows written
+
+        malformed: Number of lines without a usable puzzle
+
+        seconds: Wall-clock duration of the import
+    """
+
+    __slots__ = ()
+
+    @property
+    def rate(self) -> float:
+        """Lines processed per second."""
+
+        return self.lines / self.seconds if self.seconds else 0.0
 
 
 def setup_database(db_name: str) -> None:
@@ -54,8 +245,23 @@ def setup_database(db_name: str) -> None:
     It's kind of overkill for this game, but it is more of an excuse for
     learning SQLite and its practical implementations.
 
+    Every puzzle also stores its ``canonical.canonical_form`` under a
+    UNIQUE index, so a relabelled, transposed or permuted copy of a stored
+    puzzle is ignored like an exact duplicate. Tables created before that
+    column existed get it added, empty; see :func:`backfill_canonical`.
+
+    The solution of every puzzle is computed once, when it is stored, and
+    kept packed 4 bits per cell (``packed.pack_puzzle``, 41 bytes) in the
+    ``solution`` column, NULL for puzzles without one. Older tables get the
+    column added, empty; see :func:`backfill_solution`.
+
+    The rows of every difficulty are numbered 0, 1, 2... in the ``seq``
+    column, under a UNIQUE index on ``(difficulty, seq)``, so a random pick
+    is one seek (see :func:`load_puzzle_from_db`). Older tables get the
+    column added and numbered; see :func:`number_puzzles`.
+
     Args:
-        db_name: The name of the database file. Defaults to DB_NAME.
+        db_name: The name of the database file.
 
     Raises:
         sqlite3.Error: If a database operation fails during the table creation.
@@ -65,26 +271,89 @@ def setup_database(db_name: str) -> None:
         CREATE TABLE IF NOT EXISTS puzzles (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             puzzle_string TEXT NOT NULL UNIQUE,
-            difficulty TEXT
+            difficulty TEXT,
+            canonical TEXT,
+            solution BLOB,
+            seq INTEGER
         );
         """
+    index_sql = """
+        CREATE INDEX IF NOT EXISTS idx_puzzles_difficulty
+        ON puzzles (difficulty);
+        """
+    canonical_index_sql = """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_puzzles_canonical
+        ON puzzles (canonical);
+        """
+    seq_index_sql = """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_puzzles_seq
+        ON puzzles (difficulty, seq);
+        """
     try:
-        with sqlite3.connect(db_name) as conn:
+        with _pool.writer(db_name) as conn:
             cursor = conn.cursor()
             cursor.execute(sql)
 
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(puzzles);")}
+            if "canonical" not in columns:
+                cursor.execute("ALTER TABLE puzzles ADD COLUMN canonical TEXT;")
+            if "solution" not in columns:
+                cursor.execute("ALTER TABLE puzzles ADD COLUMN solution BLOB;")
+            if "seq" not in columns:
+                cursor.execute("ALTER TABLE puzzles ADD COLUMN seq INTEGER;")
+
+            cursor.execute(index_sql)
+            cursor.execute(canonical_index_sql)
+            cursor.execute(seq_index_sql)
+
+        number_puzzles(db_name)
+
     except sqlite3.Error as e:
         print(f"Database error during setup: {e}")
 
 
+def _solution_blob(puzzle_str: str) -> bytes | None:
+    """Solves a puzzle and packs its solution, None if it has none."""
+
+    solution = next(solve_many((puzzle_str,)))
+    return pack_puzzle(solution) if solution else None
+
+
+def _annotate(puzzle_str: str) -> tuple[str, bytes | None]:
+    """Returns the (canonical, solution) columns of a new puzzle."""
+
+    return canonical_form(puzzle_str), _solution_blob(puzzle_str)
+
+
+def _map_many(
+    func: Callable[[str], object],
+    puzzles: Iterable[str],
+    workers: int = 1,
+    chunk_size: int = 256,
+) -> Iterator:
+    """Maps a module-level function over a stream of puzzles, in input
+    order, on ``workers`` processes if more than one."""
+
+    if workers <= 1:
+        yield from map(func, puzzles)
+        return
+
+    from concurrent.futures import (  # pylint: disable=import-outside-toplevel
+        ProcessPoolExecutor,
+    )
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(func, puzzles, chunksize=chunk_size)
+
+
 def add_puzzles(db_name: str) -> None:
     """Adds a predefined list of Sudoku puzzles to the database
 
     Honorable mention to INSERT OR IGNORE, meaning puzzles that already exist
-    will not be re-inserted.
+    (or an equivalent of them, by canonical form) will not be re-inserted.
 
     Args:
-        db_name (str): The name of the database file. Defaults to DB_NAME.
+        db_name (str): The name of the database file.
 
     Raises:
         sqlite3.Error: If a database operation fails during the insertion process.
@@ -117,76 +386,569 @@ def add_puzzles(db_name: str) -> None:
         ),
     ]
 
-    sql: str = """
-        INSERT OR IGNORE INTO puzzles (puzzle_string, difficulty) 
-        VALUES (?, ?); 
+    sql: str = f"""
+        INSERT OR IGNORE INTO puzzles
+        (puzzle_string, difficulty, canonical, solution, seq)
+        VALUES (?1, ?2, ?3, ?4, {NEXT_SEQ_SQL});
         """
 
     try:
-        with sqlite3.connect(db_name) as conn:
+        with _pool.writer(db_name) as conn:
             cursor = conn.cursor()
 
             for puzzle_str, difficulty in puzzles:
-                cursor.execute(sql, (puzzle_str, difficulty))
+                cursor.execute(sql, (puzzle_str, difficulty) + _annotate(puzzle_str))
+
+        clear_row_counts(db_name)
 
     except sqlite3.Error as e:
         print(f"Database error adding puzzles: {e}")
 
 
+def insert_puzzles(db_name: str, rows: Iterable[tuple[str, str | None]]) -> int:
+    """Inserts a batch of puzzles in one transaction.
+
+    Puzzles already in the table, or equivalent to one, are skipped, as in
+    :func:`add_puzzles`.
+
+    Args:
+        db_name: The name of the database file.
+        rows: (puzzle_string, difficulty) pairs.
+
+    Returns:
+        The number of new rows.
+
+    Raises:
+        sqlite3.Error: If a database operation fails during the insertion.
+    """
+
+    sql: str = f"""
+        INSERT OR IGNORE INTO puzzles
+        (puzzle_string, difficulty, canonical, solution, seq)
+        VALUES (?1, ?2, ?3, ?4, {NEXT_SEQ_SQL});
+        """
+
+    rows = [
+        (puzzle_str, difficulty) + _annotate(puzzle_str)
+        for puzzle_str, difficulty in rows
+    ]
+
+    try:
+        with _pool.writer(db_name) as conn:
+            changes_before = conn.total_changes
+            conn.executemany(sql, rows)
+            inserted = conn.total_changes - changes_before
+
+    finally:
+        clear_row_counts(db_name)
+
+    return inserted
+
+
+def rating_to_difficulty(rating: float | None) -> str | None:
+    """Maps an external numeric rating to a difficulty label.
+
+    Args:
+        rating: The rating column of a puzzle dump, if present
+
+    Returns:
+        'easy' below 1.5, 'medium' below 2.5, 'hard' otherwise, or None for
+        unrated puzzles.
+    """
+
+    if rating is None:
+        return None
+    if rating < 1.5:
+        return "easy"
+    if rating < 2.5:
+        return "medium"
+    return "hard"
+
+
+def _parse_rows(
+    file: Iterable[str], counts: dict[str, int]
+) -> Iterator[tuple[str, str | None]]:
+    """Lazily turns dump lines into (puzzle_string, difficulty) rows.
+
+    Malformed lines are skipped and tallied in ``counts``.
+    """
+
+    for line in file:
+        if not line.strip():
+            continue
+
+        counts["lines"] += 1
+        parsed = parse_puzzle_line(line)
+
+        if parsed is None:
+            counts["malformed"] += 1
+            continue
+
+        _, puzzle_str, rating = parsed
+        yield puzzle_str, rating_to_difficulty(rating)
+
+
+def import_puzzles(
+    file_path: str,
+    db_name: str,
+    batch_size: int = 100_000,
+    workers: int = 1,
+    annotate: bool = False,
+) -> ImportReport:
+    """Streams a puzzle dump into the database.
+
+    The file is read lazily and parsed with the tolerant
+    ``utils.parse_puzzle_line`` tokenizer, so lines with extra whitespace, a
+    missing id or a missing rating still import, and junk lines are counted
+    instead of aborting the run. Rows go through ``executemany`` in batches
+    of ``batch_size``, sorted by puzzle string and committed one transaction
+    per batch, under the ``IMPORT_PRAGMAS`` settings. The journal is
+    switched back to the default mode afterwards so the file can still be
+    opened read-only.
+
+    By default only the puzzle string and difficulty are written, which
+    keeps the import at ``executemany`` speed; exact duplicates are still
+    skipped. Canonical forms and solutions cost far more than the writes,
+    so they are filled in afterwards by :func:`backfill_canonical` and
+    :func:`backfill_solution`, which can spread them over several processes.
+    With ``annotate`` every row carries them right away instead, so
+    puzzles equivalent to a stored one (or to an earlier line) are skipped
+    like exact duplicates; that suits small dumps.
+
+    Args:
+        file_path: The path to the puzzle dump.
+        db_name: The name of the database file.
+        batch_size: Number of rows written per transaction.
+        workers: Number of processes annotating rows, with ``annotate``.
+        annotate: Compute the canonical form and solution of every row.
+
+    Returns:
+        An ImportReport with the line, insert and error counts and timing.
+
+    Raises:
+        sqlite3.Error: If a database operation fails during the import.
+        OSError: If the file cannot be read.
+    """
+
+    if annotate:
+        sql: str = f"""
+            INSERT OR IGNORE INTO puzzles
+            (puzzle_string, difficulty, canonical, solution, seq)
+            VALUES (?1, ?2, ?3, ?4, {NEXT_SEQ_SQL});
+            """
+    else:
+        sql: str = f"""
+            INSERT OR IGNORE INTO puzzles (puzzle_string, difficulty, seq)
+            VALUES (?1, ?2, {NEXT_SEQ_SQL});
+            """
+
+    counts = {"lines": 0, "malformed": 0}
+    start = time.perf_counter()
+
+    with _pool.writer(db_name) as conn:
+        saved = {
+            name: conn.execute(f"PRAGMA {name}").fetchone()[0]
+            for name in ("synchronous", "cache_size", "temp_store")
+        }
+
+    try:
+        with _pool.writer(db_name) as conn:
+            for pragma in IMPORT_PRAGMAS:
+                conn.execute(pragma)
+
+            changes_before = conn.total_changes
+
+        with open(file_path, "r", encoding="utf-8") as file:
+            rows = _parse_rows(file, counts)
+
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+
+                if annotate:
+                    annotations = _map_many(
+                        _annotate, (puzzle_str for puzzle_str, _ in batch), workers
+                    )
+                    batch = [
+                        row + annotation for row, annotation in zip(batch, annotations)
+                    ]
+
+                # Key order keeps the UNIQUE index writes local in the cache.
+                # Only the key is compared: a duplicate may be rated once and
+                # unrated once, and None does not compare with a string.
+                batch.sort(key=itemgetter(0))
+
+                with _pool.writer(db_name) as conn:
+                    conn.executemany(sql, batch)
+
+        inserted = conn.total_changes - changes_before
+
+    finally:
+        clear_row_counts(db_name)
+
+        # Leaving WAL needs exclusive access, so idle readers go first.
+        _pool.close_readers(db_name)
+        with _pool.writer(db_name) as conn:
+            conn.execute("PRAGMA journal_mode=DELETE")
+            for name, value in saved.items():
+                conn.execute(f"PRAGMA {name}={value}")
+
+    return ImportReport(
+        lines=counts["lines"],
+        inserted=inserted,
+        malformed=counts["malformed"],
+        seconds=time.perf_counter() - start,
+    )
+
+
 def add_puzzles_from_file(file_path: str, db_name: str) -> None:
     """Adds Sudoku puzzles from a text file to the database.
 
-    Each line in the file should contain a puzzle string followed by its
-    difficulty, separated by a comma.
+    Each line in the file should contain an id, a puzzle string and a
+    numeric rating separated by whitespace (the ``puzzles.txt`` layout).
+    See :func:`import_puzzles` for the streaming import it runs; every row
+    gets its canonical form and solution, which suits the bundled file.
 
     Args:
         file_path (str): The path to the text file containing puzzles.
-        db_name (str): The name of the database file. Defaults to DB_NAME.
+        db_name (str): The name of the database file.
 
     Raises:
         sqlite3.Error: If a database operation fails during the insertion process.
         IOError: If there is an error reading the file.
     """
 
-    sql: str = """
-        INSERT OR IGNORE INTO puzzles (puzzle_string, difficulty) 
-        VALUES (?, ?); 
+    try:
+        report = import_puzzles(file_path, db_name, annotate=True)
+
+        if report.malformed:
+            print(f"Skipped {report.malformed} malformed lines in {file_path}")
+
+    except sqlite3.Error as e:
+        print(f"Database error adding puzzles from file: {e}")
+    except IOError as e:
+        print(f"File error: {e}")
+
+
+def backfill_difficulty(
+    db_name: str, overwrite: bool = False, workers: int = 1, batch_size: int = 10_000
+) -> int:
+    """Grades puzzles with :mod:`grader` and stores their difficulty.
+
+    The grader score goes through the same thresholds as external ratings
+    (:func:`rating_to_difficulty`), so graded and imported labels agree.
+    Rows are read and written back ``batch_size`` at a time in id order,
+    one transaction per batch, so an interrupted run keeps its progress.
+    Labelled rows are numbered afterwards (:func:`number_puzzles`), from
+    scratch when ``overwrite`` may have moved rows between difficulties.
+
+    Args:
+        db_name: The name of the database file.
+        overwrite: Regrade every puzzle instead of only unlabelled ones.
+        workers: Number of grading processes (see ``grader.grade_many``).
+        batch_size: Number of rows graded and written per transaction.
+
+    Returns:
+        The number of rows updated.
+
+    Raises:
+        sqlite3.Error: If a database operation fails during the backfill.
+    """
+
+    select_sql: str = f"""
+        SELECT id, puzzle_string FROM puzzles
+        WHERE id > ? {"" if overwrite else "AND difficulty IS NULL"}
+        ORDER BY id LIMIT ?;
         """
+    update_sql: str = "UPDATE puzzles SET difficulty = ?, seq = NULL WHERE id = ?;"
+
+    updated = 0
+    last_id = 0
 
     try:
-        with open(file_path, "r", encoding="utf-8") as file, sqlite3.connect(
-            db_name
-        ) as conn:
-            cursor = conn.cursor()
+        while True:
+            with _pool.reader(db_name) as conn:
+                rows = conn.execute(select_sql, (last_id, batch_size)).fetchall()
+            if not rows:
+                break
 
-            for line in file:
-                _, puzzle_str, _, difficulty = line.strip().split(" ")
+            last_id = rows[-1][0]
+            scores = grade_many((puzzle_str for _, puzzle_str in rows), workers)
+            labels = [
+                (rating_to_difficulty(score), puzzle_id)
+                for (puzzle_id, _), score in zip(rows, scores)
+                if score is not None
+            ]
 
-                difficulty = float(difficulty)
+            with _pool.writer(db_name) as conn:
+                conn.executemany(update_sql, labels)
+            updated += len(labels)
 
-                if difficulty < 1.5:
-                    difficulty = "easy"
-                elif difficulty < 2.5:
-                    difficulty = "medium"
-                else:
-                    difficulty = "hard"
+    finally:
+        number_puzzles(db_name, renumber=overwrite)
 
-                cursor.execute(sql, (puzzle_str, difficulty))
+    return updated
 
-    except sqlite3.Error as e:
-        print(f"Database error adding puzzles from file: {e}")
-    except IOError as e:
-        print(f"File error: {e}")
+
+def backfill_canonical(
+    db_name: str,
+    drop_duplicates: bool = False,
+    workers: int = 1,
+    batch_size: int = 10_000,
+) -> tuple[int, int]:
+    """Fills the canonical column of rows stored before it existed.
+
+    A row equivalent to a puzzle that already has its canonical form is a
+    duplicate the UNIQUE index cannot take: it keeps an empty canonical
+    column, or is deleted with ``drop_duplicates``, after which the rows
+    are numbered again (:func:`number_puzzles`).
+
+    Args:
+        db_name: The name of the database file.
+        drop_duplicates: Delete the duplicates instead of leaving them.
+        workers: Number of processes computing canonical forms.
+        batch_size: Number of rows read and written per transaction.
+
+    Returns:
+        The number of rows filled in and the number of duplicates found.
+
+    Raises:
+        sqlite3.Error: If a database operation fails during the backfill.
+    """
+
+    select_sql: str = """
+        SELECT id, puzzle_string FROM puzzles
+        WHERE id > ? AND canonical IS NULL
+        ORDER BY id LIMIT ?;
+        """
+    update_sql: str = "UPDATE OR IGNORE puzzles SET canonical = ? WHERE id = ?;"
+    delete_sql: str = "DELETE FROM puzzles WHERE id = ?;"
+
+    filled = duplicates = 0
+    last_id = 0
+
+    try:
+        while True:
+            with _pool.reader(db_name) as conn:
+                rows = conn.execute(select_sql, (last_id, batch_size)).fetchall()
+            if not rows:
+                break
+
+            last_id = rows[-1][0]
+
+            canonicals = _map_many(
+                canonical_form, (puzzle_str for _, puzzle_str in rows), workers
+            )
+
+            with _pool.writer(db_name) as conn:
+                for (puzzle_id, _), canonical in zip(rows, canonicals):
+                    changes = conn.total_changes
+                    conn.execute(update_sql, (canonical, puzzle_id))
+
+                    if conn.total_changes > changes:
+                        filled += 1
+                        continue
+
+                    duplicates += 1
+                    if drop_duplicates:
+                        conn.execute(delete_sql, (puzzle_id,))
+
+    finally:
+        if drop_duplicates and duplicates:
+            number_puzzles(db_name, renumber=True)
+
+    return filled, duplicates
+
+
+def backfill_solution(db_name: str, workers: int = 1, batch_size: int = 10_000) -> int:
+    """Fills the solution column of rows stored before it existed.
+
+    Puzzles without a solution keep an empty column.
+
+    Args:
+        db_name: The name of the database file.
+        workers: Number of solving processes.
+        batch_size: Number of rows read and written per transaction.
+
+    Returns:
+        The number of rows filled in.
+
+    Raises:
+        sqlite3.Error: If a database operation fails during the backfill.
+    """
+
+    select_sql: str = """
+        SELECT id, puzzle_string FROM puzzles
+        WHERE id > ? AND solution IS NULL
+        ORDER BY id LIMIT ?;
+        """
+    update_sql: str = "UPDATE puzzles SET solution = ? WHERE id = ?;"
+
+    filled = 0
+    last_id = 0
+
+    while True:
+        with _pool.reader(db_name) as conn:
+            rows = conn.execute(select_sql, (last_id, batch_size)).fetchall()
+        if not rows:
+            break
+
+        last_id = rows[-1][0]
+        solutions = _map_many(
+            _solution_blob, (puzzle_str for _, puzzle_str in rows), workers
+        )
+        updates = [
+            (solution, puzzle_id)
+            for (puzzle_id, _), solution in zip(rows, solutions)
+            if solution is not None
+        ]
+
+        with _pool.writer(db_name) as conn:
+            conn.executemany(update_sql, updates)
+        filled += len(updates)
+
+    return filled
+
+
+def number_puzzles(db_name: str, renumber: bool = False) -> int:
+    """Numbers the puzzles of every difficulty 0, 1, 2... without gaps.
+
+    Rows inserted by this module are numbered as they are written. This
+    numbers the others (older tables, or rows written through another
+    connection) after the existing ones, in id order; with nothing to
+    number each difficulty costs a few index seeks. Deleting rows or
+    moving them to another difficulty leaves gaps, which ``renumber``
+    closes by numbering every row again.
+
+    Args:
+        db_name: The name of the database file.
+        renumber: Number every row again instead of only the unnumbered ones.
+
+    Returns:
+        The number of rows numbered.
+
+    Raises:
+        sqlite3.Error: If a database operation fails.
+    """
+
+    first_sql: str = "SELECT MIN(difficulty) FROM puzzles;"
+    next_sql: str = "SELECT MIN(difficulty) FROM puzzles WHERE difficulty > ?;"
+    clear_sql: str = "UPDATE puzzles SET seq = NULL WHERE difficulty = ?;"
+    top_sql: str = "SELECT MAX(seq) FROM puzzles WHERE difficulty = ?;"
+    number_sql: str = """
+        WITH fresh AS (
+            SELECT id, ROW_NUMBER() OVER (ORDER BY id) AS n
+            FROM puzzles WHERE difficulty = ? AND seq IS NULL
+        )
+        UPDATE puzzles SET seq = ? + fresh.n
+        FROM fresh WHERE puzzles.id = fresh.id;
+        """
+
+    numbered = 0
+
+    try:
+        with _pool.writer(db_name) as conn:
+            # One seek per difficulty instead of a DISTINCT scan.
+            difficulty = conn.execute(first_sql).fetchone()[0]
+
+            while difficulty is not None:
+                if renumber:
+                    conn.execute(clear_sql, (difficulty,))
+
+                top = conn.execute(top_sql, (difficulty,)).fetchone()[0]
+                changes_before = conn.total_changes
+                conn.execute(number_sql, (difficulty, -1 if top is None else top))
+                numbered += conn.total_changes - changes_before
+
+                difficulty = conn.execute(next_sql, (difficulty,)).fetchone()[0]
+
+    finally:
+        clear_row_counts(db_name)
+
+    return numbered
+
+
+def clear_row_counts(db_name: str | None = None) -> None:
+    """Forgets the cached row counts used by :func:`load_puzzle_from_db`.
+
+    Called after this module writes puzzles; call it yourself after writing
+    to the database through another connection.
+
+    Args:
+        db_name: Only forget the counts of this database. Defaults to all.
+    """
+
+    with _row_counts_lock:
+        for key in list(_row_counts):
+            if db_name is None or key[0] == db_name:
+                del _row_counts[key]
+
+
+def _get_row_count(
+    cursor: sqlite3.Cursor, db_name: str, difficulty: str
+) -> tuple[int, bool] | None:
+    """Returns the cached number of puzzles of a difficulty, and whether
+    they are all numbered.
+
+    When they are, the count is the highest sequence number plus one: two
+    seeks on ``idx_puzzles_seq``. Otherwise the rows are counted. Missing
+    difficulties are not cached, so puzzles added later are still found.
+    """
+
+    key = (db_name, difficulty)
+    with _row_counts_lock:
+        cached = _row_counts.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        top = cursor.execute(
+            "SELECT MAX(seq) FROM puzzles WHERE difficulty = ?", (difficulty,)
+        ).fetchone()[0]
+        unnumbered = cursor.execute(
+            "SELECT 1 FROM puzzles WHERE difficulty = ? AND seq IS NULL LIMIT 1",
+            (difficulty,),
+        ).fetchone()
+
+    except sqlite3.OperationalError:
+        # A table from before the seq column, opened read-only.
+        top, unnumbered = None, True
+
+    if top is not None and unnumbered is None:
+        row_count = (top + 1, True)
+    else:
+        count = cursor.execute(
+            "SELECT COUNT(*) FROM puzzles WHERE difficulty = ?", (difficulty,)
+        ).fetchone()[0]
+        if not count:
+            return None
+        row_count = (count, False)
+
+    with _row_counts_lock:
+        _row_counts[key] = row_count
+    return row_count
 
 
 def load_puzzle_from_db(difficulty: str, db_name: str) -> list[list[int]]:
     """Loads a random puzzle from the database with the specified difficulty.
 
+    Instead of ``ORDER BY RANDOM()``, which sorts every row of the
+    difficulty, a random number is drawn below the cached row count of the
+    difficulty and the puzzle with that sequence number is read through the
+    ``idx_puzzles_seq`` index (see :func:`number_puzzles`). Every puzzle of
+    the difficulty is equally likely, and the cost no longer depends on the
+    table size.
+
+    Tables with unnumbered rows of the difficulty fall back to skipping that
+    many rows in id order, which is uniform too but reads every skipped
+    index entry.
+
     Args:
         difficulty (str): The difficulty level to filter by
-                          (e.g., 'easy', 'medium'). Defaults to 'easy'.
+                          (e.g., 'easy', 'medium').
 
-        db_name (str): The name of the database file. Defaults to DB_NAME.
+        db_name (str): The name of the database file.
 
     Returns:
         A 9x9 list of lists representing the puzzle or an empty 2d list
@@ -196,23 +958,40 @@ def load_puzzle_from_db(difficulty: str, db_name: str) -> list[list[int]]:
         sqlite3.Error: If a database operation fails during the query process.
     """
 
-    db_name = db_name if db_name else get_db_path()
-
-    sql: str = """
-        SELECT puzzle_string FROM puzzles 
-        WHERE difficulty = ? ORDER BY RANDOM() LIMIT 1
+    # At or after the drawn number, so a gap left by rows deleted through
+    # another connection still finds a puzzle.
+    seq_sql: str = """
+        SELECT puzzle_string FROM puzzles
+        WHERE difficulty = ? AND seq >= ? ORDER BY seq LIMIT 1
+        """
+    offset_sql: str = """
+        SELECT puzzle_string FROM puzzles
+        WHERE difficulty = ? ORDER BY id LIMIT 1 OFFSET ?
         """
     puzzle_grid = [[]]
 
     try:
-        with sqlite3.connect(f"file:{db_name}?mode=ro", uri=True) as conn:
+        with _pool.reader(db_name) as conn:
             cursor = conn.cursor()
-            cursor.execute(sql, (difficulty,))
-            result = cursor.fetchone()
 
-            if result:
-                puzzle_str = result[0]
-                puzzle_grid: list[list[int]] = parse_puzzle_string(puzzle_str)
+            # A second attempt with a fresh count covers rows deleted since
+            # the count was cached.
+            for _ in range(2):
+                row_count = _get_row_count(cursor, db_name, difficulty)
+                if row_count is None:
+                    break
+
+                count, numbered = row_count
+                sql = seq_sql if numbered else offset_sql
+                cursor.execute(sql, (difficulty, random.randrange(count)))
+                result = cursor.fetchone()
+
+                if result:
+                    puzzle_str = result[0]
+                    puzzle_grid: list[list[int]] = parse_puzzle_string(puzzle_str)
+                    break
+
+                clear_row_counts(db_name)
 
     except sqlite3.Error as e:
         print(f"Database error loading puzzle: {e}")
@@ -221,3 +1000,44 @@ def load_puzzle_from_db(difficulty: str, db_name: str) -> list[list[int]]:
         print(f"No valid puzzle found for difficulty: {difficulty}")
 
     return puzzle_grid
+
+
+def load_solution(puzzle_str: str, db_name: str) -> list[list[int]] | None:
+    """Loads the stored solution of a puzzle.
+
+    A single seek on the UNIQUE index of ``puzzle_string``; nothing is
+    solved here.
+
+    Args:
+        puzzle_str: The 81-character puzzle, as stored
+        db_name: The name of the database file.
+
+    Returns:
+        The 9x9 solved grid, or None if the puzzle is not stored, has no
+        stored solution or the table predates the solution column.
+    """
+
+    sql: str = "SELECT solution FROM puzzles WHERE puzzle_string = ?"
+
+    try:
+        with _pool.reader(db_name) as conn:
+            result = conn.execute(sql, (puzzle_str,)).fetchone()
+
+    except sqlite3.Error as e:
+        print(f"Database error loading solution: {e}")
+        return None
+
+    if result is None or result[0] is None:
+        return None
+
+    return parse_puzzle_string(unpack_puzzle(result[0]))
+
+
+def close_connections() -> None:
+    """Closes every pooled connection.
+
+    Meant for application shutdown (``SudokuApp.on_stop``); the pool opens
+    new connections on demand if it is used again afterwards.
+    """
+
+    _pool.close()
@@ -0,0 +1,362 @@
+"""Dancing Links (Algorithm X) exact-cover solver backend.
+
+Sudoku is encoded as an exact-cover problem with 324 constraint columns (each
+cell filled once; each digit once per row, column and square) and 729 option
+rows, one per (cell, digit) pair. Knuth's Dancing Links covers and uncovers
+columns by relinking a sparse toroidal matrix.
+
+Instead of one Python object per node, the matrix lives in flat integer
+lists (left, right, up, down, column and option of every node). The full
+matrix is built once as a template and copied per solve, which is a handful
+of list copies.
+
+The module mirrors the API of :mod:`solver` so either can be used as a
+backend, and every search function accepts a ``select`` strategy that picks
+the next column to branch on.
+
+Functions:
+    select_min: Pick the column with the fewest options (Knuth's heuristic).
+    select_first: Pick the leftmost uncovered column.
+    iter_solutions: Lazily enumerate every solution of a 9x9 grid.
+    solve: Solve a 9x9 grid and return the first solution found.
+    count_solutions: Count solutions of a 9x9 grid, stopping at a limit.
+    solve_many: Solve a stream of 81-character puzzle strings.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+
+from candidates import SQUARE_OF
+from utils import flatten, is_puzzle_string
+
+ROOT: int = 0
+COLUMNS: int = 324
+
+# Column selection strategy: given the right links and column sizes, return
+# the header of the column to branch on next.
+Selector = Callable[[list[int], list[int]], int]
+
+
+def select_min(right: list[int], size: list[int]) -> int:
+    """Selects the uncovered column with the fewest remaining options.
+
+    Args:
+        right: Right links of the matrix (headers start at the root)
+        size: Number of options left in every column
+
+    Returns:
+        The header index of the chosen column.
+    """
+
+    best, best_size = ROOT, 730
+    col = right[ROOT]
+
+    while col != ROOT:
+        if size[col] < best_size:
+            best, best_size = col, size[col]
+            if best_size < 2:
+                break
+        col = right[col]
+
+    return best
+
+
+def select_first(right: list[int], size: list[int]) -> int:  # pylint: disable=W0613
+    """Selects the leftmost uncovered column (no heuristic).
+
+    Args:
+        right: Right links of the matrix (headers start at the root)
+        size: Number of options left in every column, unused
+
+    Returns:
+        The header index of the chosen column.
+    """
+
+    return right[ROOT]
+
+
+def _option_columns(option: int) -> tuple[int, int, int, int]:
+    """Returns the four constraint columns (1-324) covered by an option."""
+
+    idx, digit = divmod(option, 9)
+    row, col = divmod(idx, 9)
+
+    return (
+        1 + idx,
+        82 + row * 9 + digit,
+        163 + col * 9 + digit,
+        244 + SQUARE_OF[idx] * 9 + digit,
+    )
+
+
+def _build_template() -> tuple[list[int], ...]:
+    """Builds the full 324-column, 729-option matrix in flat lists."""
+
+    nodes = 1 + COLUMNS + 729 * 4
+
+    left = [0] * nodes
+    right = [0] * nodes
+    up = list(range(nodes))
+    down = list(range(nodes))
+    column = list(range(nodes))
+    option_of = [-1] * nodes
+    size = [0] * (1 + COLUMNS)
+
+    for header in range(1 + COLUMNS):
+        left[header] = header - 1 if header else COLUMNS
+        right[header] = header + 1 if header < COLUMNS else ROOT
+
+    node = 1 + COLUMNS
+    for option in range(729):
+        first = node
+
+        for col in _option_columns(option):
+            column[node] = col
+            option_of[node] = option
+
+            up[node] = up[col]
+            down[node] = col
+            down[up[col]] = node
+            up[col] = node
+            size[col] += 1
+
+            left[node] = node - 1
+            right[node] = node + 1
+            node += 1
+
+        left[first] = node - 1
+        right[node - 1] = first
+
+    return left, right, up, down, column, option_of, size
+
+
+_TEMPLATE: tuple[list[int], ...] = _build_template()
+
+# First node of every option, so givens can be selected without a search.
+_OPTION_NODE: tuple[int, ...] = tuple(1 + COLUMNS + option * 4 for option in range(729))
+
+
+class _Matrix:
+    """A private, mutable copy of the template matrix."""
+
+    __slots__ = ("left", "right", "up", "down", "column", "option_of", "size")
+
+    def __init__(self):
+        left, right, up, down, column, option_of, size = _TEMPLATE
+
+        self.left = left[:]
+        self.right = right[:]
+        self.up = up[:]
+        self.down = down[:]
+        self.size = size[:]
+
+        # Never modified, so they can be shared.
+        self.column = column
+        self.option_of = option_of
+
+    def cover(self, col: int) -> None:
+        """Removes a column and every option that intersects it."""
+
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column, size = self.column, self.size
+
+        right[left[col]] = right[col]
+        left[right[col]] = left[col]
+
+        row = down[col]
+        while row != col:
+            node = right[row]
+            while node != row:
+                down[up[node]] = down[node]
+                up[down[node]] = up[node]
+                size[column[node]] -= 1
+                node = right[node]
+            row = down[row]
+
+    def uncover(self, col: int) -> None:
+        """Restores a column covered by :meth:`cover`, in reverse order."""
+
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column, size = self.column, self.size
+
+        row = up[col]
+        while row != col:
+            node = left[row]
+            while node != row:
+                size[column[node]] += 1
+                down[up[node]] = node
+                up[down[node]] = node
+                node = left[node]
+            row = up[row]
+
+        right[left[col]] = col
+        left[right[col]] = col
+
+    def select_option(self, first: int) -> None:
+        """Covers every column of an option, starting at its node ``first``."""
+
+        node = first
+        while True:
+            self.cover(self.column[node])
+            node = self.right[node]
+            if node == first:
+                break
+
+    def search(self, chosen: list[int], select: Selector) -> Iterator[list[int]]:
+        """Yields every exact cover of the remaining columns.
+
+        Args:
+            chosen: Options selected so far, extended and restored in place
+            select: Column selection strategy
+
+        Yields:
+            The list of chosen options for each solution. The list is reused,
+            so callers must copy it before resuming the generator.
+        """
+
+        right = self.right
+        if right[ROOT] == ROOT:
+            yield chosen
+            return
+
+        col = select(right, self.size)
+        if not self.size[col]:
+            return
+
+        self.cover(col)
+
+        down, left, column = self.down, self.left, self.column
+        row = down[col]
+        while row != col:
+            chosen.append(self.option_of[row])
+
+            node = right[row]
+            while node != row:
+                self.cover(column[node])
+                node = right[node]
+
+            yield from self.search(chosen, select)
+
+            node = left[row]
+            while node != row:
+                self.uncover(column[node])
+                node = left[node]
+
+            chosen.pop()
+            row = down[row]
+
+        self.uncover(col)
+
+
+def _iter_cells(cells: list[int], select: Selector) -> Iterator[list[int]]:
+    """Yields the solutions of a flat 81-cell board as flat cell lists."""
+
+    matrix = _Matrix()
+    covered: set[int] = set()
+
+    for idx, num in enumerate(cells):
+        if not num:
+            continue
+
+        option = idx * 9 + num - 1
+        columns = _option_columns(option)
+
+        if covered.intersection(columns):
+            return
+
+        covered.update(columns)
+        matrix.select_option(_OPTION_NODE[option])
+
+    for chosen in matrix.search([], select):
+        solution = cells[:]
+        for option in chosen:
+            idx, digit = divmod(option, 9)
+            solution[idx] = digit + 1
+        yield solution
+
+
+def iter_solutions(
+    grid: list[list[int]], select: Selector = select_min
+) -> Iterator[list[list[int]]]:
+    """Lazily enumerates the solutions of a Sudoku board
+
+    Solutions are produced one at a time, so even boards with astronomically
+    many solutions (such as an empty one) can be sampled with ``islice``.
+
+    Args:
+        grid: A 9x9 grid as produced by ``utils.parse_puzzle_string``
+        select: Column selection strategy, :func:`select_min` by default
+
+    Yields:
+        Each solution as a new 9x9 grid. Malformed or clashing grids yield
+        nothing.
+    """
+
+    cells = flatten(grid)
+    if cells is None:
+        return
+
+    for solution in _iter_cells(cells, select):
+        yield [solution[row * 9 : row * 9 + 9] for row in range(9)]
+
+
+def solve(
+    grid: list[list[int]], select: Selector = select_min
+) -> list[list[int]] | None:
+    """Solves a Sudoku board
+
+    Args:
+        grid: A 9x9 grid as produced by ``utils.parse_puzzle_string``
+        select: Column selection strategy, :func:`select_min` by default
+
+    Returns:
+        The solved 9x9 grid, or None if the grid is malformed, breaks the
+        rules or has no solution.
+    """
+
+    return next(iter_solutions(grid, select), None)
+
+
+def count_solutions(
+    grid: list[list[int]], limit: int = 2, select: Selector = select_min
+) -> int:
+    """Counts the solutions of a Sudoku board, stopping early at ``limit``
+
+    Args:
+        grid: A 9x9 grid as produced by ``utils.parse_puzzle_string``
+        limit: The number of solutions after which the search stops
+        select: Column selection strategy, :func:`select_min` by default
+
+    Returns:
+        The number of solutions found, at most ``limit``.
+    """
+
+    count = 0
+    for _ in iter_solutions(grid, select):
+        count += 1
+        if count >= limit:
+            break
+
+    return count
+
+
+def solve_many(
+    puzzles: Iterable[str], select: Selector = select_min
+) -> Iterator[str | None]:
+    """Solves a stream of puzzle strings
+
+    Args:
+        puzzles: 81-character puzzle strings (0-9, where 0 is an empty cell)
+        select: Column selection strategy, :func:`select_min` by default
+
+    Yields:
+        The 81-character solution for each puzzle, in input order, or None
+        if the puzzle is malformed or has no solution.
+    """
+
+    for puzzle_str in puzzles:
+        if not is_puzzle_string(puzzle_str):
+            yield None
+            continue
+
+        solution = next(_iter_cells([int(char) for char in puzzle_str], select), None)
+        yield "".join(map(str, solution)) if solution else None
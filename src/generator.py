@@ -0,0 +1,372 @@
+"""Random puzzle generator.
+
+A puzzle is made in two steps:
+
+1. A random full grid: the three diagonal squares do not constrain each
+   other, so they are filled with random permutations and the solver
+   completes the rest.
+2. Digging: clues are removed in random order, each one only if the puzzle
+   keeps a unique solution. Removing the clue ``v`` of a cell keeps the
+   solution unique exactly when no solution puts another digit there, so
+   each check is a solver search stopping at the first such solution.
+
+A difficulty band is reached with :mod:`grader`: a dug puzzle that grades
+too hard gets clues back, and one that grades too easy is thrown away.
+
+Functions:
+    random_grid: Build a random solved grid.
+    dig: Remove clues from a solved grid while keeping the solution unique.
+    generate: Generate one puzzle, optionally within a score band.
+    generate_many: Generate a stream of puzzles, optionally in parallel.
+    generate_into_db: Generate puzzles straight into the puzzles table.
+    main: Command-line entry point.
+
+Classes:
+    GenerateReport: Outcome of generating puzzles into a database.
+"""
+
+import os
+import random
+import sys
+from collections import namedtuple
+from collections.abc import Iterator
+from itertools import islice
+
+from candidates import ALL_DIGITS, BIT, SQUARE_OF
+from db_utils import insert_puzzles, rating_to_difficulty, setup_database
+from grader import grade_string
+from solver import UNITS, solve_cells
+
+# Score bands of the difficulty labels, as in ``db_utils.rating_to_difficulty``.
+BANDS: dict[str, tuple[float, float]] = {
+    "easy": (0.0, 1.5),
+    "medium": (1.5, 2.5),
+    "hard": (2.5, float("inf")),
+}
+
+_UNITS_OF: tuple[tuple[int, int, int], ...] = tuple(
+    (idx // 9, 9 + idx % 9, 18 + SQUARE_OF[idx]) for idx in range(81)
+)
+
+
+class GenerateReport(
+    namedtuple("GenerateReport", ("requested", "generated", "inserted"))
+):
+    """Outcome of :func:`generate_into_db`.
+
+    Attributes:
+        requested: Number of puzzles asked for
+
+        generated: Number of puzzles generated within the attempt budget
+
+        inserted: Number of new rows written; duplicates are skipped
+    """
+
+    __slots__ = ()
+
+    @property
+    def shortfall(self) -> int:
+        """Puzzles that could not be generated within the attempt budget."""
+
+        return self.requested - self.generated
+
+
+def random_grid(rng: random.Random) -> list[int]:
+    """Builds a random solved grid
+
+    Args:
+        rng: The random source
+
+    Returns:
+        The 81 cells of the grid, row-major.
+    """
+
+    cells = [0] * 81
+    for sqr in (0, 4, 8):
+        digits = rng.sample(range(1, 10), 9)
+        for idx in range(81):
+            if SQUARE_OF[idx] == sqr:
+                cells[idx] = digits.pop()
+
+    return solve_cells(cells)[0]
+
+
+def _candidates(used: list[int], idx: int) -> int:
+    first, second, third = _UNITS_OF[idx]
+    return ALL_DIGITS & ~(used[first] | used[second] | used[third])
+
+
+def _single(cells: list[int], used: list[int], idx: int, bit: int) -> bool:
+    """Checks if the clues alone force the digit ``bit`` into the empty
+    cell ``idx``: as its only candidate, or as its only place in a unit."""
+
+    if _candidates(used, idx) == bit:
+        return True
+
+    for unit in _UNITS_OF[idx]:
+        if all(
+            other == idx or cells[other] or not _candidates(used, other) & bit
+            for other in UNITS[unit]
+        ):
+            return True
+
+    return False
+
+
+def _forced(cells: list[int], idx: int, num: int) -> bool:
+    """Checks that ``num`` is the only digit of cell ``idx`` in any solution
+    of the puzzle ``cells`` (in which the cell is empty)."""
+
+    return not solve_cells(cells, 1, exclude=((idx, num),))
+
+
+def dig(
+    solution: list[int], rng: random.Random, min_clues: int = 17
+) -> tuple[list[int], list[int]]:
+    """Removes clues from a solved grid while keeping the solution unique
+
+    Most early removals are settled by the remaining clues alone: the cell
+    is left with a single candidate, or the digit with a single cell in one
+    of its units. Only the other removals need a solver search.
+
+    Args:
+        solution: The 81 cells of a solved grid
+        rng: The random source for the removal order
+        min_clues: Stop once this few clues are left
+
+    Returns:
+        The puzzle and the indices of the removed cells, in removal order.
+    """
+
+    cells = solution[:]
+    removed: list[int] = []
+
+    # Occupancy masks of the clues, per unit (numbered as solver.UNITS).
+    used = [ALL_DIGITS] * 27
+
+    for idx in rng.sample(range(81), 81):
+        if 81 - len(removed) <= min_clues:
+            break
+
+        num = cells[idx]
+        bit = BIT[num]
+        units = _UNITS_OF[idx]
+        cells[idx] = 0
+        for unit in units:
+            used[unit] &= ~bit
+
+        if _single(cells, used, idx, bit) or _forced(cells, idx, num):
+            removed.append(idx)
+        else:
+            cells[idx] = num
+            for unit in units:
+                used[unit] |= bit
+
+    return cells, removed
+
+
+def _to_string(cells: list[int]) -> str:
+    return "".join(map(str, cells))
+
+
+def generate(
+    rng: random.Random,
+    min_score: float = 0.0,
+    max_score: float = float("inf"),
+    attempts: int = 100,
+) -> tuple[str, float] | None:
+    """Generates a puzzle with a unique solution and a score in a band
+
+    A dug puzzle scoring above ``max_score`` gets its last removed clues
+    back, found by bisecting the removal order, until it fits. Puzzles
+    scoring below ``min_score`` are dropped and a new grid is tried.
+
+    Args:
+        rng: The random source
+        min_score: Lowest accepted grader score (inclusive)
+        max_score: Highest accepted grader score (exclusive)
+        attempts: Number of grids to try before giving up
+
+    Returns:
+        The puzzle string and its score, or None if no attempt fit the band.
+    """
+
+    for _ in range(attempts):
+        solution = random_grid(rng)
+        cells, removed = dig(solution, rng)
+
+        score = grade_string(_to_string(cells)).score
+        if score >= max_score:
+            # Fewer removals make easier puzzles: keep the longest prefix
+            # of the removal order that still scores below the band top.
+            low, high = 0, len(removed)
+            best = None
+            while low < high:
+                mid = (low + high) // 2
+                cells = solution[:]
+                for idx in removed[:mid]:
+                    cells[idx] = 0
+
+                mid_score = grade_string(_to_string(cells)).score
+                if mid_score < max_score:
+                    best = (_to_string(cells), mid_score)
+                    low = mid + 1
+                else:
+                    high = mid
+
+            if best is None:
+                continue
+            puzzle_str, score = best
+        else:
+            puzzle_str = _to_string(cells)
+
+        if score >= min_score:
+            return puzzle_str, score
+
+    return None
+
+
+def _generate_chunk(args: tuple[int, str | None, int, int]) -> list[tuple[str, float]]:
+    """Worker entry point: up to ``count`` puzzles of a band from one seed,
+    trying at most ``attempts`` grids per puzzle asked for."""
+
+    count, difficulty, seed, attempts = args
+    rng = random.Random(seed)
+    low, high = BANDS[difficulty] if difficulty else (0.0, float("inf"))
+
+    puzzles: list[tuple[str, float]] = []
+    for _ in range(count * attempts):
+        if len(puzzles) == count:
+            break
+
+        result = generate(rng, low, high, attempts=1)
+        if result is not None:
+            puzzles.append(result)
+
+    return puzzles
+
+
+def generate_many(
+    count: int,
+    difficulty: str | None = None,
+    workers: int = 1,
+    seed: int | None = None,
+    chunk_size: int = 16,
+    attempts: int = 100,
+) -> Iterator[tuple[str, float]]:
+    """Generates a stream of puzzles
+
+    Every task gets a budget of ``attempts`` grids per puzzle it is asked
+    for. A band that is rarely reached can run out of it, and then the
+    stream ends short of ``count``.
+
+    Args:
+        count: Number of puzzles to generate
+        difficulty: 'easy', 'medium' or 'hard' to stay in that score band,
+                    None for any difficulty
+        workers: Number of worker processes; 1 generates in this process
+        seed: Seed for reproducible output, None for a random one
+        chunk_size: Puzzles generated per worker task
+        attempts: Grids tried per puzzle before a task gives up
+
+    Yields:
+        (puzzle string, grader score) pairs.
+
+    Raises:
+        ValueError: If the difficulty is not a known band.
+    """
+
+    if difficulty is not None and difficulty not in BANDS:
+        raise ValueError(f"Unknown difficulty: {difficulty}")
+
+    rng = random.Random(seed)
+    tasks = [
+        (min(chunk_size, count - start), difficulty, rng.getrandbits(64), attempts)
+        for start in range(0, count, chunk_size)
+    ]
+
+    if workers <= 1:
+        for task in tasks:
+            yield from _generate_chunk(task)
+        return
+
+    from concurrent.futures import (  # pylint: disable=import-outside-toplevel
+        ProcessPoolExecutor,
+    )
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in pool.map(_generate_chunk, tasks):
+            yield from chunk
+
+
+def generate_into_db(
+    db_name: str,
+    count: int,
+    difficulty: str | None = None,
+    workers: int = 1,
+    batch_size: int = 1_000,
+) -> GenerateReport:
+    """Generates puzzles straight into the puzzles table
+
+    Every puzzle is labelled with the band of its grader score.
+
+    Args:
+        db_name: The name of the database file
+        count: Number of puzzles to generate
+        difficulty: Band to generate, None for any
+        workers: Number of worker processes
+        batch_size: Puzzles written per transaction
+
+    Returns:
+        The numbers of puzzles asked for, generated and newly stored.
+        Duplicates of stored puzzles are skipped, and a band that is rarely
+        reached can leave a shortfall.
+    """
+
+    rows = (
+        (puzzle_str, rating_to_difficulty(score))
+        for puzzle_str, score in generate_many(count, difficulty, workers)
+    )
+
+    generated = inserted = 0
+    while batch := list(islice(rows, batch_size)):
+        generated += len(batch)
+        inserted += insert_puzzles(db_name, batch)
+
+    return GenerateReport(count, generated, inserted)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point: generates puzzles into a database.
+
+    Args:
+        argv: Command-line arguments, defaults to ``sys.argv[1:]``
+
+    Returns:
+        The process exit code.
+    """
+
+    argv = sys.argv[1:] if argv is None else argv
+    if not 2 <= len(argv) <= 3:
+        print("usage: generator.py DATABASE COUNT [easy|medium|hard]", file=sys.stderr)
+        return 2
+
+    db_name, count = argv[0], int(argv[1])
+    difficulty = argv[2] if len(argv) == 3 else None
+
+    setup_database(db_name)
+    report = generate_into_db(db_name, count, difficulty, os.cpu_count() or 1)
+
+    print(f"Added {report.inserted} new puzzles to {db_name}", file=sys.stderr)
+    if report.shortfall:
+        print(
+            f"Gave up on {report.shortfall} of {count} puzzles: "
+            "the band was not reached within the attempt budget",
+            file=sys.stderr,
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
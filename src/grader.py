@@ -0,0 +1,513 @@
+"""Human-style difficulty grader.
+
+Solves a puzzle the way a person would: at every step the easiest technique
+that makes progress is applied, and the hardest technique the puzzle needed
+gives its score. Ratings follow the scale of the ``puzzles.txt`` rating
+column (hidden singles at 1.2-1.5 up to chains), so the same thresholds turn
+either into a difficulty label.
+
+Techniques, from easiest to hardest:
+
+- hidden single, naked single
+- locked candidates (pointing and claiming)
+- naked and hidden pairs and triples
+- X-Wing and Swordfish
+- XY-Wing and XY-Chain
+
+A puzzle none of these can finish is completed by search and scored
+``GUESS_RATING``.
+
+Boards use the flat representation of :mod:`solver`: 81 cells and the
+candidate mask of every cell.
+
+Functions:
+    grade: Grade a 9x9 grid.
+    grade_string: Grade an 81-character puzzle string.
+    grade_many: Grade a stream of puzzle strings, optionally in parallel.
+    next_step: Find the easiest next step of a position.
+
+Classes:
+    Step: One deduction: the technique and the placements and eliminations
+    it makes.
+    Grade: The result of grading a puzzle.
+"""
+
+from collections import namedtuple
+from collections.abc import Callable, Iterable, Iterator
+from itertools import combinations
+
+from candidates import ALL_DIGITS, BIT, PEERS, SQUARE_OF, digits_of
+from solver import DIGIT_OF, POPCOUNT, UNITS, solve_cells
+from utils import is_puzzle_string
+
+GUESS_RATING: float = 10.0
+
+# Squares first: hidden singles in a square are the easiest to spot.
+_SQUARES, _LINES = UNITS[18:], UNITS[:18]
+
+_PEER_SETS: tuple[frozenset[int], ...] = tuple(frozenset(peers) for peers in PEERS)
+
+
+# collections.namedtuple rather than typing.NamedTuple: importing typing
+# alone would take half of the import-time budget of the core modules.
+class Step(
+    namedtuple(
+        "Step",
+        ("technique", "placements", "eliminations", "cells"),
+        defaults=((), (), ()),
+    )
+):
+    """One deduction
+
+    Attributes:
+        technique: Name of the technique, a key of ``RATINGS``
+
+        placements: (cell index, digit) pairs the step fills in
+
+        eliminations: (cell index, digit) candidate pairs the step removes
+
+        cells: Cell indices the deduction is based on, for explanations
+    """
+
+    __slots__ = ()
+
+
+class Grade(namedtuple("Grade", ("score", "techniques", "steps", "solution"))):
+    """The result of grading a puzzle
+
+    Attributes:
+        score: Rating of the hardest technique needed
+
+        techniques: How many times each technique was applied
+
+        steps: Every step, in solving order
+
+        solution: The solved board as an 81-character string
+    """
+
+    __slots__ = ()
+
+
+# Board state: flat cells and candidate masks (0 for filled cells).
+Cells = list[int]
+Cands = list[int]
+
+
+def _eliminations(
+    cands: Cands, targets: Iterable[int], mask: int
+) -> tuple[tuple[int, int], ...]:
+    """(cell, digit) pairs of ``mask`` still present in the target cells."""
+
+    return tuple(
+        (idx, num)
+        for idx in targets
+        if cands[idx] & mask
+        for num in digits_of(cands[idx] & mask)
+    )
+
+
+def _hidden_single(units: tuple[tuple[int, ...], ...], technique: str):
+    def find(cells: Cells, cands: Cands) -> Step | None:
+        for unit in units:
+            once = twice = 0
+            for idx in unit:
+                cand = cands[idx]
+                twice |= once & cand
+                once |= cand
+
+            once &= ~twice
+            if once:
+                bit = once & -once
+                for idx in unit:
+                    if cands[idx] & bit:
+                        return Step(technique, ((idx, DIGIT_OF[bit]),), (), unit)
+
+        return None
+
+    return find
+
+
+def _naked_single(cells: Cells, cands: Cands) -> Step | None:
+    for idx in range(81):
+        cand = cands[idx]
+        if cand and not cand & (cand - 1):
+            return Step("naked_single", ((idx, DIGIT_OF[cand]),), (), (idx,))
+
+    return None
+
+
+def _locked_candidates(
+    bases: tuple[tuple[int, ...], ...],
+    covers: Callable[[tuple[int, ...]], list[tuple[int, ...]]],
+    technique: str,
+):
+    """Digits confined to the intersection of a base unit and another unit
+    can be removed from the rest of that other unit."""
+
+    def find(cells: Cells, cands: Cands) -> Step | None:
+        for base in bases:
+            for cover in covers(base):
+                inside = set(cover) & set(base)
+                mask_in = mask_out = 0
+                for idx in base:
+                    if idx in inside:
+                        mask_in |= cands[idx]
+                    else:
+                        mask_out |= cands[idx]
+
+                locked = mask_in & ~mask_out
+                if not locked:
+                    continue
+
+                rest = [idx for idx in cover if idx not in inside]
+                removed = _eliminations(cands, rest, locked)
+                if removed:
+                    return Step(technique, (), removed, tuple(sorted(inside)))
+
+        return None
+
+    return find
+
+
+def _lines_of_square(square: tuple[int, ...]) -> list[tuple[int, ...]]:
+    rows = sorted({idx // 9 for idx in square})
+    cols = sorted({idx % 9 for idx in square})
+    return [UNITS[row] for row in rows] + [UNITS[9 + col] for col in cols]
+
+
+def _square_of_line(line: tuple[int, ...]) -> list[tuple[int, ...]]:
+    return [UNITS[18 + sqr] for sqr in sorted({SQUARE_OF[idx] for idx in line})]
+
+
+def _naked_subset(size: int, technique: str):
+    def find(cells: Cells, cands: Cands) -> Step | None:
+        for unit in UNITS:
+            empty = [idx for idx in unit if cands[idx]]
+            if len(empty) <= size:
+                continue
+
+            small = [idx for idx in empty if POPCOUNT[cands[idx]] <= size]
+            for group in combinations(small, size):
+                union = 0
+                for idx in group:
+                    union |= cands[idx]
+                if POPCOUNT[union] != size:
+                    continue
+
+                rest = [idx for idx in empty if idx not in group]
+                removed = _eliminations(cands, rest, union)
+                if removed:
+                    return Step(technique, (), removed, group)
+
+        return None
+
+    return find
+
+
+def _hidden_subset(size: int, technique: str):
+    def find(cells: Cells, cands: Cands) -> Step | None:
+        for unit in UNITS:
+            empty = [idx for idx in unit if cands[idx]]
+            if len(empty) <= size:
+                continue
+
+            where = {
+                num: [idx for idx in empty if cands[idx] & BIT[num]]
+                for num in range(1, 10)
+            }
+            digits = [num for num, spots in where.items() if 2 <= len(spots) <= size]
+
+            for group in combinations(digits, size):
+                spots = sorted({idx for num in group for idx in where[num]})
+                if len(spots) != size:
+                    continue
+
+                mask = ALL_DIGITS
+                for num in group:
+                    mask &= ~BIT[num]
+
+                removed = _eliminations(cands, spots, mask)
+                if removed:
+                    return Step(technique, (), removed, tuple(spots))
+
+        return None
+
+    return find
+
+
+def _fish(size: int, technique: str):
+    """X-Wing (size 2) and Swordfish (size 3), on rows then on columns."""
+
+    def find(cells: Cells, cands: Cands) -> Step | None:
+        for num in range(1, 10):
+            bit = BIT[num]
+
+            for base_units, cover_of in ((UNITS[:9], 9), (UNITS[9:18], 0)):
+                lines = []
+                for line in base_units:
+                    spots = [idx for idx in line if cands[idx] & bit]
+                    if 2 <= len(spots) <= size:
+                        lines.append(spots)
+
+                for group in combinations(lines, size):
+                    # Cover units: the columns (or rows) the spots lie in.
+                    covers = {
+                        (idx % 9 if cover_of == 9 else idx // 9)
+                        for spots in group
+                        for idx in spots
+                    }
+                    if len(covers) != size:
+                        continue
+
+                    base = {idx for spots in group for idx in spots}
+                    rest = [
+                        idx
+                        for cover in covers
+                        for idx in UNITS[cover_of + cover]
+                        if idx not in base
+                    ]
+                    removed = _eliminations(cands, rest, bit)
+                    if removed:
+                        return Step(technique, (), removed, tuple(sorted(base)))
+
+        return None
+
+    return find
+
+
+def _xy_wing(cells: Cells, cands: Cands) -> Step | None:
+    bivalue = [idx for idx in range(81) if POPCOUNT[cands[idx]] == 2]
+
+    for pivot in bivalue:
+        pivot_mask = cands[pivot]
+        wings = [
+            idx
+            for idx in bivalue
+            if idx in _PEER_SETS[pivot] and POPCOUNT[cands[idx] & pivot_mask] == 1
+        ]
+
+        for first, second in combinations(wings, 2):
+            shared = cands[first] & cands[second]
+            if (
+                POPCOUNT[shared] != 1
+                or shared & pivot_mask
+                or (cands[first] | cands[second]) & pivot_mask != pivot_mask
+            ):
+                continue
+
+            common = _PEER_SETS[first] & _PEER_SETS[second]
+            removed = _eliminations(cands, sorted(common - {pivot}), shared)
+            if removed:
+                return Step("xy_wing", (), removed, (pivot, first, second))
+
+    return None
+
+
+def _xy_chain(cells: Cells, cands: Cands, max_length: int = 8) -> Step | None:
+    """Chains of bivalue cells: if the first cell is not ``z`` then each cell
+    in turn is forced, until a cell that must then be ``z``. Either end is
+    ``z``, so cells seeing both ends cannot be."""
+
+    bivalue = [idx for idx in range(81) if POPCOUNT[cands[idx]] == 2]
+    links = {
+        idx: [other for other in bivalue if other in _PEER_SETS[idx]] for idx in bivalue
+    }
+
+    for start in bivalue:
+        for z_bit in (cands[start] & -cands[start], cands[start] & (cands[start] - 1)):
+            # If start is not z it is the other digit.
+            stack = [(start, cands[start] ^ z_bit, (start,))]
+
+            while stack:
+                cell, value, chain = stack.pop()
+
+                for nxt in links[cell]:
+                    if nxt in chain or not cands[nxt] & value:
+                        continue
+
+                    forced = cands[nxt] ^ value
+                    path = chain + (nxt,)
+
+                    if forced == z_bit and len(path) >= 3:
+                        common = _PEER_SETS[start] & _PEER_SETS[nxt]
+                        removed = _eliminations(
+                            cands, sorted(common - set(path)), z_bit
+                        )
+                        if removed:
+                            return Step("xy_chain", (), removed, path)
+
+                    if len(path) < max_length:
+                        stack.append((nxt, forced, path))
+
+    return None
+
+
+RATINGS: dict[str, float] = {
+    "hidden_single_square": 1.2,
+    "hidden_single_line": 1.5,
+    "naked_single": 2.3,
+    "pointing": 2.6,
+    "claiming": 2.8,
+    "naked_pair": 3.0,
+    "x_wing": 3.2,
+    "hidden_pair": 3.4,
+    "naked_triple": 3.6,
+    "swordfish": 3.8,
+    "hidden_triple": 4.0,
+    "xy_wing": 4.2,
+    "xy_chain": 4.6,
+    "guess": GUESS_RATING,
+}
+
+TECHNIQUES: tuple[tuple[str, Callable[[Cells, Cands], Step | None]], ...] = (
+    ("hidden_single_square", _hidden_single(_SQUARES, "hidden_single_square")),
+    ("hidden_single_line", _hidden_single(_LINES, "hidden_single_line")),
+    ("naked_single", _naked_single),
+    ("pointing", _locked_candidates(_SQUARES, _lines_of_square, "pointing")),
+    ("claiming", _locked_candidates(_LINES, _square_of_line, "claiming")),
+    ("naked_pair", _naked_subset(2, "naked_pair")),
+    ("x_wing", _fish(2, "x_wing")),
+    ("hidden_pair", _hidden_subset(2, "hidden_pair")),
+    ("naked_triple", _naked_subset(3, "naked_triple")),
+    ("swordfish", _fish(3, "swordfish")),
+    ("hidden_triple", _hidden_subset(3, "hidden_triple")),
+    ("xy_wing", _xy_wing),
+    ("xy_chain", _xy_chain),
+)
+
+
+def _apply(cells: Cells, cands: Cands, step: Step) -> None:
+    """Applies the placements and eliminations of a step in place."""
+
+    for idx, num in step.placements:
+        bit = BIT[num]
+        cells[idx] = num
+        cands[idx] = 0
+        for peer in PEERS[idx]:
+            cands[peer] &= ~bit
+
+    for idx, num in step.eliminations:
+        cands[idx] &= ~BIT[num]
+
+
+def next_step(cells: Cells, cands: Cands) -> Step | None:
+    """Finds the easiest step that makes progress from a position
+
+    Args:
+        cells: The 81 cells, 0 for empty
+        cands: The candidate mask of every cell, 0 for filled cells
+
+    Returns:
+        The first step found by the easiest technique that applies, or None
+        if no technique applies.
+    """
+
+    for _, technique in TECHNIQUES:
+        step = technique(cells, cands)
+        if step is not None:
+            return step
+
+    return None
+
+
+def _grade_cells(cells: Cells) -> Grade | None:
+    """Grades a flat board; None if the givens clash or it has no solution."""
+
+    solutions = solve_cells(cells)
+    if not solutions:
+        return None
+
+    cells = cells[:]
+    cands = [0] * 81
+    for idx in range(81):
+        if not cells[idx]:
+            cands[idx] = ALL_DIGITS
+            for peer in PEERS[idx]:
+                cands[idx] &= ~BIT[cells[peer]]
+
+    steps: list[Step] = []
+    techniques: dict[str, int] = {}
+
+    while 0 in cells:
+        step = next_step(cells, cands)
+
+        if step is None:
+            # Deductions hold in every solution, so any solution finishes.
+            solution = solutions[0]
+            step = Step(
+                "guess",
+                tuple((idx, solution[idx]) for idx in range(81) if not cells[idx]),
+            )
+
+        _apply(cells, cands, step)
+        steps.append(step)
+        techniques[step.technique] = techniques.get(step.technique, 0) + 1
+
+    score = max((RATINGS[name] for name in techniques), default=0.0)
+    return Grade(score, techniques, steps, "".join(map(str, cells)))
+
+
+def grade(grid: list[list[int]]) -> Grade | None:
+    """Grades a Sudoku board
+
+    Args:
+        grid: A 9x9 grid as produced by ``utils.parse_puzzle_string``
+
+    Returns:
+        The grade, or None if the grid breaks the rules or has no solution.
+    """
+
+    if len(grid) != 9 or any(len(row) != 9 for row in grid):
+        return None
+
+    return _grade_cells([num for row in grid for num in row])
+
+
+def grade_string(puzzle_str: str) -> Grade | None:
+    """Grades an 81-character puzzle string (0 or '.' for empty cells)
+
+    Returns:
+        The grade, or None if the puzzle is malformed, breaks the rules or
+        has no solution.
+    """
+
+    puzzle_str = puzzle_str.replace(".", "0")
+    if not is_puzzle_string(puzzle_str):
+        return None
+
+    return _grade_cells([int(char) for char in puzzle_str])
+
+
+def _score_string(puzzle_str: str) -> float | None:
+    """Worker entry point: only the score crosses the process boundary."""
+
+    result = grade_string(puzzle_str)
+    return result.score if result else None
+
+
+def grade_many(
+    puzzles: Iterable[str], workers: int = 1, chunk_size: int = 64
+) -> Iterator[float | None]:
+    """Scores a stream of puzzle strings
+
+    Args:
+        puzzles: 81-character puzzle strings
+        workers: Number of worker processes; 1 grades in this process
+        chunk_size: Puzzles sent to a worker at once
+
+    Yields:
+        The score of every puzzle in input order, or None for malformed,
+        clashing or unsolvable puzzles.
+    """
+
+    if workers <= 1:
+        yield from map(_score_string, puzzles)
+        return
+
+    # concurrent.futures costs more to import than the rest of the module.
+    from concurrent.futures import (  # pylint: disable=import-outside-toplevel
+        ProcessPoolExecutor,
+    )
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_score_string, puzzles, chunksize=chunk_size)
@@ -0,0 +1,194 @@
+"""Hints: the next logical step of a game in progress.
+
+A hint is the easiest deduction :func:`grader.next_step` finds from the
+current position of a :class:`~board.Board`, with the cells it is based on
+and a one-line explanation for the player.
+
+The position is read straight from the board's incrementally maintained
+state: the candidates of a cell are what its row, column and square masks
+(:attr:`Board.engine`) leave. Once every empty cell has pencil marks, as
+``auto_pencil`` leaves them, the marks narrow the candidates further, so
+eliminations the player already made (by hand or from earlier hints) are
+not suggested again.
+
+Techniques are tried from the cheapest up, so most hints cost a few dozen
+microseconds. The advanced searches can take milliseconds on positions
+where little applies; a time budget stops the search between techniques,
+so a hint asked on every tap never stalls a frame.
+
+Functions:
+    find_hint: Return the easiest next deduction of a board.
+    apply_hint: Play a hint on a board as a single move.
+
+Classes:
+    Hint: A deduction in board coordinates, with its explanation.
+
+Constants:
+    HINT_BUDGET: Default time budget of a hint search, in seconds.
+    TITLES: Display name of every grader technique.
+"""
+
+import time
+from collections import namedtuple
+
+from board import Board
+from grader import TECHNIQUES, Step
+
+# A quarter of a 60 Hz frame.
+HINT_BUDGET: float = 0.004
+
+TITLES: dict[str, str] = {
+    "hidden_single_square": "Hidden single in a box",
+    "hidden_single_line": "Hidden single in a line",
+    "naked_single": "Naked single",
+    "pointing": "Pointing pair",
+    "claiming": "Box/line reduction",
+    "naked_pair": "Naked pair",
+    "x_wing": "X-Wing",
+    "hidden_pair": "Hidden pair",
+    "naked_triple": "Naked triple",
+    "swordfish": "Swordfish",
+    "hidden_triple": "Hidden triple",
+    "xy_wing": "XY-Wing",
+    "xy_chain": "XY-Chain",
+}
+
+
+class Hint(
+    namedtuple(
+        "Hint", ("technique", "placements", "eliminations", "cells", "explanation")
+    )
+):
+    """A deduction in board coordinates
+
+    Attributes:
+        technique: Name of the grader technique, a key of ``TITLES``
+
+        placements: (row, col, digit) triples to fill in
+
+        eliminations: (row, col, digit) pencil marks to remove
+
+        cells: (row, col) cells the deduction is based on
+
+        explanation: One line describing the step for the player
+    """
+
+    __slots__ = ()
+
+
+def _position(board: Board) -> tuple[list[int], list[int]]:
+    """Flat cells and candidate masks of a board, as grader uses them."""
+
+    cells = [num for row in board.state for num in row]
+    candidates = board.engine.candidates
+    cands = [
+        0 if num else candidates(idx // 9, idx % 9) for idx, num in enumerate(cells)
+    ]
+
+    marks = board.marks
+    if all(marks[idx] for idx in range(81) if not cells[idx]):
+        for idx in range(81):
+            # Marks clashing with every candidate are ignored, not trusted.
+            if cands[idx] & marks[idx]:
+                cands[idx] &= marks[idx]
+
+    return cells, cands
+
+
+def _name(idx: int) -> str:
+    return f"r{idx // 9 + 1}c{idx % 9 + 1}"
+
+
+def _explain(step: Step) -> str:
+    """Describes a step in one line, e.g. 'Naked single: r3c5 is 7.'"""
+
+    title = TITLES.get(step.technique, step.technique)
+
+    if step.placements:
+        moves = ", ".join(f"{_name(idx)} is {num}" for idx, num in step.placements)
+        return f"{title}: {moves}."
+
+    by_digit: dict[int, list[str]] = {}
+    for idx, num in step.eliminations:
+        by_digit.setdefault(num, []).append(_name(idx))
+
+    removals = "; ".join(
+        f"{num} can be removed from {', '.join(names)}"
+        for num, names in by_digit.items()
+    )
+    return f"{title}: {removals}."
+
+
+def find_hint(board: Board, budget: float | None = HINT_BUDGET) -> Hint | None:
+    """Returns the easiest next deduction of a board
+
+    Like :func:`grader.next_step`, but the techniques stop being tried once
+    the budget is spent. The check runs between techniques, so a search can
+    overrun by the cost of one technique.
+
+    Args:
+        board: The game in progress
+        budget: Time limit in seconds, None for no limit
+
+    Returns:
+        The hint, or None if the board is solved, invalid, beyond the
+        grader's techniques or the budget ran out first.
+    """
+
+    if not board.is_valid() or not board.zeroes:
+        return None
+
+    start = time.perf_counter()
+    cells, cands = _position(board)
+
+    for _, technique in TECHNIQUES:
+        step = technique(cells, cands)
+        if step is not None:
+            break
+        if budget is not None and time.perf_counter() - start > budget:
+            return None
+    else:
+        return None
+
+    return Hint(
+        step.technique,
+        tuple((idx // 9, idx % 9, num) for idx, num in step.placements),
+        tuple((idx // 9, idx % 9, num) for idx, num in step.eliminations),
+        tuple(divmod(idx, 9) for idx in step.cells),
+        _explain(step),
+    )
+
+
+def apply_hint(board: Board, hint: Hint) -> bool:
+    """Plays a hint on a board, journaled as a single move
+
+    Placements are filled in. For eliminations, empty cells without marks
+    are pencilled with all their candidates first, then the eliminated
+    marks are removed.
+
+    Args:
+        board: The game the hint was found for
+        hint: The hint to play
+
+    Returns:
+        True if the board changed, False otherwise
+    """
+
+    cursor = board.cursor
+
+    with board.grouped():
+        for row, col, num in hint.placements:
+            board.set_cell(row, col, num)
+
+        if hint.eliminations:
+            # Eliminations only show in a fully pencilled grid, and only
+            # then are they remembered by the next hint.
+            for row in range(9):
+                for col in range(9):
+                    if not board.state[row][col] and not board.marks[row * 9 + col]:
+                        board.set_marks(row, col, board.engine.candidates(row, col))
+
+        for row, col, num in hint.eliminations:
+            board.pencil_marks[row][col].discard(num)
+
+    return board.cursor != cursor
@@ -2,11 +2,27 @@
 
 Small collection of helpers used to validate rows, columns and 3x3 squares of a
 Sudoku board. The primary entry point is :func:`check_board`.
+
+The checks delegate to the bitmask helpers in :mod:`candidates`, so each one
+is a single pass over the unit instead of list building plus ``count`` calls.
+Numbers outside 1-9 and cells above 9 have no bit; for those the checks fall
+back to the list-based version, which ignores such cells and counts such
+numbers, as the checks always did.
 """
 
+import candidates
 import utils
 
 
+def _check_vector(vector: list[int], num: int) -> bool:
+    """List-based check of a unit, for values the bitmasks cannot hold."""
+
+    if num == 0:
+        return not utils.has_nonzero_duplicate(vector)
+
+    return vector.count(num) == 0
+
+
 def check_row(state: list[list[int]], row: int, num: int = 0) -> bool:
     """Checks if a given row configuration is valid
 
@@ -21,10 +37,15 @@ def check_row(state: list[list[int]], row: int, num: int = 0) -> bool:
     Returns:
         True if the configuration is valid, False otherwise.
     """
-    if num == 0:
-        return not utils.has_nonzero_duplicate(state[row])
+    try:
+        if num == 0:
+            return not candidates.has_duplicate(state[row])
+        if 0 < num < 10:
+            return not candidates.row_mask(state, row) & candidates.BIT[num]
+    except IndexError:
+        pass  # A cell above 9
 
-    return state[row].count(num) == 0
+    return _check_vector(state[row], num)
 
 
 def check_col(state: list[list[int]], col: int, num: int = 0) -> bool:
@@ -44,12 +65,15 @@ def check_col(state: list[list[int]], col: int, num: int = 0) -> bool:
     Raises:
         ValueError: If the value for column is not valid
     """
-    vector: list[int] = [state[i][col] for i in range(9)]
+    try:
+        if num == 0:
+            return not candidates.has_duplicate(state[i][col] for i in range(9))
+        if 0 < num < 10:
+            return not candidates.col_mask(state, col) & candidates.BIT[num]
+    except IndexError:
+        pass  # A cell above 9
 
-    if num == 0:
-        return not utils.has_nonzero_duplicate(vector)
-
-    return vector.count(num) == 0
+    return _check_vector([state[i][col] for i in range(9)], num)
 
 
 def check_sqr(state: list[list[int]], sqr: int, num: int = 0) -> bool:
@@ -69,14 +93,19 @@ def check_sqr(state: list[list[int]], sqr: int, num: int = 0) -> bool:
     row: int = (sqr // 3) * 3
     col: int = (sqr % 3) * 3
 
-    vector: list[int] = [
-        state[i][j] for i in range(row, row + 3) for j in range(col, col + 3)
-    ]
+    try:
+        if num == 0:
+            return not candidates.has_duplicate(
+                state[i][j] for i in range(row, row + 3) for j in range(col, col + 3)
+            )
+        if 0 < num < 10:
+            return not candidates.sqr_mask(state, sqr) & candidates.BIT[num]
+    except IndexError:
+        pass  # A cell above 9
 
-    if num == 0:
-        return not utils.has_nonzero_duplicate(vector)
-
-    return vector.count(num) == 0
+    return _check_vector(
+        [state[i][j] for i in range(row, row + 3) for j in range(col, col + 3)], num
+    )
 
 
 def check_move(state: list[list[int]], row: int, col: int, num: int) -> bool:
@@ -94,11 +123,22 @@ def check_move(state: list[list[int]], row: int, col: int, num: int) -> bool:
     """
     sqr: int = (row // 3) * 3 + (col // 3)
 
-    row: bool = check_row(state, row, num)
-    col: bool = check_col(state, col, num)
-    square: bool = check_sqr(state, sqr, num)
-
-    return row and col and square
+    if 0 < num < 10:
+        try:
+            used: int = (
+                candidates.row_mask(state, row)
+                | candidates.col_mask(state, col)
+                | candidates.sqr_mask(state, sqr)
+            )
+            return not used & candidates.BIT[num]
+        except IndexError:
+            pass  # A cell above 9
+
+    return (
+        check_row(state, row, num)
+        and check_col(state, col, num)
+        and check_sqr(state, sqr, num)
+    )
 
 
 def check_board(state: list[list[int]]) -> bool:
@@ -9,32 +9,47 @@ The application is responsible for loading puzzles from the database,
 instantiating the :class:`Board`, wiring UI callbacks and showing the win
 popup when the puzzle is solved.
 
+Functions:
+    get_db_path: Return the path of the puzzle database.
+    get_txt_path: Return the path of the bundled puzzles.txt file.
+    make_mark_texture: Rasterize a block of pencil marks.
+
 Classes:
     SudokuApp: Kivy :class:`~kivy.app.App` subclass that manages the game UI.
     GameScreen: Screen used for the game view.
     MenuScreen: Screen used for the main menu.
+    CellButton: Grid cell that draws its pencil marks from a cached texture.
     SudokuGrid: GridLayout used to display the 9x9 board.
     WinPopup: Popup shown when the player solves the puzzle.
 """
 
 import os
 import sys
-from copy import deepcopy as copy
 
 from kivy.app import App
+from kivy.clock import Clock
+from kivy.logger import Logger
 from kivy.uix.button import Button
 from kivy.uix.popup import Popup
 from kivy.uix.screenmanager import ScreenManager, Screen
 from kivy.core.window import Window
 from kivy.lang import Builder
+from kivy.core.text import Label as CoreLabel
 from kivy.graphics import Color, Rectangle, RoundedRectangle
-from kivy.resources import resource_add_path
+from kivy.graphics.texture import Texture
+from kivy.properties import ObjectProperty
+from kivy.resources import resource_add_path, resource_find
 
 from board import Board
 import logic
 import constants as c
 import settings as s
+import analysis
 import db_utils
+import hints
+import solver
+from prefetch import PuzzlePrefetcher
+from render import GridRenderer
 
 # Path handling for Windows & PyInstaller
 
@@ -72,6 +87,50 @@ Builder.load_file(kv_file_path)
 Window.clearcolor = c.DEFAULT
 
 
+def get_db_path() -> str:
+    """Returns the absolute path to the database file.
+
+    Returns:
+        The database path as a string.
+    """
+
+    # Try on Android
+    res = resource_find("sudoku_puzzles.db")
+    if res:
+        return res
+
+    # Fallback for PC
+    app_dir = App.get_running_app().user_data_dir
+    return os.path.join(app_dir, "sudoku_puzzles.db")
+
+
+def get_txt_path():
+    """Returns the absolute path to the puzzles.txt file."""
+
+    # Try on Android
+    res = resource_find("puzzles.txt")
+    if res:
+        return res
+
+    # Fallback for PC
+    return os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), "..", "data", "puzzles.txt"
+    )
+
+
+def make_mark_texture(
+    text: str, font_size: float, color: tuple[float, float, float, float]
+) -> Texture:
+    """Rasterizes a block of pencil marks, once per layout and font size.
+
+    Used by :class:`~render.MarkTextures` through the grid renderer.
+    """
+
+    label = CoreLabel(text=text, font_size=font_size, color=color, halign="center")
+    label.refresh()
+    return label.texture
+
+
 class GameScreen(Screen):
     """The main game screen."""
 
@@ -88,6 +147,37 @@ class NumberButton(Button):
     """Button used for numbers in the palette."""
 
 
+class CellButton(NumberButton):
+    """Grid cell that draws its pencil marks from a cached texture.
+
+    The :class:`~render.GridRenderer` sets ``mark_texture``; the texture is
+    drawn centered over the button, and None hides it.
+    """
+
+    mark_texture = ObjectProperty(None, allownone=True)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        with self.canvas.after:
+            Color(1, 1, 1, 1)
+            self._marks = Rectangle(size=(0, 0))
+        self.bind(pos=self._place_marks, size=self._place_marks)
+        self.bind(mark_texture=self._place_marks)
+
+    def _place_marks(self, *_args):
+        texture = self.mark_texture
+        self._marks.texture = texture
+        if texture is None:
+            self._marks.size = (0, 0)
+            return
+
+        self._marks.size = texture.size
+        self._marks.pos = (
+            self.center_x - texture.width / 2,
+            self.center_y - texture.height / 2,
+        )
+
+
 class WinPopup(Popup):
     """Popup displayed when the player wins."""
 
@@ -112,8 +202,20 @@ class SudokuApp(App):
         selected_button (Button | None):
             Reference to the currently selected button in the grid.
 
-        cells (list[list[Button]]):
+        cells (list[list[CellButton]]):
             2D list of buttons representing the Sudoku grid.
+
+        renderer (GridRenderer):
+            Redraws the cells the board reports as changed.
+
+        prefetcher (PuzzlePrefetcher):
+            Keeps puzzles of every difficulty loaded in the background.
+
+        hint_cells (list[tuple[int, int]]):
+            Cells highlighted by the last hint.
+
+        analysis (AnalysisExecutor):
+            Runs board analysis off the UI thread.
     """
 
     def build(self):
@@ -125,8 +227,8 @@ class SudokuApp(App):
             ScreenManager: The root widget of the application.
         """
 
-        self.db_path = db_utils.get_db_path()
-        self.txt_path = db_utils.get_txt_path()
+        self.db_path = get_db_path()
+        self.txt_path = get_txt_path()
 
         # if not os.path.exists(self.db_path):
         #     db_utils.setup_database(db_name=self.db_path)
@@ -137,73 +239,106 @@ class SudokuApp(App):
         self.sm.add_widget(GameScreen(name="game"))
         self.pencil_mode = False
         self.difficulty = "Not selected"
+        self.cells: list[list[CellButton]] = []
+        self.renderer: GridRenderer | None = None
+        self.pencil_color: Color | None = None
+
+        self.prefetcher = PuzzlePrefetcher(self.db_path)
+        self.prefetcher.start()
+
+        self.analysis = analysis.AnalysisExecutor(
+            post=lambda callback: Clock.schedule_once(lambda _dt: callback())
+        )
+        self.analysis.start()
 
         return self.sm
 
     def game_start(self, difficulty: str):
         """Loads a new puzzle.
 
-        The grid is populated with buttons corresponding to
-        the puzzle state, marks initial cells as uneditable, and sets up the
-        number palette.
+        The grid widgets are created by the first game and reused by the
+        next ones: only their text, colors and highlights are updated to
+        show the new puzzle. The prefetcher hands out the solution with the
+        puzzle, so every move is checked against it as it is made.
         """
 
         # Database setup
 
         print(f"Loading a {difficulty} puzzle...")
         self.difficulty = difficulty
-        puzzle_grid = db_utils.load_puzzle_from_db(
-            self.difficulty, db_name=self.db_path
-        )
-        # puzzle_grid = copy(c.EXAMPLE_BOARD)  # Debugging
+        puzzle_grid, solution = self.prefetcher.get_game(self.difficulty)
+        # puzzle_grid = [row[:] for row in c.EXAMPLE_BOARD]  # Debugging
         self.sm.get_screen("game").ids.difficulty_label.text = (
             self.difficulty.capitalize()
         )
 
         if not puzzle_grid or puzzle_grid == [[]] or puzzle_grid == [[0] * 9] * 9:
             print("could not find a puzzle to load.")
-            puzzle_grid = copy(c.EXAMPLE_BOARD)
+            puzzle_grid = [row[:] for row in c.EXAMPLE_BOARD]
+            # Two empty cells: solving it here costs nothing.
+            solution = solver.solve(puzzle_grid)
 
         # Board setup
 
-        self.board = Board(puzzle_grid)
+        self.analysis.cancel()
+        self.board = Board(puzzle_grid, solution)
         self.selected_grid: tuple[int, int] = (-1, -1)
         self.selected_button: NumberButton | None = None
-        self.cells: list[list[NumberButton]] = [
-            [NumberButton() for _ in range(9)] for _ in range(9)
-        ]
         self.pencil_mode = False
         self.update_pencil_button_visual()
+        self.hint_cells: list[tuple[int, int]] = []
+        self.sm.get_screen("game").ids.hint_label.text = ""
 
-        # Board UI setup
+        # Board UI setup: the widgets of the last game are reused, only
+        # their content and highlight change.
 
-        sudoku_grid = self.sm.get_screen("game").ids.sudoku_grid
+        if self.renderer is None:
+            self.build_grid()
+
+        for row in self.cells:
+            for button in row:
+                button.background_color = c.DEFAULT
+
+        self.renderer.set_board(self.board)
+        self.renderer.resize(s.NUMBER_SIZE)
+
+    def refresh(self):
+        """Redraws the cells the board reports as changed.
+
+        The render and the frame that shows it are timed and logged at
+        debug level, see :meth:`GridRenderer.timed_render`.
+        """
+
+        self.renderer.timed_render(Clock, Logger.debug)
+
+    def build_grid(self):
+        """Creates the grid and number palette widgets.
+
+        Called by the first :meth:`game_start` only; later games reuse the
+        widgets and their bindings.
+        """
+
+        game_ids = self.sm.get_screen("game").ids
+
+        self.cells = [[CellButton() for _ in range(9)] for _ in range(9)]
+
+        sudoku_grid = game_ids.sudoku_grid
         sudoku_grid.clear_widgets()
         for i in range(9):
             for j in range(9):
-                number = self.board.state[i][j]
                 button = self.cells[i][j]
-
-                if number != 0:
-                    self.board.initial_cells.add((i, j))
-                    num_text = str(number)
-                else:
-                    num_text = ""
-
                 button.pos_hint = {"row": i, "col": j}
                 button.bind(on_press=self.on_cell_press)
-
-                button.text = num_text
-                button.font_size = s.NUMBER_SIZE
                 button.background_normal = ""
-                button.background_color = c.DEFAULT
-                button.color = c.BLACK
-
                 sudoku_grid.add_widget(button)
 
+        self.renderer = GridRenderer(
+            self.board, self.cells, s.NUMBER_SIZE, make_mark_texture
+        )
+
         # Number palette UI setup
 
-        number_palette = self.sm.get_screen("game").ids.number_palette
+        number_palette = game_ids.number_palette
         number_palette.clear_widgets()
         for i in range(1, 10):
             number_button = NumberButton(text=str(i), font_size=s.NUMBER_SIZE)
@@ -227,6 +362,7 @@ class SudokuApp(App):
         row = int(button.pos_hint["row"])
         col = int(button.pos_hint["col"])
 
+        self.clear_hint()
         if self.selected_button:
             self.selected_button.background_color = c.DEFAULT
 
@@ -248,6 +384,7 @@ class SudokuApp(App):
         if self.selected_grid == (-1, -1) or not self.selected_button:
             return
 
+        self.clear_hint()
         row, col = self.selected_grid
         number_to_set = int(button.text) if button.text != "C" else 0
 
@@ -264,23 +401,18 @@ class SudokuApp(App):
             else:
                 pencil_set.add(number_to_set)
 
-            self.update_pencil_marks()
+            self.refresh()
             return
 
         if number_to_set == 0:
-            self.board.clear_cell(row, col)
-            self.selected_button.text = ""
-            self.selected_button.background_color = c.DEFAULT
-            self.board.pencil_marks[row][col].clear()
+            with self.board.grouped():
+                self.board.clear_cell(row, col)
+                self.board.pencil_marks[row][col].clear()
+            self.refresh()
 
         elif self.board.set_cell(row, col, number_to_set):
-            self.selected_button.background_color = c.DEFAULT
-            self.selected_button.color = c.BLACK
-            self.selected_button.font_size = s.NUMBER_SIZE
-            self.selected_button.text = str(number_to_set)
-
-            self.board.pencil_marks[row][col].clear()
-            self.update_all_marks()
+            # Placing the digit also took it out of its peers' marks.
+            self.refresh()
 
             if self.board.is_solved():
                 self.show_win_popup()
@@ -297,100 +429,133 @@ class SudokuApp(App):
         self.pencil_mode = not self.pencil_mode
         self.update_pencil_button_visual()
 
-    def update_pencil_marks(self):
-        """Updates the display of pencil marks on the selected grid.
+    def update_pencil_button_visual(self):
+        """Updates the pencil button's appearance based on the mode.
 
-        The text is rendered as a 3x3 grid, with each number having
-        its reserved spot.
+        The background is drawn and bound to the button once; later calls
+        only change its color.
         """
 
-        row, col = self.selected_grid
-        pencil_set = self.board.pencil_marks[row][col]
-
-        text_lines = ["", "", ""]
-        for num in range(1, 10):
-            line_idx = (num - 1) // 3
-            pos_in_line = (num - 1) % 3
-            if num in pencil_set:
-                text_lines[line_idx] += str(num)
-            else:
-                text_lines[line_idx] += "   "
-            if pos_in_line < 2:
-                text_lines[line_idx] += "   "
+        if self.pencil_color is None:
+            pencil_button = self.sm.get_screen("game").ids.pencil_button
+
+            pencil_button.canvas.before.clear()
+            with pencil_button.canvas.before:
+                self.pencil_color = Color(0, 0, 0, 0)
+                bg = RoundedRectangle(
+                    pos=pencil_button.pos,
+                    size=pencil_button.size,
+                    radius=[(12, 12)] * 4,
+                )
 
-        self.cells[row][col].font_size = s.NUMBER_SIZE // 3
-        self.cells[row][col].color = c.DGRAY
-        self.cells[row][col].text = "\n".join(text_lines)
+            def _update_bg(instance, _):
+                bg.pos = instance.pos
+                bg.size = instance.size
 
-    def update_all_marks(self):
-        """Updates pencil marks for all cells on the board."""
+            pencil_button.bind(pos=_update_bg, size=_update_bg)
 
-        for i in range(9):
-            for j in range(9):
-                if (i, j) in self.board.initial_cells:
-                    continue
-                if self.board.state[i][j] != 0:
-                    continue
+            pencil_button.background_color = (0, 0, 0, 0)
+
+        self.pencil_color.rgba = c.SELECTED if self.pencil_mode else (0, 0, 0, 0)
 
-                self.selected_grid = (i, j)
-                self.selected_button = self.cells[i][j]
+    def auto_pencil(self):
+        """Automatically fills in all possible pencil marks.
 
-                self.update_pencil_marks()
+        The candidates are computed in the background and filled in by
+        :meth:`apply_candidates`, unless the board changed meanwhile.
+        """
 
         self.deselect_button()
+        self.analysis.submit(self.board, analysis.candidates_job, self.apply_candidates)
 
-    def update_pencil_button_visual(self):
-        """Updates the pencil button's appearance based on the mode."""
+    def apply_candidates(self, cands: list[int]):
+        """Pencils in the candidates of every empty cell.
 
-        pencil_button = self.sm.get_screen("game").ids.pencil_button
+        All the marks are journaled as one move, so a single undo removes
+        them.
 
-        pencil_button.canvas.before.clear()
-        if self.pencil_mode:
-            with pencil_button.canvas.before:
-                Color(*c.SELECTED)
-                bg = RoundedRectangle(
-                    pos=pencil_button.pos,
-                    size=pencil_button.size,
-                    radius=[(12, 12)] * 4,
-                )
-        else:
-            with pencil_button.canvas.before:
-                Color(0, 0, 0, 0)
-                bg = RoundedRectangle(
-                    pos=pencil_button.pos,
-                    size=pencil_button.size,
-                    radius=[(12, 12)] * 4,
-                )
+        Args:
+            cands: The candidate mask of every cell, 0 for filled cells
+        """
 
-        def _update_bg(instance, _):
-            bg.pos = instance.pos
-            bg.size = instance.size
+        with self.board.grouped():
+            for idx, mask in enumerate(cands):
+                if mask:
+                    self.board.set_marks(idx // 9, idx % 9, mask)
 
-        pencil_button.bind(pos=_update_bg, size=_update_bg)
+        self.refresh()
 
-        pencil_button.background_color = (0, 0, 0, 0)
+    def hint(self):
+        """Shows the easiest next deduction.
 
-    def auto_pencil(self):
-        """Automatically fills in all possible pencil marks."""
+        Cheap techniques are tried right away, within the hint time budget.
+        When they run out of time, the search goes on in the background and
+        the hint shows up once found.
+        """
 
-        for i in range(9):
-            for j in range(9):
-                if (i, j) in self.board.initial_cells:
-                    continue
-                if self.board.state[i][j] != 0:
-                    continue
+        self.clear_hint()
+        self.deselect_button()
+
+        hint = hints.find_hint(self.board)
+        if hint is None and self.board.zeroes and self.board.is_valid():
+            self.sm.get_screen("game").ids.hint_label.text = "Looking for a hint..."
+            self.analysis.submit(self.board, analysis.hint_job, self.show_hint)
+            return
+
+        self.show_hint(hint)
+
+    def show_hint(self, hint: hints.Hint | None):
+        """Shows a hint on the grid.
 
-                self.selected_grid = (i, j)
-                self.selected_button = self.cells[i][j]
+        The cells it is based on are highlighted, the cell to fill in (or
+        the first one to remove a mark from) is selected and the
+        explanation is shown under the grid.
 
-                pencil_set = set()
-                for num in range(1, 10):
-                    if logic.check_move(self.board.state, i, j, num):
-                        pencil_set.add(num)
+        Args:
+            hint: The hint to show, None if there is none
+        """
+
+        self.clear_hint()
+        self.deselect_button()
+        label = self.sm.get_screen("game").ids.hint_label
+        if hint is None:
+            label.text = "No hint available"
+            return
+
+        label.text = hint.explanation
+        self.hint_cells = list(hint.cells)
+        for row, col in self.hint_cells:
+            self.cells[row][col].background_color = c.LBLUE
+
+        row, col, _ = (hint.placements or hint.eliminations)[0]
+        self.selected_grid = (row, col)
+        self.selected_button = self.cells[row][col]
+        self.selected_button.background_color = c.SELECTED
+
+    def reveal(self):
+        """Fills the selected cell with its digit from the solution."""
+
+        if self.selected_grid == (-1, -1):
+            return
+
+        self.clear_hint()
+        if self.board.reveal_cell(*self.selected_grid):
+            self.refresh()
+
+            if self.board.is_solved():
+                self.show_win_popup()
+
+        self.deselect_button()
+
+    def clear_hint(self):
+        """Removes the highlight and explanation of the last hint."""
 
-                self.board.pencil_marks[i][j] = pencil_set
-                self.update_pencil_marks()
-                self.deselect_button()
+        for row, col in self.hint_cells:
+            button = self.cells[row][col]
+            if button is not self.selected_button:
+                button.background_color = c.DEFAULT
+        self.hint_cells = []
+        self.sm.get_screen("game").ids.hint_label.text = ""
 
     def deselect_button(self):
         """Deselects the currently selected button, if any."""
@@ -401,18 +566,29 @@ class SudokuApp(App):
             self.selected_grid = (-1, -1)
 
     def reset(self):
-        """Resets the current puzzle to its initial state."""
+        """Resets the current puzzle to its initial state.
 
-        for i in range(9):
-            for j in range(9):
-                if (i, j) in self.board.initial_cells:
-                    continue
+        The reset is a single journaled move, so it can be undone.
+        """
+
+        if self.board.reset():
+            self.refresh()
+
+        self.deselect_button()
+
+    def undo(self):
+        """Takes back the last move."""
+
+        if self.board.undo():
+            self.refresh()
+
+        self.deselect_button()
+
+    def redo(self):
+        """Replays the last move taken back."""
 
-                self.board.clear_cell(i, j)
-                self.cells[i][j].text = ""
-                self.cells[i][j].color = c.BLACK
-                self.cells[i][j].font_size = s.NUMBER_SIZE
-                self.board.pencil_marks[i][j].clear()
+        if self.board.redo():
+            self.refresh()
 
         self.deselect_button()
 
@@ -427,6 +603,14 @@ class SudokuApp(App):
 
         self.sm.current = "menu"
 
+    def on_stop(self):
+        """Stops the background workers and closes the database connections
+        on exit."""
+
+        self.prefetcher.stop()
+        self.analysis.stop()
+        db_utils.close_connections()
+
 
 if __name__ == "__main__":
     SudokuApp().run()
@@ -0,0 +1,331 @@
+"""Compact packed binary puzzle format.
+
+A packed file is a fixed-size header followed by fixed-size records, so
+record ``i`` always starts at ``HEADER.size + i * RECORD_SIZE`` and random
+access is O(1) with no index.
+
+Header (16 bytes, little-endian):
+    magic ``b"SDKP"``, format version (uint16), record size (uint16) and
+    record count (uint64).
+
+Record (42 bytes):
+    81 cells packed two per byte, high nibble first (41 bytes, the last low
+    nibble is 0), then one difficulty byte, an index into ``DIFFICULTIES``.
+
+Nibbles are exactly the hex digits of the puzzle string, so packing and
+unpacking run in C through ``bytes.fromhex`` and ``bytes.hex``. A record takes
+42 bytes against roughly 100 for a ``puzzles.txt`` line and 81 for the bare
+string.
+
+Usage:
+
+    python src/packed.py data/puzzles.txt data/puzzles.sdkp
+    python src/packed.py data/sudoku_puzzles.db data/puzzles.sdkp
+
+Functions:
+    pack_puzzle: Pack an 81-character puzzle string into 41 bytes.
+    unpack_puzzle: Turn packed cells back into an 81-character string.
+    write_packed: Write (puzzle string, difficulty) rows to a packed file.
+    convert_text: Convert a ``puzzles.txt`` style dump to a packed file.
+    convert_db: Convert the puzzles table of a database to a packed file.
+    main: Command-line entry point.
+
+Classes:
+    PackedPuzzles: Memory-mapped reader with random access by index.
+"""
+
+import mmap
+import sqlite3
+import struct
+import sys
+from collections.abc import Iterable, Iterator
+
+from utils import is_puzzle_string, parse_puzzle_line, parse_puzzle_string
+
+MAGIC: bytes = b"SDKP"
+VERSION: int = 1
+
+HEADER = struct.Struct("<4sHHQ")
+
+CELL_BYTES: int = 41
+RECORD_SIZE: int = CELL_BYTES + 1
+
+# Difficulty byte -> label; 0 is an unrated puzzle.
+DIFFICULTIES: tuple[str | None, ...] = (None, "easy", "medium", "hard")
+DIFFICULTY_CODES: dict[str | None, int] = {
+    label: code for code, label in enumerate(DIFFICULTIES)
+}
+
+
+def pack_puzzle(puzzle_str: str) -> bytes:
+    """Packs a puzzle string into 4 bits per cell
+
+    Args:
+        puzzle_str: The 81-character puzzle (0-9, where 0 is an empty cell)
+
+    Returns:
+        The 41 packed bytes.
+
+    Raises:
+        ValueError: If the string is not 81 digits long.
+    """
+
+    if not is_puzzle_string(puzzle_str):
+        raise ValueError(f"Not an 81-digit puzzle string: {puzzle_str!r}")
+
+    return bytes.fromhex(puzzle_str + "0")
+
+
+def unpack_puzzle(cells: bytes | memoryview) -> str:
+    """Unpacks 41 packed bytes into a puzzle string
+
+    Args:
+        cells: The packed cells, for instance the first 41 bytes of a record
+
+    Returns:
+        The 81-character puzzle string.
+    """
+
+    return cells[:CELL_BYTES].hex()[:81]
+
+
+def write_packed(path: str, rows: Iterable[tuple[str, str | None]]) -> int:
+    """Writes puzzles to a packed file
+
+    Rows are streamed, so any iterable works regardless of its size; the
+    record count in the header is filled in once every row is written.
+
+    Args:
+        path: The output file, overwritten if it exists
+        rows: (puzzle string, difficulty) pairs. Unknown difficulties are
+              stored as unrated
+
+    Returns:
+        The number of records written.
+
+    Raises:
+        ValueError: If a puzzle string is not 81 digits long.
+        OSError: If the file cannot be written.
+    """
+
+    count = 0
+
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE, 0))
+
+        for puzzle_str, difficulty in rows:
+            file.write(pack_puzzle(puzzle_str))
+            file.write(bytes((DIFFICULTY_CODES.get(difficulty, 0),)))
+            count += 1
+
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE, count))
+
+    return count
+
+
+def convert_text(txt_path: str, out_path: str) -> int:
+    """Converts a puzzle dump in the ``puzzles.txt`` format
+
+    Lines are read with ``utils.parse_puzzle_line``; lines without a puzzle
+    are skipped and ratings map to difficulties as in the database import.
+
+    Args:
+        txt_path: The path to the puzzle dump
+        out_path: The packed file to write
+
+    Returns:
+        The number of records written.
+    """
+
+    # Imported here: db_utils loads the grader, which readers never need.
+    from db_utils import rating_to_difficulty  # pylint: disable=C0415
+
+    def rows() -> Iterator[tuple[str, str | None]]:
+        with open(txt_path, "r", encoding="utf-8") as file:
+            for line in file:
+                parsed = parse_puzzle_line(line)
+                if parsed is not None:
+                    _, puzzle_str, rating = parsed
+                    yield puzzle_str, rating_to_difficulty(rating)
+
+    return write_packed(out_path, rows())
+
+
+def convert_db(db_name: str, out_path: str) -> int:
+    """Converts the puzzles table of a database, in id order
+
+    Args:
+        db_name: The name of the database file
+        out_path: The packed file to write
+
+    Returns:
+        The number of records written.
+
+    Raises:
+        sqlite3.Error: If the database cannot be read.
+    """
+
+    conn = sqlite3.connect(f"file:{db_name}?mode=ro", uri=True)
+
+    try:
+        cursor = conn.execute(
+            "SELECT puzzle_string, difficulty FROM puzzles ORDER BY id;"
+        )
+        return write_packed(out_path, cursor)
+
+    finally:
+        conn.close()
+
+
+class PackedPuzzles:
+    """Memory-mapped reader for packed puzzle files
+
+    The file is mapped read-only, so opening it costs nothing up front and
+    the OS pages records in as they are touched. Records are exposed as
+    memoryviews into the mapping; those views must be released (or dropped)
+    before :meth:`close`.
+
+    Attributes:
+        path: The packed file being read
+    """
+
+    def __init__(self, path: str):
+        """Maps a packed file and checks its header
+
+        Args:
+            path: The packed file to read
+
+        Raises:
+            ValueError: If the file is not a packed puzzle file of this
+                        version, or is truncated.
+            OSError: If the file cannot be opened.
+        """
+
+        self.path: str = path
+
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, record_size, count = HEADER.unpack_from(self._mmap)
+        except struct.error as e:
+            self._mmap.close()
+            raise ValueError(f"{path} is too short for a packed header") from e
+
+        size = HEADER.size + count * record_size
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a version {VERSION} packed file")
+        if len(self._mmap) < size:
+            self._mmap.close()
+            raise ValueError(f"{path} is truncated")
+
+        self._count: int = count
+        self._view = memoryview(self._mmap)[HEADER.size : size]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> tuple[str, str | None]:
+        """Returns the (puzzle string, difficulty) of a record."""
+
+        record = self.record(index)
+        return unpack_puzzle(record), DIFFICULTIES[record[CELL_BYTES]]
+
+    def __iter__(self) -> Iterator[tuple[str, str | None]]:
+        for record in self.records():
+            yield unpack_puzzle(record), DIFFICULTIES[record[CELL_BYTES]]
+
+    def __enter__(self) -> "PackedPuzzles":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def buffer(self) -> memoryview:
+        """All records as one read-only buffer of ``len(self) * RECORD_SIZE``
+        bytes, e.g. for ``numpy.frombuffer``."""
+
+        return self._view
+
+    def record(self, index: int) -> memoryview:
+        """Returns a zero-copy view of one record
+
+        Args:
+            index: The record index, negative values count from the end
+
+        Returns:
+            The 42-byte record: packed cells, then the difficulty byte.
+
+        Raises:
+            IndexError: If the index is out of range.
+        """
+
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("packed puzzle index out of range")
+
+        start = index * RECORD_SIZE
+        return self._view[start : start + RECORD_SIZE]
+
+    def records(self) -> Iterator[memoryview]:
+        """Yields a zero-copy view of every record, in file order."""
+
+        view = self._view
+        for start in range(0, self._count * RECORD_SIZE, RECORD_SIZE):
+            yield view[start : start + RECORD_SIZE]
+
+    def puzzle(self, index: int) -> str:
+        """Returns the puzzle string of a record."""
+
+        return unpack_puzzle(self.record(index))
+
+    def difficulty(self, index: int) -> str | None:
+        """Returns the difficulty of a record, None when unrated."""
+
+        return DIFFICULTIES[self.record(index)[CELL_BYTES]]
+
+    def grid(self, index: int) -> list[list[int]]:
+        """Returns the puzzle of a record as a 9x9 grid."""
+
+        return parse_puzzle_string(self.puzzle(index))
+
+    def close(self) -> None:
+        """Unmaps the file.
+
+        Raises:
+            BufferError: If record views handed out are still alive.
+        """
+
+        self._view.release()
+        self._mmap.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Command-line entry point: converts a ``.txt`` dump or a ``.db`` file.
+
+    Args:
+        argv: Command-line arguments, defaults to ``sys.argv[1:]``
+
+    Returns:
+        The process exit code.
+    """
+
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 2:
+        print("usage: packed.py SOURCE(.txt|.db) OUTPUT", file=sys.stderr)
+        return 2
+
+    source, out_path = argv
+    convert = convert_db if source.endswith(".db") else convert_text
+    count = convert(source, out_path)
+
+    print(f"Packed {count} puzzles into {out_path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+"""Background puzzle prefetching.
+
+Loading a puzzle means a database round trip and a parse, which is work the
+UI thread should not wait for when the player taps "New game". The
+:class:`PuzzlePrefetcher` keeps a short queue of parsed grids per difficulty
+and tops it up from a daemon worker thread, so starting a game usually just
+pops a grid from memory.
+
+The solution of every grid is fetched by the worker too, so the game can
+check moves against it from the first tap without touching the database.
+
+Functions:
+    load_solution: The stored solution of a grid, or a fresh one.
+
+Classes:
+    PuzzlePrefetcher: Per-difficulty queues of ready grids filled in the
+    background.
+"""
+
+import sqlite3
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+
+import db_utils
+import solver
+
+# Loads one puzzle grid: (difficulty, db_name) -> 9x9 grid, or [[]] if none.
+Loader = Callable[[str, str], list[list[int]]]
+
+# Finds the solution of a loaded grid: (grid, db_name) -> 9x9 grid, or None.
+SolutionLoader = Callable[[list[list[int]], str], list[list[int]] | None]
+
+# A queued puzzle: its grid and its solution, if known.
+Game = tuple[list[list[int]], list[list[int]] | None]
+
+
+def load_solution(grid: list[list[int]], db_name: str) -> list[list[int]] | None:
+    """Loads the stored solution of a grid, solving it if none is stored
+
+    Databases from before the solution column, or not backfilled yet, still
+    give every game a solution this way.
+
+    Args:
+        grid: The puzzle
+        db_name: The database file it was loaded from
+
+    Returns:
+        The 9x9 solved grid, or None if the puzzle has no solution.
+    """
+
+    puzzle_str = "".join(str(num) for row in grid for num in row)
+    solution = db_utils.load_solution(puzzle_str, db_name)
+    return solution if solution is not None else solver.solve(grid)
+
+
+class PuzzlePrefetcher:
+    """Keeps a few parsed puzzles of every difficulty ready in memory
+
+    A worker thread fills each queue up to ``depth`` grids, each with its
+    solution, and refills it after every :meth:`get_game`. When a load
+    fails (database error or no puzzle of that difficulty) the worker
+    leaves that difficulty alone for ``retry_delay`` seconds instead of
+    spinning on it.
+
+    Attributes:
+        db_name: The database file puzzles are loaded from
+
+        depth: Number of grids kept ready per difficulty
+
+        retry_delay: Seconds to wait before retrying a failed difficulty
+
+        hits: Number of :meth:`get_game` calls answered from a queue
+
+        misses: Number of :meth:`get_game` calls that had to load
+                synchronously
+
+        errors: Number of failed background loads
+    """
+
+    def __init__(
+        self,
+        db_name: str,
+        difficulties: Iterable[str] = ("easy", "medium", "hard"),
+        depth: int = 2,
+        retry_delay: float = 5.0,
+        loader: Loader | None = None,
+        solution_loader: SolutionLoader | None = None,
+    ):
+        """Initializes the queues; call :meth:`start` to begin filling them
+
+        Args:
+            db_name: The database file puzzles are loaded from
+            difficulties: Difficulties to keep queues for. Others get a queue
+                          the first time they are requested
+            depth: Number of grids kept ready per difficulty
+            retry_delay: Seconds to wait before retrying a failed difficulty
+            loader: Function loading one grid, defaults to
+                    ``db_utils.load_puzzle_from_db``
+            solution_loader: Function finding the solution of a loaded grid,
+                             defaults to :func:`load_solution`
+        """
+
+        self.db_name: str = db_name
+        self.depth: int = depth
+        self.retry_delay: float = retry_delay
+        self.hits: int = 0
+        self.misses: int = 0
+        self.errors: int = 0
+
+        self._loader: Loader = loader or db_utils.load_puzzle_from_db
+        self._solution_loader: SolutionLoader = solution_loader or load_solution
+        self._queues: dict[str, deque[Game]] = {
+            difficulty: deque() for difficulty in difficulties
+        }
+        self._retry_at: dict[str, float] = {}
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Starts the worker thread, if it is not already running."""
+
+        with self._cond:
+            if self._thread is not None:
+                return
+
+            self._stopped = False
+            self._thread = threading.Thread(
+                target=self._run, name="puzzle-prefetch", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float | None = 1.0) -> None:
+        """Stops the worker thread and waits for it to finish.
+
+        Args:
+            timeout: Seconds to wait for a load in progress to finish
+        """
+
+        with self._cond:
+            self._stopped = True
+            thread, self._thread = self._thread, None
+            self._cond.notify_all()
+
+        if thread is not None:
+            thread.join(timeout)
+
+    def get(self, difficulty: str) -> list[list[int]]:
+        """Returns a puzzle of the given difficulty, without its solution
+
+        See :meth:`get_game`.
+
+        Args:
+            difficulty: The difficulty level (e.g., 'easy', 'medium')
+
+        Returns:
+            A 9x9 grid, or [[]] if no puzzle could be loaded.
+        """
+
+        return self.get_game(difficulty)[0]
+
+    def get_game(self, difficulty: str) -> Game:
+        """Returns a puzzle of the given difficulty and its solution
+
+        Pops a ready puzzle when one is queued. Otherwise it is loaded
+        synchronously, as the caller would have done without a prefetcher.
+        Either way the worker is woken up to refill the queue.
+
+        Args:
+            difficulty: The difficulty level (e.g., 'easy', 'medium')
+
+        Returns:
+            The 9x9 grid, or [[]] if no puzzle could be loaded, and its
+            solution, or None if it has none or could not be found.
+        """
+
+        with self._cond:
+            queue = self._queues.setdefault(difficulty, deque())
+            game = queue.popleft() if queue else None
+
+            if game is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._retry_at.pop(difficulty, None)
+
+            self._cond.notify_all()
+
+        if game is None:
+            game = self._load(difficulty)
+
+        return game
+
+    def ready(self, difficulty: str) -> int:
+        """Returns the number of grids queued for a difficulty."""
+
+        with self._cond:
+            return len(self._queues.get(difficulty, ()))
+
+    def _load(self, difficulty: str) -> Game:
+        """Loads one grid and its solution, turning database and file
+        errors into ([[]], None)."""
+
+        try:
+            grid = self._loader(difficulty, self.db_name)
+            if not grid or grid == [[]]:
+                return [[]], None
+            return grid, self._solution_loader(grid, self.db_name)
+        except (sqlite3.Error, OSError) as e:
+            print(f"Prefetch error loading a {difficulty} puzzle: {e}")
+            return [[]], None
+
+    def _next_to_fill(self) -> str | None:
+        """Returns a difficulty whose queue needs a grid, if any."""
+
+        now = time.monotonic()
+
+        for difficulty, queue in self._queues.items():
+            if len(queue) < self.depth and self._retry_at.get(difficulty, 0) <= now:
+                return difficulty
+
+        return None
+
+    def _run(self) -> None:
+        """Worker loop: fills the queues until stopped."""
+
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    difficulty = self._next_to_fill()
+                    if difficulty is not None:
+                        break
+                    self._cond.wait(self.retry_delay)
+
+                if self._stopped:
+                    return
+
+            # The lock is released while loading so get() never waits on it.
+            game = self._load(difficulty)
+
+            with self._cond:
+                if game[0] == [[]]:
+                    self.errors += 1
+                    self._retry_at[difficulty] = time.monotonic() + self.retry_delay
+                else:
+                    self._queues[difficulty].append(game)
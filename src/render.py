@@ -0,0 +1,290 @@
+"""Diff-based drawing of the Sudoku grid.
+
+The :class:`GridRenderer` keeps the 81 cell widgets of the game screen in
+sync with a :class:`~board.Board`. It only looks at the cells the board
+reports as changed (:meth:`Board.take_changes`), and of those only writes to
+widgets whose text, font size or color actually differ from what they show,
+so an accepted number costs a handful of widget updates instead of a sweep
+over the whole grid.
+
+Digits the board knows to be wrong (:meth:`Board.is_mistake`) are drawn in
+red.
+
+Pencil marks have only 512 possible layouts per font size, so what a
+pencilled cell shows is built once per (mask, font size) and then looked
+up; see :func:`mark_content`. Given a texture factory, the renderer also
+rasterizes each layout once (:class:`MarkTextures`) and hands widgets the
+cached texture through a ``mark_texture`` property, so redrawing marks
+uploads no new texture.
+
+Widgets are only used through their ``text``, ``font_size`` and ``color``
+properties, so the module imports no Kivy and works with any object that
+has them. :meth:`GridRenderer.timed_render` likewise takes the clock and the
+logger it reports through.
+
+Functions:
+    mark_text: Lay out pencil marks as a 3x3 block of text.
+    mark_content: Cached widget content of a pencilled cell.
+
+Classes:
+    MarkTextures: Cached pencil-mark textures per (mask, font size).
+    GridRenderer: Redraws the cells of a board that changed.
+
+Constants:
+    MARK_CACHE_SIZE: Entries kept by the :func:`mark_content` cache and by
+    every :class:`MarkTextures`.
+"""
+
+import time
+from collections.abc import Callable, Sequence
+from functools import lru_cache
+
+import constants as c
+from board import Board
+from candidates import BIT
+
+# What a cell widget shows: (text, font size, color, mark texture). The
+# texture is None unless marks are drawn from :class:`MarkTextures`.
+Content = tuple[str, float, tuple[float, float, float, float], object]
+
+# Builds the texture of a text: (text, font size, color) -> texture.
+TextureFactory = Callable[[str, float, tuple[float, float, float, float]], object]
+
+# One entry per mask at the current font size.
+MARK_CACHE_SIZE: int = 512
+
+
+def mark_text(mask: int) -> str:
+    """Lays out pencil marks as a 3x3 block of text
+
+    Every digit has a fixed spot, so marks do not move around as others are
+    added or removed.
+
+    Args:
+        mask: The marks as a digit mask
+
+    Returns:
+        Three lines of three spots each.
+    """
+
+    text_lines = ["", "", ""]
+    for num in range(1, 10):
+        line_idx = (num - 1) // 3
+        pos_in_line = (num - 1) % 3
+        if mask & BIT[num]:
+            text_lines[line_idx] += str(num)
+        else:
+            text_lines[line_idx] += "   "
+        if pos_in_line < 2:
+            text_lines[line_idx] += "   "
+
+    return "\n".join(text_lines)
+
+
+@lru_cache(maxsize=MARK_CACHE_SIZE)
+def mark_content(mask: int, number_size: float) -> Content:
+    """Returns what a cell with pencil marks shows, built once per key
+
+    Equal marks also get the identical content tuple, so comparing it with
+    what a widget shows is mostly an identity check.
+
+    Args:
+        mask: The marks as a digit mask
+        number_size: Font size of digits; marks use a third of it
+
+    Returns:
+        The text, font size and color of the cell, and no texture.
+    """
+
+    return mark_text(mask), number_size // 3, c.DGRAY, None
+
+
+class MarkTextures:
+    """Cached pencil-mark textures per (mask, font size)
+
+    Every layout is rasterized once by the factory; later lookups return
+    the same texture object. The cache is bounded like :func:`mark_content`
+    and is cleared when the font size changes.
+
+    Attributes:
+        make_texture: Builds the texture of a text, e.g. with Kivy's
+        ``CoreLabel``
+    """
+
+    def __init__(self, make_texture: TextureFactory, maxsize: int = MARK_CACHE_SIZE):
+        """Initializes an empty cache
+
+        Args:
+            make_texture: Builds the texture of a (text, font size, color)
+            maxsize: Number of textures kept
+        """
+
+        self.make_texture = make_texture
+        self.content = lru_cache(maxsize=maxsize)(self._build)
+
+    def _build(self, mask: int, number_size: float) -> Content:
+        text, font_size, color, _ = mark_content(mask, number_size)
+        return "", font_size, color, self.make_texture(text, font_size, color)
+
+    def cache_clear(self) -> None:
+        """Drops every cached texture."""
+
+        self.content.cache_clear()
+
+
+class GridRenderer:
+    """Redraws the cells of a board that changed
+
+    Attributes:
+        board: The board being shown
+
+        cells: The 9x9 cell widgets
+
+        number_size: Font size of digits; marks use a third of it
+
+        textures: Cached mark textures, None to draw marks as text
+
+        shown: What every widget currently shows, by cell index, None
+        until first drawn
+    """
+
+    def __init__(
+        self,
+        board: Board,
+        cells: Sequence[Sequence],
+        number_size: float,
+        make_texture: TextureFactory | None = None,
+    ):
+        """Initializes a renderer; nothing is drawn until :meth:`render`
+
+        Args:
+            board: The board to show
+            cells: The 9x9 cell widgets
+            number_size: Font size of digits
+            make_texture: Builds mark textures. When given, marks are drawn
+                          through the widgets' ``mark_texture`` property
+                          instead of their text
+        """
+
+        self.board = board
+        self.cells = cells
+        self.number_size = number_size
+        self.textures = MarkTextures(make_texture) if make_texture else None
+        self.shown: list[Content | None] = [None] * 81
+
+    def set_board(self, board: Board) -> None:
+        """Shows another board on the same widgets
+
+        The widgets keep what they show, so the next full render only
+        writes the cells that differ between the two boards.
+
+        Args:
+            board: The new board
+        """
+
+        self.board = board
+        board.take_changes()
+
+    def resize(self, number_size: float) -> int:
+        """Switches to another digit font size and redraws every cell
+
+        Cached mark contents and textures of the old size are dropped.
+
+        Args:
+            number_size: The new font size of digits
+
+        Returns:
+            The number of widgets that were written to.
+        """
+
+        if number_size != self.number_size:
+            self.number_size = number_size
+            mark_content.cache_clear()
+            if self.textures is not None:
+                self.textures.cache_clear()
+
+        return self.render(full=True)
+
+    def content(self, idx: int) -> Content:
+        """Returns what the widget of a cell should show."""
+
+        number = self.board.state[idx // 9][idx % 9]
+        if number:
+            color = c.RED if self.board.wrong >> idx & 1 else c.BLACK
+            return str(number), self.number_size, color, None
+
+        mask = self.board.marks[idx]
+        if mask:
+            if self.textures is not None:
+                return self.textures.content(mask, self.number_size)
+            return mark_content(mask, self.number_size)
+
+        return "", self.number_size, c.BLACK, None
+
+    def render(self, full: bool = False) -> int:
+        """Brings the widgets of changed cells up to date
+
+        Args:
+            full: Check every cell rather than the changed ones, e.g. after
+                  the board state was assigned directly
+
+        Returns:
+            The number of widgets that were written to.
+        """
+
+        changes = self.board.take_changes()
+        indices = range(81) if full else changes
+
+        updated = 0
+        for idx in indices:
+            content = self.content(idx)
+            shown = self.shown[idx]
+            if content == shown:
+                continue
+
+            widget = self.cells[idx // 9][idx % 9]
+            text, font_size, color, texture = content
+            if shown is None or shown[0] != text:
+                widget.text = text
+            if shown is None or shown[1] != font_size:
+                widget.font_size = font_size
+            if shown is None or shown[2] != color:
+                widget.color = color
+            if self.textures is not None and (shown is None or shown[3] is not texture):
+                widget.mark_texture = texture
+
+            self.shown[idx] = content
+            updated += 1
+
+        return updated
+
+    def timed_render(self, clock, log: Callable[..., object]) -> int:
+        """Renders the changed cells and logs how long they took to show
+
+        The render and the frame that shows it are timed: the callback
+        scheduled with a zero timeout runs once the next frame has been
+        drawn. The message is formatted by ``log`` only if it is emitted.
+
+        Args:
+            clock: Schedules the frame callback, e.g. ``kivy.clock.Clock``
+            log: Takes a %-style format and its arguments, e.g.
+                 ``Logger.debug``
+
+        Returns:
+            The number of widgets that were written to.
+        """
+
+        start = time.perf_counter()
+        updated = self.render()
+        render_ms = (time.perf_counter() - start) * 1000
+
+        def log_frame(_dt):
+            log(
+                "Render: %d cells in %.2f ms, on screen after %.1f ms",
+                updated,
+                render_ms,
+                (time.perf_counter() - start) * 1000,
+            )
+
+        clock.schedule_once(log_frame, 0)
+        return updated
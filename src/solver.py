@@ -0,0 +1,360 @@
+"""Sudoku solver.
+
+Solves boards with constraint propagation (naked and hidden singles) and, when
+propagation stalls, backtracking on the empty cell with the fewest candidates
+(minimum remaining values). Candidates are 9-bit masks, see :mod:`candidates`.
+
+Internally a board is a flat list of 81 ints (row-major, 0 for empty) plus the
+candidate mask of every cell. Placing a digit only touches the cell's 20
+peers, and copying a search node is two flat list copies.
+
+:func:`solve_many` can spread a stream over worker processes; one process
+solves a few thousand puzzles per second, so reaching tens of thousands
+takes several cores.
+
+Functions:
+    solve: Solve a 9x9 grid and return the first solution found.
+    count_solutions: Count solutions of a 9x9 grid, stopping at a limit.
+    solve_cells: Find solutions of a flat 81-cell board, optionally with
+    digits kept out of some cells.
+    solve_many: Solve a stream of 81-character puzzle strings, optionally in
+    parallel.
+"""
+
+from collections.abc import Iterable, Iterator
+from operator import itemgetter
+
+from candidates import ALL_DIGITS, BIT, PEERS, SQUARE_OF
+from utils import flatten, is_puzzle_string
+
+UNITS: tuple[tuple[int, ...], ...] = (
+    tuple(tuple(row * 9 + col for col in range(9)) for row in range(9))
+    + tuple(tuple(row * 9 + col for row in range(9)) for col in range(9))
+    + tuple(
+        tuple(idx for idx in range(81) if SQUARE_OF[idx] == sqr) for sqr in range(9)
+    )
+)
+
+UNIT_GETTERS: tuple[tuple[tuple[int, ...], itemgetter], ...] = tuple(
+    (unit, itemgetter(*unit)) for unit in UNITS
+)
+
+POPCOUNT: tuple[int, ...] = tuple(mask.bit_count() for mask in range(ALL_DIGITS + 1))
+DIGIT_OF: dict[int, int] = {BIT[num]: num for num in range(1, 10)}
+
+# Translation tables between digit characters and cell values, so strings
+# convert to and from flat boards in C instead of one int() per cell.
+_TO_CELLS: bytes = bytes.maketrans(b"0123456789", bytes(range(10)))
+_TO_CHARS: bytes = bytes.maketrans(bytes(range(10)), b"0123456789")
+
+# A node is (cells, cands): the flat board and the candidate mask of every
+# cell, 0 for filled cells.
+Node = tuple[list[int], list[int]]
+
+
+def _assign(node: Node, idx: int, num: int) -> bool:
+    """Places a digit and eliminates it from the peers, chasing naked singles.
+
+    Args:
+        node: The search node, modified in place
+        idx: Cell index (0-80)
+        num: Digit to place (1-9)
+
+    Returns:
+        False if the placement leads to a contradiction, True otherwise.
+    """
+
+    cells, cands = node
+    pending = [(idx, num)]
+
+    while pending:
+        idx, num = pending.pop()
+
+        if cells[idx]:
+            if cells[idx] != num:
+                return False
+            continue
+
+        bit = BIT[num]
+        if not cands[idx] & bit:
+            return False
+
+        cells[idx] = num
+        cands[idx] = 0
+
+        for peer in PEERS[idx]:
+            cand = cands[peer]
+            if not cand & bit:
+                continue
+
+            cand ^= bit
+            if not cand:
+                return False
+
+            cands[peer] = cand
+            if not cand & (cand - 1):
+                pending.append((peer, DIGIT_OF[cand]))
+
+    return True
+
+
+def _node_from_cells(cells: list[int]) -> Node | None:
+    """Builds a search node, or returns None if the givens already clash."""
+
+    rows, cols, sqrs = [0] * 9, [0] * 9, [0] * 9
+
+    for idx, num in enumerate(cells):
+        if not num:
+            continue
+
+        bit = BIT[num]
+        row, col, sqr = idx // 9, idx % 9, SQUARE_OF[idx]
+
+        if (rows[row] | cols[col] | sqrs[sqr]) & bit:
+            return None
+
+        rows[row] |= bit
+        cols[col] |= bit
+        sqrs[sqr] |= bit
+
+    node = (cells[:], [0] * 81)
+    cands = node[1]
+    singles = []
+
+    for idx, num in enumerate(cells):
+        if num:
+            continue
+
+        cand = ALL_DIGITS & ~(rows[idx // 9] | cols[idx % 9] | sqrs[SQUARE_OF[idx]])
+        if not cand:
+            return None
+
+        cands[idx] = cand
+        if not cand & (cand - 1):
+            singles.append(idx)
+
+    for idx in singles:
+        if not node[0][idx] and not _assign(node, idx, DIGIT_OF[cands[idx]]):
+            return None
+
+    return node
+
+
+def _propagate(node: Node) -> int:
+    """Fills hidden singles until nothing changes.
+
+    Naked singles are already chased by :func:`_assign`, so this only has to
+    look for digits with a single possible cell in a unit. Candidate masks
+    are always exact, so a digit seen in exactly one cell of a unit must go
+    there.
+
+    Args:
+        node: The search node, modified in place
+
+    Returns:
+        -1 on a contradiction, 81 if the board is full, otherwise the index
+        of the empty cell with the fewest candidates.
+    """
+
+    cands = node[1]
+
+    while True:
+        changed = False
+
+        for unit, values_of in UNIT_GETTERS:
+            once = twice = 0
+
+            for cand in values_of(cands):
+                twice |= once & cand
+                once |= cand
+
+            once &= ~twice
+            if not once:
+                continue
+
+            for idx in unit:
+                bit = cands[idx] & once
+                if not bit:
+                    continue
+
+                if bit & (bit - 1) or not _assign(node, idx, DIGIT_OF[bit]):
+                    return -1
+
+                changed = True
+
+        if not changed:
+            break
+
+    best, best_count = 81, 10
+    for idx in range(81):
+        cand = cands[idx]
+        if cand:
+            count = POPCOUNT[cand]
+            if count < best_count:
+                best, best_count = idx, count
+                if count == 2:
+                    break
+
+    return best
+
+
+def _search(node: Node, limit: int, solutions: list[list[int]]) -> None:
+    """Depth-first search collecting up to ``limit`` solutions."""
+
+    best = _propagate(node)
+
+    if best < 0:
+        return
+
+    cells, cands = node
+
+    if best == 81:
+        solutions.append(cells)
+        return
+
+    cand = cands[best]
+
+    while cand:
+        bit = cand & -cand
+        cand ^= bit
+
+        child = (cells[:], cands[:])
+        if _assign(child, best, DIGIT_OF[bit]):
+            _search(child, limit, solutions)
+
+        if len(solutions) >= limit:
+            return
+
+
+def solve_cells(
+    cells: list[int], limit: int = 1, exclude: Iterable[tuple[int, int]] = ()
+) -> list[list[int]]:
+    """Finds up to ``limit`` solutions of a flat board
+
+    For callers that already hold flat boards, such as the generator and
+    the grader: the board is not copied into a grid or checked for shape.
+
+    Args:
+        cells: The 81 cells of a board, row-major (0 for empty cells)
+        limit: The number of solutions after which the search stops
+        exclude: (cell index, digit) pairs that no solution may contain
+
+    Returns:
+        The solutions found, as flat lists of 81 cells. Empty if the board
+        breaks the rules or has no solution.
+    """
+
+    node = _node_from_cells(cells)
+    if node is None:
+        return []
+
+    board, cands = node
+    for idx, num in exclude:
+        if board[idx]:
+            if board[idx] == num:
+                return []
+            continue
+
+        cand = cands[idx] & ~BIT[num]
+        if not cand:
+            return []
+
+        cands[idx] = cand
+        if not cand & (cand - 1) and not _assign(node, idx, DIGIT_OF[cand]):
+            return []
+
+    solutions: list[list[int]] = []
+    _search(node, limit, solutions)
+    return solutions
+
+
+def solve(grid: list[list[int]]) -> list[list[int]] | None:
+    """Solves a Sudoku board
+
+    The input grid is left untouched.
+
+    Args:
+        grid: A 9x9 grid as produced by ``utils.parse_puzzle_string``
+              (0 for empty cells)
+
+    Returns:
+        The solved 9x9 grid, or None if the grid is malformed, breaks the
+        rules or has no solution.
+    """
+
+    cells = flatten(grid)
+    if cells is None:
+        return None
+
+    solutions = solve_cells(cells)
+    if not solutions:
+        return None
+
+    solution = solutions[0]
+    return [solution[row * 9 : row * 9 + 9] for row in range(9)]
+
+
+def count_solutions(grid: list[list[int]], limit: int = 2) -> int:
+    """Counts the solutions of a Sudoku board, stopping early at ``limit``
+
+    With the default limit of 2 this answers "is the solution unique?":
+    0 means unsolvable, 1 unique and 2 multiple.
+
+    Args:
+        grid: A 9x9 grid as produced by ``utils.parse_puzzle_string``
+        limit: The number of solutions after which the search stops
+
+    Returns:
+        The number of solutions found, at most ``limit``. Malformed grids
+        count as having no solution.
+    """
+
+    cells = flatten(grid)
+    if cells is None:
+        return 0
+
+    return len(solve_cells(cells, limit))
+
+
+def _solve_string(puzzle_str: str) -> str | None:
+    """Solves one puzzle string, None if it is malformed or unsolvable."""
+
+    if not is_puzzle_string(puzzle_str):
+        return None
+
+    solutions = solve_cells(list(puzzle_str.encode().translate(_TO_CELLS)))
+    if not solutions:
+        return None
+
+    return bytes(solutions[0]).translate(_TO_CHARS).decode()
+
+
+def solve_many(
+    puzzles: Iterable[str], workers: int = 1, chunk_size: int = 256
+) -> Iterator[str | None]:
+    """Solves a stream of puzzle strings
+
+    Strings go straight to the flat representation, skipping the nested
+    lists of ``parse_puzzle_string``.
+
+    Args:
+        puzzles: 81-character puzzle strings (0-9, where 0 is an empty cell)
+        workers: Number of worker processes; 1 solves in this process
+        chunk_size: Puzzles sent to a worker at once
+
+    Yields:
+        The 81-character solution for each puzzle, in input order, or None
+        if the puzzle is malformed or has no solution.
+    """
+
+    if workers <= 1:
+        yield from map(_solve_string, puzzles)
+        return
+
+    # concurrent.futures costs more to import than the rest of the module.
+    from concurrent.futures import (  # pylint: disable=import-outside-toplevel
+        ProcessPoolExecutor,
+    )
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_solve_string, puzzles, chunksize=chunk_size)
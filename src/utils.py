@@ -10,9 +10,20 @@ Functions:
     count_zeroes: Count the empty cells on a board.
     get_initial_cells: Return coordinates for initially filled cells.
     is_valid_input: Validate terminal input for moves.
+    is_puzzle_string: Check that a string is 81 ASCII digits (or dots).
     parse_puzzle_string: Convert an 81-char puzzle string to a 9x9 grid.
+    flatten: Flatten a 9x9 grid of digits into its 81 cells.
+    parse_puzzle_line: Split a line of a puzzle dump into id, puzzle and rating.
+
+Constants:
+    DIGITS: The characters of a puzzle string.
+    DIGITS_OR_DOTS: The characters of a puzzle string that writes empty cells
+    as dots.
 """
 
+DIGITS: frozenset[str] = frozenset("0123456789")
+DIGITS_OR_DOTS: frozenset[str] = frozenset("0123456789.")
+
 
 def has_nonzero_duplicate(vector: list[int]) -> bool:
     """Checks if a list contains duplicates of non zero values
@@ -96,6 +107,24 @@ def is_valid_input(entry: list[str]) -> bool:
     return True
 
 
+def is_puzzle_string(puzzle_str: str, dots: bool = False) -> bool:
+    """Checks that a string holds the 81 cells of a puzzle.
+
+    ``str.isdigit`` is not enough: it also accepts non-ASCII digits such as
+    '٣', which byte-level decoding later fails on.
+
+    Args:
+        puzzle_str: The string to check
+        dots: Also accept '.' for empty cells
+
+    Returns:
+        True if the string is 81 ASCII digits (or dots), False otherwise.
+    """
+
+    allowed = DIGITS_OR_DOTS if dots else DIGITS
+    return len(puzzle_str) == 81 and allowed.issuperset(puzzle_str)
+
+
 def parse_puzzle_string(puzzle_str: str) -> list[list[int]]:
     """Converts an 81-character string into a 9x9 matrix of integers.
 
@@ -108,7 +137,7 @@ def parse_puzzle_string(puzzle_str: str) -> list[list[int]]:
         string is invalid (wrong length or contains non-digits).
     """
 
-    if len(puzzle_str) != 81 or not puzzle_str.isdigit():
+    if not is_puzzle_string(puzzle_str):
         return [[]]
 
     grid: list[list[int]] = []
@@ -125,6 +154,67 @@ def parse_puzzle_string(puzzle_str: str) -> list[list[int]]:
         return [[]]
 
 
+def flatten(grid: list[list[int]]) -> list[int] | None:
+    """Flattens a 9x9 grid into its 81 cells, row by row.
+
+    Args:
+        grid: A 9x9 grid as produced by :func:`parse_puzzle_string`
+
+    Returns:
+        The 81 cells, or None if the grid is not 9x9 or holds anything but
+        ints from 0 to 9.
+    """
+
+    if len(grid) != 9 or any(len(row) != 9 for row in grid):
+        return None
+
+    cells = [num for row in grid for num in row]
+
+    if any(not isinstance(num, int) or not 0 <= num <= 9 for num in cells):
+        return None
+
+    return cells
+
+
+def parse_puzzle_line(line: str) -> tuple[str, str, float | None] | None:
+    """Splits a line of a puzzle dump into its id, puzzle string and rating.
+
+    Dumps follow the ``puzzles.txt`` layout (``id puzzle  rating``), but the
+    fields may be separated by any amount of whitespace, the id and rating
+    may be missing and empty cells may be written as ``.`` instead of ``0``.
+
+    Args:
+        line: A single line of the dump
+
+    Returns:
+        A tuple (id, puzzle_str, rating), with an empty id and a None rating
+        when they are absent, or None if the line holds no 81-cell puzzle.
+    """
+
+    tokens = line.split()
+
+    # Fast path for the canonical layout, then a scan for anything else.
+    if len(tokens) > 1 and is_puzzle_string(tokens[1]):
+        position, token = 1, tokens[1]
+    else:
+        for position, token in enumerate(tokens):
+            if is_puzzle_string(token, dots=True):
+                break
+        else:
+            return None
+
+    puzzle_id = tokens[0] if position > 0 else ""
+    rating: float | None = None
+
+    if position + 1 < len(tokens):
+        try:
+            rating = float(tokens[position + 1])
+        except ValueError:
+            rating = None
+
+    return puzzle_id, token.replace(".", "0"), rating
+
+
 def rgb_to_kivy(color: tuple[int, int, int]) -> tuple[float, float, float, float]:
     """Converts an RGB color tuple to the Kivy RGBA format up to two decimal places.
 
@@ -0,0 +1,182 @@
+# pylint: disable=C0115
+# pylint: disable=C0111
+"""Tested functions
+
+- snapshot
+- candidates_job
+- solve_job
+- hint_job
+- AnalysisExecutor
+"""
+
+import threading
+import time
+import unittest
+from copy import deepcopy as copy
+
+from analysis import (
+    AnalysisExecutor,
+    candidates_job,
+    hint_job,
+    snapshot,
+    solve_job,
+)
+from board import Board
+from constants import EXAMPLE_BOARD
+from hints import find_hint
+from logic import check_board
+
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestJobs(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.board = Board(copy(EXAMPLE_BOARD))
+
+    def test_snapshot(self) -> None:
+        snap = snapshot(self.board)
+        i, j = next(
+            (i, j) for i in range(9) for j in range(9) if not self.board.state[i][j]
+        )
+        num = next(num for num in range(1, 10) if self.board.engine.allows(i, j, num))
+        self.board.set_cell(i, j, num)
+
+        with self.subTest(msg="Should not follow later moves"):
+            self.assertEqual(snap.state[i][j], 0)
+            self.assertEqual(snap.grid(), EXAMPLE_BOARD)
+
+        with self.subTest(msg="Should carry the version it was taken at"):
+            self.assertLess(snap.version, self.board.version)
+
+    def test_jobs(self) -> None:
+        snap = snapshot(self.board)
+
+        with self.subTest(msg="Should compute the candidates of empty cells"):
+            cands = candidates_job(snap)
+            for idx in range(81):
+                i, j = divmod(idx, 9)
+                expected = (
+                    0 if EXAMPLE_BOARD[i][j] else self.board.engine.candidates(i, j)
+                )
+                self.assertEqual(cands[idx], expected)
+
+        with self.subTest(msg="Should solve the position"):
+            self.assertTrue(check_board(solve_job(snap)))
+
+        with self.subTest(msg="Should find the same hint as the board"):
+            self.assertEqual(hint_job(snap), find_hint(self.board, budget=None))
+
+
+class TestAnalysisExecutor(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.board = Board(copy(EXAMPLE_BOARD))
+        self.results: list[object] = []
+        self.executor = AnalysisExecutor()
+        self.addCleanup(self.executor.stop)
+
+    def blocking_job(self, gate: threading.Event, started: threading.Event):
+        def job(snap):
+            started.set()
+            gate.wait(2.0)
+            return snap.version
+
+        return job
+
+    def play(self) -> None:
+        i, j = next(
+            (i, j) for i in range(9) for j in range(9) if not self.board.state[i][j]
+        )
+        self.board.set_marks(i, j, 0b1 if self.board.marks[i * 9 + j] != 1 else 0b10)
+
+    def test_delivers_results(self) -> None:
+        self.executor.start()
+        self.executor.submit(self.board, candidates_job, self.results.append)
+
+        with self.subTest(msg="Should post the result of a fresh job"):
+            self.assertTrue(wait_for(lambda: self.results))
+            self.assertEqual(self.results[0], candidates_job(snapshot(self.board)))
+            self.assertEqual(self.executor.completed, 1)
+
+    def test_drops_stale_results(self) -> None:
+        gate, started = threading.Event(), threading.Event()
+        self.executor.start()
+        self.executor.submit(
+            self.board, self.blocking_job(gate, started), self.results.append
+        )
+
+        with self.subTest(msg="Should drop a result once the board changed"):
+            self.assertTrue(started.wait(2.0))
+            self.play()
+            gate.set()
+            self.assertTrue(wait_for(lambda: self.executor.dropped == 1))
+            self.assertEqual(self.results, [])
+
+    def test_skips_and_replaces_queued_jobs(self) -> None:
+        with self.subTest(msg="Should skip a queued job of an older version"):
+            self.executor.submit(self.board, candidates_job, self.results.append)
+            self.play()
+            self.executor.start()
+            self.assertTrue(wait_for(lambda: self.executor.dropped == 1))
+            self.assertEqual(self.results, [])
+
+        with self.subTest(msg="Should replace a queued job of the same key"):
+            self.executor.stop()
+            self.executor.submit(self.board, solve_job, self.results.append, "a")
+            self.executor.submit(self.board, candidates_job, self.results.append, "a")
+            self.assertEqual(self.executor.pending(), 1)
+            self.executor.start()
+            self.assertTrue(wait_for(lambda: self.results))
+            self.assertEqual(self.results, [candidates_job(snapshot(self.board))])
+
+    def test_cancel(self) -> None:
+        gate, started = threading.Event(), threading.Event()
+        self.executor.start()
+        self.executor.submit(
+            self.board, self.blocking_job(gate, started), self.results.append
+        )
+        self.assertTrue(started.wait(2.0))
+        self.executor.submit(self.board, candidates_job, self.results.append)
+
+        with self.subTest(msg="Should drop queued and running jobs"):
+            self.executor.cancel()
+            self.assertEqual(self.executor.pending(), 0)
+            gate.set()
+            self.assertTrue(wait_for(lambda: self.executor.dropped == 2))
+            self.assertEqual(self.results, [])
+
+        with self.subTest(msg="Should run jobs submitted afterwards"):
+            self.executor.submit(self.board, candidates_job, self.results.append)
+            self.assertTrue(wait_for(lambda: self.results))
+
+    def test_posts_through_callback(self) -> None:
+        posted = []
+        executor = AnalysisExecutor(post=posted.append)
+        self.addCleanup(executor.stop)
+        executor.start()
+        executor.submit(self.board, candidates_job, self.results.append)
+
+        with self.subTest(msg="Should leave the callback to the post function"):
+            self.assertTrue(wait_for(lambda: posted))
+            self.assertEqual(self.results, [])
+            posted[0]()
+            self.assertEqual(len(self.results), 1)
+
+        with self.subTest(msg="Should check freshness again when posted late"):
+            executor.submit(self.board, candidates_job, self.results.append)
+            self.assertTrue(wait_for(lambda: len(posted) == 2))
+            self.play()
+            posted[1]()
+            self.assertEqual(len(self.results), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+# pylint: disable=C0115
+# pylint: disable=C0111
+"""Tested functions
+
+- classify
+- audit_chunk
+- audit_file
+"""
+
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from audit import audit_chunk, audit_file, classify
+
+UNIQUE: str = (
+    "050703060007000800000816000"
+    "000030000005000100730040086"
+    "906000204840572093000409000"
+)
+
+# Consistent givens, but the last cell of the first row cannot take the 9.
+UNSOLVABLE: str = "123456780" + "000000009" + "0" * 63
+
+
+class TestAudit(unittest.TestCase):
+
+    def test_classify(self) -> None:
+        test_cases: list[tuple[str, str, str]] = [
+            (UNIQUE, "unique", "Should accept a proper puzzle"),
+            ("0" * 81, "multiple", "Should flag an empty board"),
+            (UNSOLVABLE, "unsolvable", "Should flag a dead end"),
+            ("11" + "0" * 79, "invalid", "Should flag clashing givens"),
+            ("1" * 80, "invalid", "Should flag a malformed string"),
+        ]
+
+        for puzzle_str, expected, description in test_cases:
+            for backend in ("solver", "dlx"):
+                with self.subTest(msg=description, backend=backend):
+                    self.assertEqual(classify(puzzle_str, backend), expected)
+
+    def test_audit_chunk(self) -> None:
+        records = audit_chunk([(1, f"a {UNIQUE}  1.2\n"), (2, "garbage\n")])
+
+        self.assertEqual([verdict for verdict, _ in records], ["unique", "invalid"])
+        self.assertEqual(
+            json.loads(records[0][1]),
+            {"line": 1, "id": "a", "puzzle": UNIQUE, "verdict": "unique"},
+        )
+
+    def test_audit_file(self) -> None:
+        lines = [f"a {UNIQUE}  1.2", "", f"b {UNSOLVABLE}  2.0", "c " + "0" * 81]
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "dump.txt")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write("\n".join(lines) + "\n")
+
+            report = io.StringIO()
+            totals = audit_file(path, report, workers=2, chunk_size=1)
+
+        records = [json.loads(line) for line in report.getvalue().splitlines()]
+
+        with self.subTest(msg="Should keep the input order and skip blank lines"):
+            self.assertEqual([record["line"] for record in records], [1, 3, 4])
+            self.assertEqual([record["id"] for record in records], ["a", "b", "c"])
+
+        with self.subTest(msg="Should count every verdict"):
+            self.assertEqual(totals["unique"], 1)
+            self.assertEqual(totals["unsolvable"], 1)
+            self.assertEqual(totals["multiple"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+# pylint: disable=C0115
+# pylint: disable=C0111
+"""Tested functions
+
+- check_boards
+- boards_from_strings
+- boards_from_packed
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+try:
+    import numpy as np
+
+    import batch_check
+except ImportError:  # pragma: no cover
+    np = None
+
+from constants import EXAMPLE_BOARD
+from logic import check_board
+from packed import PackedPuzzles, write_packed
+
+PUZZLE: str = (
+    "050703060007000800000816000"
+    "000030000005000100730040086"
+    "906000204840572093000409000"
+)
+
+
+@unittest.skipUnless(np, "NumPy is not installed")
+class TestBatchCheck(unittest.TestCase):
+
+    def test_check_boards(self) -> None:
+        board = np.array(EXAMPLE_BOARD, dtype=np.uint8)
+
+        cases = {
+            "valid board": (board.copy(), True, -1),
+            "empty board": (np.zeros((9, 9), dtype=np.uint8), True, -1),
+        }
+
+        bad_row = board.copy()
+        bad_row[4] = 0
+        bad_row[4, 0] = bad_row[4, 8] = 5
+        cases["repeated digit in a row"] = (bad_row, False, 4)
+
+        bad_col = np.zeros((9, 9), dtype=np.uint8)
+        bad_col[0, 7] = bad_col[8, 7] = 3
+        cases["repeated digit in a column"] = (bad_col, False, 9 + 7)
+
+        bad_sqr = np.zeros((9, 9), dtype=np.uint8)
+        bad_sqr[3, 6] = bad_sqr[5, 8] = 1
+        cases["repeated digit in a square"] = (bad_sqr, False, 18 + 5)
+
+        out_of_range = np.zeros((9, 9), dtype=np.uint8)
+        out_of_range[2, 2] = 12
+        cases["value above 9"] = (out_of_range, False, 2)
+
+        names = list(cases)
+        boards = np.stack([cases[name][0] for name in names])
+        valid, first_bad = batch_check.check_boards(boards, chunk_size=4)
+
+        for index, name in enumerate(names):
+            _, expected_valid, expected_unit = cases[name]
+            with self.subTest(msg=f"Should handle a {name}"):
+                self.assertEqual(valid[index], expected_valid)
+                self.assertEqual(first_bad[index], expected_unit)
+
+        with self.subTest(msg="Should reject arrays that are not (N, 9, 9)"):
+            with self.assertRaises(ValueError):
+                batch_check.check_boards(np.zeros((2, 81), dtype=np.uint8))
+
+        with self.subTest(msg="Should accept an empty batch"):
+            valid, first_bad = batch_check.check_boards(
+                np.zeros((0, 9, 9), dtype=np.uint8)
+            )
+            self.assertEqual(len(valid), 0)
+
+    def test_matches_check_board(self) -> None:
+        rng = random.Random(7)
+        grids = []
+
+        for _ in range(300):
+            grid = [row[:] for row in EXAMPLE_BOARD]
+            for _ in range(rng.randrange(3)):
+                grid[rng.randrange(9)][rng.randrange(9)] = rng.randrange(10)
+            grids.append(grid)
+
+        valid, _ = batch_check.check_boards(np.array(grids, dtype=np.uint8))
+
+        for index, grid in enumerate(grids):
+            with self.subTest(msg=f"Should agree with check_board on board {index}"):
+                self.assertEqual(bool(valid[index]), check_board(grid))
+
+    def test_boards_from_strings(self) -> None:
+        boards = batch_check.boards_from_strings([PUZZLE, "0" * 81])
+
+        with self.subTest(msg="Should build an (N, 9, 9) uint8 array"):
+            self.assertEqual(boards.shape, (2, 9, 9))
+            self.assertEqual(boards.dtype, np.uint8)
+            self.assertEqual(boards[0, 0].tolist(), [0, 5, 0, 7, 0, 3, 0, 6, 0])
+
+        with self.subTest(msg="Should reject malformed strings"):
+            with self.assertRaises(ValueError):
+                batch_check.boards_from_strings([PUZZLE[:80]])
+
+    def test_boards_from_packed(self) -> None:
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "puzzles.sdkp")
+            write_packed(path, [(PUZZLE, "easy"), ("9" * 81, None)])
+
+            with PackedPuzzles(path) as puzzles:
+                boards = batch_check.boards_from_packed(puzzles.buffer)
+
+        expected = batch_check.boards_from_strings([PUZZLE, "9" * 81])
+        self.assertTrue(np.array_equal(boards, expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
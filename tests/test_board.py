@@ -4,13 +4,37 @@
 
 - set_cell
 - clear_cell
+- is_valid
+- is_solved
+- undo
+- redo
+- jump_to
+- reset
+- grouped
+- take_changes
+- version
+- is_mistake
+- mistakes
+- reveal_cell
+- pencil_marks
+- check_pencil_marks
 """
 
+import random
 import unittest
 
 from copy import deepcopy as copy
-from utils import TEST_BOARD
+from constants import EXAMPLE_BOARD, TEST_BOARD
 from board import Board
+from logic import check_board, check_move
+from solver import solve
+from utils import parse_puzzle_string
+
+EASY_PUZZLE: str = (
+    "050703060007000800000816000"
+    "000030000005000100730040086"
+    "906000204840572093000409000"
+)
 
 
 class TestBoard(unittest.TestCase):
@@ -76,6 +100,456 @@ class TestBoard(unittest.TestCase):
             "Should still have 2 zeroes",
         )
 
+    def test_set_cell_matches_full_check(self):
+        rng = random.Random(2)
+        reference = copy(self.board.state)
+
+        for move in range(500):
+            i, j, num = rng.randrange(9), rng.randrange(9), rng.randrange(1, 10)
+
+            if rng.random() < 0.3:
+                cleared = self.board.clear_cell(i, j)
+                if cleared:
+                    reference[i][j] = 0
+                continue
+
+            expected = False
+            if (i, j) not in self.board.initial_cells and reference[i][j] == 0:
+                reference[i][j] = num
+                expected = check_board(reference)
+                if not expected:
+                    reference[i][j] = 0
+
+            with self.subTest(msg=f"Should accept the same moves, move {move}"):
+                self.assertEqual(self.board.set_cell(i, j, num), expected)
+                self.assertEqual(self.board.state, reference)
+
+    def test_set_cell_out_of_range(self):
+        for value in (0, 10, -1):
+            with self.subTest(msg=f"Should reject the value {value}"):
+                self.assertFalse(self.board.set_cell(3, 3, value))
+                self.assertEqual(self.board.zeroes, 2)
+
+    def test_is_solved(self):
+        self.assertFalse(self.board.is_solved(), "Should not be solved yet")
+        self.assertTrue(self.board.set_cell(3, 3, 5))
+        self.assertFalse(self.board.is_solved(), "Should still have an empty cell")
+        self.assertTrue(self.board.set_cell(6, 7, 1))
+        self.assertTrue(self.board.is_solved(), "Should be solved when filled")
+
+    def test_invalid_initial_board(self):
+        state = copy(TEST_BOARD)
+        state[3][3] = state[3][4]
+        board = Board(state)
+
+        self.assertFalse(board.is_valid(), "Should detect the clashing givens")
+        self.assertFalse(
+            board.set_cell(6, 7, 1), "Should reject moves on an invalid board"
+        )
+
+
+class TestPencilMarks(unittest.TestCase):
+
+    def setUp(self):
+        puzzle = copy(EXAMPLE_BOARD)
+        rng = random.Random(3)
+        for idx in rng.sample(range(81), 50):
+            puzzle[idx // 9][idx % 9] = 0
+
+        self.board = Board(puzzle)
+        self.empty = [(i, j) for i in range(9) for j in range(9) if not puzzle[i][j]]
+        for i, j in self.empty:
+            self.board.set_marks(i, j, self.board.engine.candidates(i, j))
+
+    def rescan(self, state, marks):
+        """The original 81x9 check_move rescan, on plain sets."""
+
+        for i in range(9):
+            for j in range(9):
+                for k in range(1, 10):
+                    if not check_move(state, i, j, k):
+                        marks[i][j].discard(k)
+
+    def test_set_view(self):
+        marks = self.board.pencil_marks[0][2]
+        marks.clear()
+
+        with self.subTest(msg="Should behave like a set"):
+            marks.add(4)
+            marks.add(7)
+            self.assertEqual(marks, {4, 7})
+            self.assertIn(4, marks)
+            self.assertNotIn(5, marks)
+            self.assertEqual(sorted(marks), [4, 7])
+            self.assertEqual(len(marks), 2)
+
+            marks.remove(4)
+            self.assertEqual(marks, {7})
+            with self.assertRaises(KeyError):
+                marks.remove(4)
+
+        with self.subTest(msg="Should write through to the cell mask"):
+            self.assertEqual(self.board.marks[2], 1 << 6)
+
+        with self.subTest(msg="Should accept a set assigned to a cell"):
+            self.board.pencil_marks[0][2] = {1, 9}
+            self.assertEqual(self.board.pencil_marks[0][2], {1, 9})
+
+    def test_matches_rescan(self):
+        rng = random.Random(11)
+        state = copy(self.board.state)
+        expected = [
+            [set(self.board.pencil_marks[i][j]) for j in range(9)] for i in range(9)
+        ]
+
+        for move in range(200):
+            i, j = rng.choice(self.empty)
+            num = rng.randrange(1, 10)
+
+            if self.board.set_cell(i, j, num):
+                state[i][j] = num
+                expected[i][j].clear()
+                self.rescan(state, expected)
+
+            with self.subTest(msg=f"Should match the rescan after move {move}"):
+                self.assertEqual(
+                    [set(self.board.pencil_marks[row][col]) for row, col in self.empty],
+                    [expected[row][col] for row, col in self.empty],
+                )
+
+    def test_clear_restores_marks(self):
+        rng = random.Random(5)
+        before = list(self.board.marks)
+        touched = set()
+
+        for _ in range(300):
+            i, j = rng.choice(self.empty)
+            if self.board.state[i][j]:
+                self.board.clear_cell(i, j)
+            elif self.board.set_cell(i, j, rng.randrange(1, 10)):
+                touched.add(i * 9 + j)
+
+            untouched = [
+                idx
+                for idx in range(81)
+                if idx not in touched and not self.board.state[idx // 9][idx % 9]
+            ]
+            with self.subTest(msg="Should hold exactly the marks still legal"):
+                self.assertEqual(
+                    [self.board.marks[idx] for idx in untouched],
+                    [
+                        before[idx] & self.board.engine.candidates(idx // 9, idx % 9)
+                        for idx in untouched
+                    ],
+                )
+
+        with self.subTest(msg="Should restore every mark once the board is reset"):
+            for i, j in self.empty:
+                self.board.clear_cell(i, j)
+            for idx in set(range(81)) - touched:
+                self.assertEqual(self.board.marks[idx], before[idx])
+
+    def test_check_pencil_marks(self):
+        for i, j in self.empty:
+            self.board.pencil_marks[i][j] = range(1, 10)
+
+        self.board.check_pencil_marks()
+
+        for i, j in self.empty:
+            with self.subTest(msg=f"Should only keep legal marks in {(i, j)}"):
+                self.assertEqual(
+                    self.board.marks[i * 9 + j], self.board.engine.candidates(i, j)
+                )
+
+    def test_check_pencil_marks_after_direct_edit(self):
+        board = Board()
+        board.set_marks(0, 1, 0b11)
+        board.set_marks(8, 8, 0b11)
+        board.state[0][0] = 1
+        board.check_pencil_marks()
+
+        with self.subTest(msg="Should rescan against the edited state"):
+            self.assertEqual(board.marks[1], 0b10)
+            self.assertEqual(board.marks[80], 0b11)
+            self.assertEqual(board.zeroes, 80)
+            self.assertFalse(board.engine.allows(0, 1, 1))
+
+        with self.subTest(msg="Should journal the removed marks as one move"):
+            self.assertEqual(board.cursor, 3)
+            board.undo()
+            self.assertEqual(board.marks[1], 0b11)
+            board.redo()
+            self.assertEqual(board.marks[1], 0b10)
+
+
+class TestJournal(unittest.TestCase):
+
+    def setUp(self):
+        puzzle = copy(EXAMPLE_BOARD)
+        for idx in random.Random(8).sample(range(81), 45):
+            puzzle[idx // 9][idx % 9] = 0
+
+        self.board = Board(puzzle)
+        self.empty = [(i, j) for i in range(9) for j in range(9) if not puzzle[i][j]]
+
+    def snapshot(self):
+        board = self.board
+        return (
+            copy(board.state),
+            list(board.marks),
+            list(board._suppressed),  # pylint: disable=W0212
+            board.zeroes,
+            [board.engine.used(i, j) for i in range(9) for j in range(9)],
+        )
+
+    def play(self, moves: int, seed: int = 9) -> list:
+        """Plays random moves and returns the snapshot after each move."""
+
+        rng = random.Random(seed)
+        snapshots = [self.snapshot()]
+
+        while len(snapshots) <= moves:
+            i, j = rng.choice(self.empty)
+            action = rng.random()
+
+            if action < 0.4:
+                changed = self.board.set_cell(i, j, rng.randrange(1, 10))
+            elif action < 0.6:
+                changed = self.board.clear_cell(i, j)
+            else:
+                cursor = self.board.cursor
+                marks = self.board.pencil_marks[i][j]
+                num = rng.randrange(1, 10)
+                if num in marks:
+                    marks.remove(num)
+                else:
+                    marks.add(num)
+                changed = self.board.cursor != cursor
+
+            if changed:
+                snapshots.append(self.snapshot())
+
+        return snapshots
+
+    def test_undo_redo(self):
+        snapshots = self.play(150)
+
+        with self.subTest(msg="Should journal one move per change"):
+            self.assertEqual(len(self.board.history), 150)
+            self.assertEqual(self.board.cursor, 150)
+
+        for move in range(150, 0, -1):
+            with self.subTest(msg=f"Should restore the position before move {move}"):
+                self.assertTrue(self.board.undo())
+                self.assertEqual(self.snapshot(), snapshots[move - 1])
+
+        self.assertFalse(self.board.undo(), "Should have nothing left to undo")
+
+        for move in range(1, 151):
+            with self.subTest(msg=f"Should replay move {move}"):
+                self.assertTrue(self.board.redo())
+                self.assertEqual(self.snapshot(), snapshots[move])
+
+        self.assertFalse(self.board.redo(), "Should have nothing left to redo")
+
+    def test_jump_to(self):
+        snapshots = self.play(60)
+
+        for move in (0, 45, 12, 60, 30):
+            with self.subTest(msg=f"Should jump to move {move}"):
+                self.board.jump_to(move)
+                self.assertEqual(self.board.cursor, move)
+                self.assertEqual(self.snapshot(), snapshots[move])
+
+        with self.subTest(msg="Should reject moves outside the journal"):
+            with self.assertRaises(IndexError):
+                self.board.jump_to(61)
+
+    def test_new_move_drops_redo(self):
+        self.play(10)
+        self.board.jump_to(4)
+
+        i, j = self.empty[0]
+        self.board.set_marks(i, j, self.board.marks[i * 9 + j] ^ 1)
+
+        self.assertEqual(len(self.board.history), 5)
+        self.assertFalse(self.board.redo(), "Should have dropped the undone moves")
+
+    def test_reset(self):
+        start = self.snapshot()
+        self.play(80)
+        played = self.snapshot()
+
+        with self.subTest(msg="Should return to the initial position"):
+            self.assertTrue(self.board.reset())
+            state, marks, suppressed, zeroes, _ = self.snapshot()
+            self.assertEqual(state, start[0])
+            self.assertEqual(zeroes, start[3])
+            self.assertFalse(any(marks) or any(suppressed))
+
+        with self.subTest(msg="Should be undone as one move"):
+            self.assertTrue(self.board.undo())
+            self.assertEqual(self.snapshot(), played)
+
+        with self.subTest(msg="Should do nothing on an untouched board"):
+            self.assertFalse(Board(copy(EXAMPLE_BOARD)).reset())
+
+    def test_grouped(self):
+        before = self.snapshot()
+
+        with self.board.grouped():
+            for i, j in self.empty:
+                self.board.set_marks(i, j, self.board.engine.candidates(i, j))
+
+        self.assertEqual(len(self.board.history), 1, "Should journal a single move")
+        self.board.undo()
+        self.assertEqual(self.snapshot(), before)
+
+    def test_take_changes(self):
+        board = Board()
+        board.set_marks(0, 1, 0b11)
+        board.set_marks(8, 8, 0b11)
+        board.take_changes()
+
+        with self.subTest(msg="Should report the cell and peers whose marks changed"):
+            board.set_cell(0, 0, 1)
+            self.assertEqual(board.take_changes(), [0, 1])
+
+        with self.subTest(msg="Should forget the reported changes"):
+            self.assertEqual(board.take_changes(), [])
+
+        with self.subTest(msg="Should report undone and redone changes"):
+            board.undo()
+            self.assertEqual(board.take_changes(), [0, 1])
+            board.redo()
+            self.assertEqual(board.take_changes(), [0, 1])
+
+        with self.subTest(msg="Should report marks removed by a rescan"):
+            board.marks[2] = 0b1
+            board.check_pencil_marks()
+            self.assertEqual(board.take_changes(), [2])
+
+    def test_version(self):
+        board = Board()
+        versions = [board.version]
+
+        board.set_cell(0, 0, 1)
+        versions.append(board.version)
+        board.undo()
+        versions.append(board.version)
+        board.set_marks(0, 0, 0b11)
+        versions.append(board.version)
+
+        with self.subTest(msg="Should count every change, undo included"):
+            self.assertEqual(versions, sorted(set(versions)))
+
+        with self.subTest(msg="Should not count refused moves"):
+            board.set_cell(0, 1, 10)
+            board.set_marks(0, 0, 0b11)
+            self.assertEqual(board.version, versions[-1])
+
+    def solved_board(self) -> tuple[Board, list[list[int]]]:
+        grid = parse_puzzle_string(EASY_PUZZLE)
+        solution = solve(grid)
+        return Board(grid, solution), solution
+
+    def wrong_digit(self, board: Board, solution: list[list[int]]):
+        for row in range(9):
+            for col in range(9):
+                if board.state[row][col]:
+                    continue
+                for num in range(1, 10):
+                    if num != solution[row][col] and board.engine.allows(row, col, num):
+                        return row, col, num
+        return None
+
+    def test_mistakes(self):
+        board, solution = self.solved_board()
+        row, col, num = self.wrong_digit(board, solution)
+
+        with self.subTest(msg="Should flag a legal but wrong digit"):
+            self.assertTrue(board.set_cell(row, col, num))
+            self.assertTrue(board.is_mistake(row, col))
+            self.assertEqual(board.mistakes(), [(row, col)])
+
+        with self.subTest(msg="Should unflag it when cleared or undone"):
+            board.clear_cell(row, col)
+            self.assertEqual(board.mistakes(), [])
+            board.undo()
+            self.assertEqual(board.mistakes(), [(row, col)])
+            board.undo()
+            self.assertEqual(board.wrong, 0)
+            board.redo()
+            self.assertTrue(board.is_mistake(row, col))
+
+        with self.subTest(msg="Should not flag right digits"):
+            board.reset()
+            board.set_cell(row, col, solution[row][col])
+            self.assertFalse(board.is_mistake(row, col))
+
+        with self.subTest(msg="Should flag nothing without a solution"):
+            other = Board(parse_puzzle_string(EASY_PUZZLE))
+            other.set_cell(row, col, num)
+            self.assertFalse(other.is_mistake(row, col))
+            self.assertIsNone(other.solution)
+
+        with self.subTest(msg="Should reject a solution that is not 9x9"):
+            with self.assertRaises(ValueError):
+                Board(parse_puzzle_string(EASY_PUZZLE), [[1] * 9] * 8)
+
+    def test_reveal_cell(self):
+        board, solution = self.solved_board()
+        row, col, num = self.wrong_digit(board, solution)
+        board.set_cell(row, col, num)
+
+        with self.subTest(msg="Should replace a wrong digit as one move"):
+            moves = board.cursor
+            self.assertTrue(board.reveal_cell(row, col))
+            self.assertEqual(board.state[row][col], solution[row][col])
+            self.assertEqual(board.mistakes(), [])
+            self.assertEqual(board.cursor, moves + 1)
+            board.undo()
+            self.assertEqual(board.state[row][col], num)
+
+        with self.subTest(msg="Should clear wrong copies in the peers"):
+            board.undo()
+            value = solution[row][col]
+            peer = next(
+                (i, j)
+                for i in range(9)
+                for j in range(9)
+                if not board.state[i][j]
+                and (i == row or j == col)
+                and (i, j) != (row, col)
+                and board.engine.allows(i, j, value)
+            )
+            self.assertTrue(board.set_cell(*peer, value))
+            self.assertTrue(board.reveal_cell(row, col))
+            self.assertEqual(board.state[peer[0]][peer[1]], 0)
+            self.assertEqual(board.state[row][col], value)
+
+        with self.subTest(msg="Should refuse givens, right cells and no solution"):
+            given = next(iter(board.initial_cells))
+            self.assertFalse(board.reveal_cell(*given))
+            self.assertFalse(board.reveal_cell(row, col))
+            self.assertFalse(Board(parse_puzzle_string(EASY_PUZZLE)).reveal_cell(0, 0))
+
+        with self.subTest(msg="Should win once every cell is revealed"):
+            for i in range(9):
+                for j in range(9):
+                    board.reveal_cell(i, j)
+            self.assertTrue(board.is_solved())
+            self.assertEqual(board.state, solution)
+
+    def test_delta_size(self):
+        self.play(100)
+
+        for move in self.board.history:
+            with self.subTest(msg="Should store small flat deltas"):
+                self.assertEqual(len(move), 1)
+                self.assertLessEqual(len(move[0]), 6)
+                self.assertTrue(all(isinstance(item, int) for item in move[0]))
+
 
 if __name__ == "__main__":
     unittest.main()
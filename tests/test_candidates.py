@@ -0,0 +1,68 @@
+# pylint: disable=C0115
+# pylint: disable=C0111
+"""Tested functions
+
+- has_duplicate
+- digits_of
+- CandidateEngine
+"""
+
+import unittest
+
+from candidates import PEERS, CandidateEngine, digits_of, has_duplicate
+from constants import EXAMPLE_BOARD
+from logic import check_move
+
+
+class TestCandidates(unittest.TestCase):
+
+    def test_has_duplicate(self) -> None:
+        self.assertTrue(has_duplicate([0, 0, 3, 4, 5, 0, 3, 2, 1]))
+        self.assertFalse(has_duplicate([0, 0, 3, 4, 5, 0, 6, 2, 1]))
+        self.assertFalse(has_duplicate([]))
+
+    def test_digits_of(self) -> None:
+        self.assertEqual(digits_of(0), [])
+        self.assertEqual(digits_of(0b100010001), [1, 5, 9])
+
+    def test_peers(self) -> None:
+        self.assertTrue(all(len(peers) == 20 for peers in PEERS))
+        self.assertNotIn(0, PEERS[0])
+        self.assertIn(80, PEERS[8])
+        self.assertIn(20, PEERS[0])
+
+    def test_engine_matches_check_move(self) -> None:
+        engine = CandidateEngine(EXAMPLE_BOARD)
+
+        for row in range(9):
+            for col in range(9):
+                for num in range(1, 10):
+                    with self.subTest(row=row, col=col, num=num):
+                        self.assertEqual(
+                            engine.allows(row, col, num),
+                            check_move(EXAMPLE_BOARD, row, col, num),
+                        )
+
+    def test_engine_place_and_remove(self) -> None:
+        engine = CandidateEngine()
+
+        with self.subTest(msg="Should allow every digit on an empty board"):
+            self.assertEqual(digits_of(engine.candidates(4, 4)), list(range(1, 10)))
+
+        engine.place(0, 0, 5)
+
+        with self.subTest(msg="Should block the digit in row, column and square"):
+            self.assertFalse(engine.allows(0, 8, 5))
+            self.assertFalse(engine.allows(8, 0, 5))
+            self.assertFalse(engine.allows(2, 2, 5))
+            self.assertTrue(engine.allows(4, 4, 5))
+
+        engine.remove(0, 0, 5)
+
+        with self.subTest(msg="Should restore the digit after removal"):
+            self.assertTrue(engine.allows(0, 8, 5))
+            self.assertTrue(engine.allows(2, 2, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+# pylint: disable=C0115
+# pylint: disable=C0111
+"""Tested functions
+
+- canonical_form
+- canonical_many
+"""
+
+import random
+import time
+import unittest
+
+import canonical as canonical_module
+from canonical import canonical_form, canonical_many
+
+PUZZLES: tuple[str, ...] = (
+    "050703060007000800000816000000030000005000100730040086906000204840572093000409000",
+    "020900000048000031000063020009407003003080200400105600030570000250000180000006050",
+    "800000000003600000070090200050007000000045700000100030001000068008500010090000400",
+    "108500406000070900530004007001060008090408070800050600700100069006080000904006205",
+)
+
+# The solution of PUZZLES[0].
+SOLVED: str = (
+    "158723469367954821294816375619238547485697132732145986976381254841572693523469718"
+)
+
+# A complete grid used to take over a minute; the dense path needs well
+# under a second, so this only catches a fall back to the general search.
+DENSE_BUDGET: float = 10.0
+
+
+def transform(puzzle_str: str, rng: random.Random) -> str:
+    """Applies a random relabelling, transposition and row/column shuffle."""
+
+    cells = [int(char) for char in puzzle_str]
+    if rng.random() < 0.5:
+        cells = [cells[col * 9 + row] for row in range(9) for col in range(9)]
+
+    def shuffle() -> list[int]:
+        return [
+            3 * band + line
+            for band in rng.sample(range(3), 3)
+            for line in rng.sample(range(3), 3)
+        ]
+
+    rows, cols = shuffle(), shuffle()
+    labels = [0] + rng.sample(range(1, 10), 9)
+    return "".join(str(labels[cells[row * 9 + col]]) for row in rows for col in cols)
+
+
+class TestCanonical(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.rng = random.Random(6)
+
+    def test_invariant(self) -> None:
+        for puzzle_str in PUZZLES:
+            canonical = canonical_form(puzzle_str)
+            for _ in range(20):
+                variant = transform(puzzle_str, self.rng)
+                with self.subTest(msg=f"Should map {variant} to the same form"):
+                    self.assertEqual(canonical_form(variant), canonical)
+
+    def test_representative(self) -> None:
+        for puzzle_str in PUZZLES:
+            canonical = canonical_form(puzzle_str)
+
+            with self.subTest(msg="Should be a fixed point"):
+                self.assertEqual(canonical_form(canonical), canonical)
+
+            with self.subTest(msg="Should keep the clues and relabel in order"):
+                self.assertEqual(canonical.count("0"), puzzle_str.count("0"))
+                digits = [char for char in canonical if char != "0"]
+                first_seen = list(dict.fromkeys(digits))
+                self.assertEqual(first_seen, [str(num) for num in range(1, 10)])
+
+            with self.subTest(msg="Should be minimal among the variants"):
+                for _ in range(20):
+                    variant = transform(puzzle_str, self.rng)
+                    pattern = variant.translate(str.maketrans("123456789", "1" * 9))
+                    self.assertLessEqual(
+                        canonical.translate(str.maketrans("123456789", "1" * 9)),
+                        pattern,
+                    )
+
+    def test_distinct(self) -> None:
+        forms = {canonical_form(puzzle_str) for puzzle_str in PUZZLES}
+        self.assertEqual(len(forms), len(PUZZLES), "Should tell puzzles apart")
+
+    def test_sparse(self) -> None:
+        with self.subTest(msg="Should handle empty and one-clue grids"):
+            self.assertEqual(canonical_form("0" * 81), "0" * 81)
+            self.assertEqual(canonical_form("0" * 40 + "7" + "0" * 40), "0" * 80 + "1")
+
+        with self.subTest(msg="Should accept dots"):
+            self.assertEqual(
+                canonical_form(PUZZLES[0].replace("0", ".")), canonical_form(PUZZLES[0])
+            )
+
+        with self.subTest(msg="Should reject malformed strings"):
+            with self.assertRaises(ValueError):
+                canonical_form("123")
+
+    def test_dense(self) -> None:
+        for clues in (81, 80):
+            grid = SOLVED if clues == 81 else "0" + SOLVED[1:]
+
+            with self.subTest(msg=f"Should canonicalize {clues} clues quickly"):
+                start = time.perf_counter()
+                canonical = canonical_form(grid)
+                self.assertLess(time.perf_counter() - start, DENSE_BUDGET)
+
+            with self.subTest(msg=f"Should map {clues}-clue variants to one form"):
+                for _ in range(3):
+                    variant = transform(grid, self.rng)
+                    self.assertEqual(canonical_form(variant), canonical)
+
+        with self.subTest(msg="Should match the general search"):
+            grid = SOLVED[:40] + "0" + SOLVED[41:]
+            dense = canonical_form(grid)
+            general = canonical_module._dense_form  # pylint: disable=W0212
+            try:
+                canonical_module._dense_form = lambda _: None  # pylint: disable=W0212
+                self.assertEqual(canonical_form(grid), dense)
+            finally:
+                canonical_module._dense_form = general  # pylint: disable=W0212
+
+        with self.subTest(msg="Should handle full grids that repeat digits"):
+            junk = "1" * 40 + "2" * 41
+            start = time.perf_counter()
+            canonical = canonical_form(junk)
+            self.assertLess(time.perf_counter() - start, DENSE_BUDGET)
+            for _ in range(3):
+                self.assertEqual(canonical_form(transform(junk, self.rng)), canonical)
+
+    def test_canonical_many(self) -> None:
+        expected = [canonical_form(puzzle_str) for puzzle_str in PUZZLES]
+
+        with self.subTest(msg="Should keep the input order"):
+            self.assertEqual(list(canonical_many(PUZZLES)), expected)
+
+        with self.subTest(msg="Should give the same forms in parallel"):
+            self.assertEqual(
+                list(canonical_many(PUZZLES, workers=2, chunk_size=1)), expected
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# pylint: disable=C0115
+# pylint: disable=C0111
+"""Tested functions
+
+- CompactBoard
+"""
+
+import random
+import unittest
+from copy import deepcopy as copy
+
+from board import Board
+from compact_board import CompactBoard
+from constants import TEST_BOARD
+from logic import check_board
+
+PUZZLE: str = (
+    "050703060007000800000816000"
+    "000030000005000100730040086"
+    "906000204840572093000409000"
+)
+
+
+class TestCompactBoard(unittest.TestCase):
+
+    def test_strings(self) -> None:
+        board = CompactBoard.from_string(PUZZLE)
+
+        with self.subTest(msg="Should round-trip puzzle strings"):
+            self.assertEqual(board.to_string(), PUZZLE)
+
+        with self.subTest(msg="Should read dots as empty cells"):
+            dotted = CompactBoard.from_string(PUZZLE.replace("0", "."))
+            self.assertEqual(dotted, board)
+
+        with self.subTest(msg="Should reject malformed strings"):
+            for puzzle in (PUZZLE[:80], PUZZLE + "0", "x" * 81):
+                with self.assertRaises(ValueError, msg=f"Failed for {puzzle!r}"):
+                    CompactBoard.from_string(puzzle)
+
+    def test_state(self) -> None:
+        board = CompactBoard.from_grid(copy(TEST_BOARD))
+
+        with self.subTest(msg="Should expose nested lists for logic"):
+            self.assertEqual(board.state, TEST_BOARD)
+            self.assertTrue(check_board(board.state))
+
+        with self.subTest(msg="Should treat filled cells as givens"):
+            self.assertEqual(len(board.initial_cells), 79)
+            self.assertEqual(board.zeroes, 2)
+
+    def test_moves_match_board(self) -> None:
+        rng = random.Random(4)
+        board = Board(copy(TEST_BOARD))
+        for idx in rng.sample(range(81), 40):
+            board.state[idx // 9][idx % 9] = 0
+        board = Board(board.state)
+        compact = CompactBoard.from_board(board)
+
+        for move in range(500):
+            i, j, num = rng.randrange(9), rng.randrange(9), rng.randrange(1, 10)
+
+            with self.subTest(msg=f"Should follow the Board rules, move {move}"):
+                if rng.random() < 0.3:
+                    self.assertEqual(compact.clear_cell(i, j), board.clear_cell(i, j))
+                else:
+                    self.assertEqual(
+                        compact.set_cell(i, j, num), board.set_cell(i, j, num)
+                    )
+                self.assertEqual(compact.state, board.state)
+                self.assertEqual(compact.zeroes, board.zeroes)
+                self.assertEqual(compact.is_solved(), board.is_solved())
+
+    def test_copy(self) -> None:
+        board = CompactBoard.from_string(PUZZLE)
+        board.set_marks(0, 0, 0b101)
+        clone = board.copy()
+
+        with self.subTest(msg="Should copy every field"):
+            self.assertEqual(clone, board)
+            self.assertEqual(clone.zeroes, board.zeroes)
+
+        with self.subTest(msg="Should not share buffers"):
+            self.assertTrue(clone.set_cell(0, 0, 1))
+            self.assertEqual(board.get(0, 0), 0)
+            self.assertEqual(board.pencil_marks(0, 0), [1, 3])
+            self.assertEqual(clone.pencil_marks(0, 0), [])
+
+    def test_board_adapters(self) -> None:
+        board = Board(copy(TEST_BOARD))
+        board.set_cell(3, 3, 5)
+        board.set_marks(6, 7, 0b1)
+
+        compact = CompactBoard.from_board(board)
+        back = compact.to_board()
+
+        with self.subTest(msg="Should keep only the original givens"):
+            self.assertEqual(compact.initial_cells, board.initial_cells)
+            self.assertTrue(compact.clear_cell(3, 3))
+
+        with self.subTest(msg="Should convert back to an equivalent Board"):
+            self.assertEqual(back.state, board.state)
+            self.assertEqual(back.initial_cells, board.initial_cells)
+            self.assertEqual(back.pencil_marks[6][7], {1})
+
+    def test_invalid_board(self) -> None:
+        grid = copy(TEST_BOARD)
+        grid[3][3] = grid[3][4]
+        board = CompactBoard.from_grid(grid)
+
+        self.assertFalse(board.is_valid(), "Should detect clashing givens")
+        self.assertFalse(board.set_cell(6, 7, 1), "Should reject every move")
+
+
+if __name__ == "__main__":
+    unittest.main()
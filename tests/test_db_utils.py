@@ -4,17 +4,45 @@
 
 - setup_database
 - add_puzzles
+- import_puzzles
+- backfill_difficulty
+- backfill_canonical
+- backfill_solution
+- number_puzzles
+- clear_row_counts
+- rating_to_difficulty
 - load_puzzle_from_db
+- load_solution
+- ConnectionPool
+- close_connections
 """
 
+import os
+import random
+import tempfile
+import threading
 import unittest
 import sqlite3
 
 from db_utils import (
+    ConnectionPool,
+    close_connections,
     setup_database,
     add_puzzles,
+    backfill_canonical,
+    backfill_difficulty,
+    backfill_solution,
+    clear_row_counts,
+    import_puzzles,
+    rating_to_difficulty,
     load_puzzle_from_db,
+    load_solution,
+    number_puzzles,
 )
+from collections import Counter
+
+from packed import unpack_puzzle
+from solver import solve_many
 
 
 class TestDbUtils(unittest.TestCase):
@@ -25,7 +53,7 @@ class TestDbUtils(unittest.TestCase):
         setup_database(db_name=self.test_db_name)
 
     def tearDown(self) -> None:
-        pass
+        close_connections()
 
     def test_setup_database(self) -> None:
         with sqlite3.connect(self.test_db_name) as conn:
@@ -37,6 +65,12 @@ class TestDbUtils(unittest.TestCase):
             self.assertIsNotNone(result)
             self.assertEqual(result[0], "puzzles")
 
+            cursor.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type='index' AND name='idx_puzzles_difficulty';"
+            )
+            self.assertIsNotNone(cursor.fetchone(), "Should index the difficulty")
+
     def test_add_puzzles(self) -> None:
         with self.subTest(msg="Should add the correct number of puzzles to a new DB"):
             add_puzzles(db_name=self.test_db_name)
@@ -54,6 +88,295 @@ class TestDbUtils(unittest.TestCase):
                 count = cursor.fetchone()[0]
                 self.assertEqual(count, 4)
 
+    def test_rating_to_difficulty(self) -> None:
+        self.assertEqual(rating_to_difficulty(1.2), "easy")
+        self.assertEqual(rating_to_difficulty(1.5), "medium")
+        self.assertEqual(rating_to_difficulty(2.5), "hard")
+        self.assertIsNone(rating_to_difficulty(None))
+
+    def test_import_puzzles(self) -> None:
+        puzzle_a = "0" * 80 + "1"
+        puzzle_b = "0" * 79 + "12"
+        relabelled_b = "0" * 79 + "98"
+        lines = [
+            f"id1 {puzzle_a}  1.2",
+            "",
+            "not a puzzle line",
+            f"id2\t{puzzle_b}   3.1",
+            f"id3 {puzzle_a}  1.2",
+            f"id4 {relabelled_b}  3.1",
+        ]
+
+        with tempfile.TemporaryDirectory() as folder:
+            dump = os.path.join(folder, "dump.txt")
+            db_name = os.path.join(folder, "import.db")
+
+            with open(dump, "w", encoding="utf-8") as file:
+                file.write("\n".join(lines))
+
+            setup_database(db_name=db_name)
+            report = import_puzzles(dump, db_name, batch_size=2, annotate=True)
+
+            with sqlite3.connect(db_name) as conn:
+                rows = conn.execute(
+                    "SELECT puzzle_string, difficulty FROM puzzles ORDER BY id;"
+                ).fetchall()
+                canonicals = conn.execute(
+                    "SELECT canonical FROM puzzles ORDER BY id;"
+                ).fetchall()
+                solutions = conn.execute(
+                    "SELECT solution FROM puzzles ORDER BY id;"
+                ).fetchall()
+                journal_mode = conn.execute("PRAGMA journal_mode;").fetchone()[0]
+            conn.close()
+            close_connections()
+
+        with self.subTest(msg="Should report lines, inserts and malformed lines"):
+            self.assertEqual(report.lines, 5)
+            self.assertEqual(report.inserted, 2)
+            self.assertEqual(report.malformed, 1)
+            self.assertGreater(report.rate, 0)
+
+        with self.subTest(msg="Should insert tolerant lines and skip duplicates"):
+            self.assertEqual(rows, [(puzzle_a, "easy"), (puzzle_b, "hard")])
+
+        with self.subTest(msg="Should store canonical forms"):
+            self.assertEqual(canonicals, [(puzzle_a,), (puzzle_b,)])
+
+        with self.subTest(msg="Should store packed solutions"):
+            self.assertEqual(
+                [unpack_puzzle(solution) for solution, in solutions],
+                list(solve_many([puzzle_a, puzzle_b])),
+            )
+
+        with self.subTest(msg="Should leave the journal in its default mode"):
+            self.assertEqual(journal_mode, "delete")
+
+    def test_import_then_backfill(self) -> None:
+        puzzle_a = "0" * 80 + "1"
+        puzzle_b = "0" * 79 + "12"
+        relabelled_b = "0" * 79 + "98"
+        lines = [f"id1 {puzzle_a}  1.2", f"id2 {puzzle_b}  3.1", f"id3 {relabelled_b}"]
+
+        with tempfile.TemporaryDirectory() as folder:
+            dump = os.path.join(folder, "dump.txt")
+            db_name = os.path.join(folder, "import.db")
+
+            with open(dump, "w", encoding="utf-8") as file:
+                file.write("\n".join(lines))
+
+            setup_database(db_name=db_name)
+            report = import_puzzles(dump, db_name)
+
+            with sqlite3.connect(db_name) as conn:
+                bare = conn.execute(
+                    "SELECT COUNT(*) FROM puzzles "
+                    "WHERE canonical IS NULL AND solution IS NULL;"
+                ).fetchone()[0]
+            conn.close()
+
+            canonicals = backfill_canonical(db_name, drop_duplicates=True, workers=2)
+            solutions = backfill_solution(db_name, workers=2)
+
+            with sqlite3.connect(db_name) as conn:
+                rows = conn.execute(
+                    "SELECT puzzle_string, canonical, length(solution) FROM puzzles "
+                    "ORDER BY id;"
+                ).fetchall()
+            conn.close()
+            close_connections()
+
+        with self.subTest(msg="Should only write puzzles and difficulties"):
+            self.assertEqual(report.inserted, 3)
+            self.assertEqual(bare, 3)
+
+        with self.subTest(msg="Should annotate and deduplicate in the backfills"):
+            self.assertEqual(canonicals, (2, 1))
+            self.assertEqual(solutions, 2)
+            self.assertEqual(rows, [(puzzle_a, puzzle_a, 41), (puzzle_b, puzzle_b, 41)])
+
+    def test_import_mixed_ratings(self) -> None:
+        puzzle = "0" * 80 + "1"
+        lines = [f"id1 {puzzle}", f"id2 {puzzle}  1.2", f"id3 {'0' * 79}12"]
+
+        with tempfile.TemporaryDirectory() as folder:
+            dump = os.path.join(folder, "dump.txt")
+            db_name = os.path.join(folder, "import.db")
+
+            with open(dump, "w", encoding="utf-8") as file:
+                file.write("\n".join(lines))
+
+            setup_database(db_name=db_name)
+            report = import_puzzles(dump, db_name)
+
+            with sqlite3.connect(db_name) as conn:
+                rows = conn.execute(
+                    "SELECT puzzle_string, difficulty FROM puzzles ORDER BY id;"
+                ).fetchall()
+            conn.close()
+            close_connections()
+
+        with self.subTest(msg="Should import a duplicate rated once, unrated once"):
+            self.assertEqual(report.inserted, 2)
+            self.assertEqual(rows[0], (puzzle, None))
+
+    def test_backfill_difficulty(self) -> None:
+        easy = (
+            "050703060007000800000816000"
+            "000030000005000100730040086"
+            "906000204840572093000409000"
+        )
+        hard = (
+            "800000000003600000070090200"
+            "050007000000045700000100030"
+            "001000068008500010090000400"
+        )
+        clashing = "11" + "0" * 79
+
+        with tempfile.TemporaryDirectory() as folder:
+            db_name = os.path.join(folder, "backfill.db")
+            setup_database(db_name=db_name)
+
+            with sqlite3.connect(db_name) as conn:
+                conn.executemany(
+                    "INSERT INTO puzzles (puzzle_string, difficulty) VALUES (?, ?);",
+                    [(easy, None), (hard, None), (clashing, None), ("0" * 81, "easy")],
+                )
+            conn.close()
+
+            first = backfill_difficulty(db_name, batch_size=2)
+            second = backfill_difficulty(db_name)
+            regraded = backfill_difficulty(db_name, overwrite=True)
+
+            with sqlite3.connect(db_name) as conn:
+                labels = conn.execute(
+                    "SELECT difficulty FROM puzzles ORDER BY id;"
+                ).fetchall()
+            conn.close()
+            close_connections()
+
+        with self.subTest(msg="Should label the unlabelled gradable puzzles"):
+            self.assertEqual(first, 2)
+            self.assertEqual(labels, [("easy",), ("hard",), (None,), ("hard",)])
+
+        with self.subTest(msg="Should leave graded rows alone unless overwriting"):
+            self.assertEqual(second, 0)
+            self.assertEqual(regraded, 3)
+
+    def test_backfill_canonical(self) -> None:
+        puzzle = (
+            "050703060007000800000816000"
+            "000030000005000100730040086"
+            "906000204840572093000409000"
+        )
+        transposed = "".join(
+            puzzle[col * 9 + row] for row in range(9) for col in range(9)
+        )
+        other = "0" * 80 + "1"
+
+        with tempfile.TemporaryDirectory() as folder:
+            db_name = os.path.join(folder, "canonical.db")
+
+            # A table from before the canonical column existed.
+            with sqlite3.connect(db_name) as conn:
+                conn.execute(
+                    "CREATE TABLE puzzles (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    "puzzle_string TEXT NOT NULL UNIQUE, difficulty TEXT);"
+                )
+                conn.executemany(
+                    "INSERT INTO puzzles (puzzle_string, difficulty) VALUES (?, ?);",
+                    [(puzzle, "easy"), (transposed, "easy"), (other, None)],
+                )
+            conn.close()
+
+            setup_database(db_name=db_name)
+            kept = backfill_canonical(db_name)
+            dropped = backfill_canonical(db_name, drop_duplicates=True)
+
+            with sqlite3.connect(db_name) as conn:
+                rows = conn.execute(
+                    "SELECT puzzle_string, canonical IS NOT NULL FROM puzzles;"
+                ).fetchall()
+            conn.close()
+            close_connections()
+
+        with self.subTest(msg="Should fill the new column and flag duplicates"):
+            self.assertEqual(kept, (2, 1))
+
+        with self.subTest(msg="Should drop duplicates on request"):
+            self.assertEqual(dropped, (0, 1))
+            self.assertEqual(rows, [(puzzle, 1), (other, 1)])
+
+    def test_backfill_solution(self) -> None:
+        puzzle = (
+            "050703060007000800000816000"
+            "000030000005000100730040086"
+            "906000204840572093000409000"
+        )
+        clashing = "11" + "0" * 79
+
+        with tempfile.TemporaryDirectory() as folder:
+            db_name = os.path.join(folder, "solution.db")
+
+            # A table from before the solution column existed.
+            with sqlite3.connect(db_name) as conn:
+                conn.execute(
+                    "CREATE TABLE puzzles (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    "puzzle_string TEXT NOT NULL UNIQUE, difficulty TEXT);"
+                )
+                conn.executemany(
+                    "INSERT INTO puzzles (puzzle_string, difficulty) VALUES (?, ?);",
+                    [(puzzle, "easy"), (clashing, None)],
+                )
+            conn.close()
+
+            before = load_solution(puzzle, db_name)
+            setup_database(db_name=db_name)
+            first = backfill_solution(db_name, batch_size=1)
+            second = backfill_solution(db_name)
+
+            with sqlite3.connect(db_name) as conn:
+                rows = conn.execute(
+                    "SELECT length(solution) FROM puzzles ORDER BY id;"
+                ).fetchall()
+            conn.close()
+            solution = load_solution(puzzle, db_name)
+            close_connections()
+
+        with self.subTest(msg="Should find no solution before the column exists"):
+            self.assertIsNone(before)
+
+        with self.subTest(msg="Should fill the solvable rows, 41 bytes each"):
+            self.assertEqual(first, 1)
+            self.assertEqual(second, 0)
+            self.assertEqual(rows, [(41,), (None,)])
+
+        with self.subTest(msg="Should load the solution as a grid"):
+            self.assertEqual(
+                "".join(str(num) for row in solution for num in row),
+                next(solve_many([puzzle])),
+            )
+
+    def test_load_solution(self) -> None:
+        add_puzzles(db_name=self.test_db_name)
+        puzzle = load_puzzle_from_db(difficulty="medium", db_name=self.test_db_name)
+        puzzle_str = "".join(str(num) for row in puzzle for num in row)
+
+        with self.subTest(msg="Should load the solution stored with the puzzle"):
+            solution = load_solution(puzzle_str, self.test_db_name)
+            self.assertEqual(len(solution), 9)
+            self.assertTrue(
+                all(
+                    given in (0, num)
+                    for puzzle_row, row in zip(puzzle, solution)
+                    for given, num in zip(puzzle_row, row)
+                )
+            )
+            self.assertTrue(all(sorted(row) == list(range(1, 10)) for row in solution))
+
+        with self.subTest(msg="Should return None for an unknown puzzle"):
+            self.assertIsNone(load_solution("0" * 81, self.test_db_name))
+
     def test_load_puzzle_from_db(self) -> None:
         add_puzzles(db_name=self.test_db_name)
 
@@ -69,6 +392,22 @@ class TestDbUtils(unittest.TestCase):
             self.assertEqual(len(puzzle[0]), 9)
             self.assertIsInstance(puzzle[0][0], int)
 
+        with self.subTest(msg="Should only pick puzzles of the difficulty"):
+            easy = {
+                "050703060007000800000816000"
+                "000030000005000100730040086"
+                "906000204840572093000409000",
+                "302401809001000300000000000"
+                "040708010780502036000090000"
+                "200609003900000008800070005",
+            }
+            for _ in range(20):
+                puzzle = load_puzzle_from_db(
+                    difficulty="easy", db_name=self.test_db_name
+                )
+                puzzle_str = "".join(str(num) for row in puzzle for num in row)
+                self.assertIn(puzzle_str, easy)
+
         with self.subTest(
             msg="Should return an empty grid for a non-existent difficulty"
         ):
@@ -85,6 +424,189 @@ class TestDbUtils(unittest.TestCase):
             puzzle = load_puzzle_from_db(difficulty="easy", db_name=self.test_db_name)
             self.assertEqual(puzzle, [[]])
 
+    def test_load_puzzle_uniformly(self) -> None:
+        # Ids laid out like the bundled database: a few medium puzzles, a run
+        # of easy ones, then the rest of the medium ones.
+        rows = [(f"{n:081d}", "medium") for n in range(4)]
+        rows += [(f"{n:081d}", "easy") for n in range(4, 304)]
+        rows += [(f"{n:081d}", "medium") for n in range(304, 600)]
+
+        with tempfile.TemporaryDirectory() as folder:
+            db_name = os.path.join(folder, "uniform.db")
+            setup_database(db_name=db_name)
+
+            with sqlite3.connect(db_name) as conn:
+                conn.executemany(
+                    "INSERT INTO puzzles (puzzle_string, difficulty) VALUES (?, ?)",
+                    rows,
+                )
+            conn.close()
+
+            random.seed(1234)
+            fallback = Counter(
+                tuple(map(tuple, load_puzzle_from_db("medium", db_name)))
+                for _ in range(3000)
+            )
+            numbered = number_puzzles(db_name)
+            picks = Counter(
+                tuple(map(tuple, load_puzzle_from_db("medium", db_name)))
+                for _ in range(3000)
+            )
+
+            with sqlite3.connect(db_name) as conn:
+                conn.execute("DELETE FROM puzzles WHERE id % 3 = 0;")
+            conn.close()
+            renumbered = number_puzzles(db_name, renumber=True)
+
+            with sqlite3.connect(db_name) as conn:
+                seqs = {
+                    difficulty: [
+                        row[0]
+                        for row in conn.execute(
+                            "SELECT seq FROM puzzles WHERE difficulty = ? "
+                            "ORDER BY seq;",
+                            (difficulty,),
+                        )
+                    ]
+                    for difficulty in ("easy", "medium")
+                }
+            conn.close()
+            close_connections()
+
+        with self.subTest(msg="Should pick uniformly from unnumbered rows"):
+            self.assertEqual(len(fallback), 300)
+            self.assertLess(max(fallback.values()), 40)
+
+        with self.subTest(msg="Should number every labelled row"):
+            self.assertEqual(numbered, 600)
+
+        with self.subTest(msg="Should pick every puzzle about equally often"):
+            self.assertEqual(len(picks), 300)
+            self.assertLess(max(picks.values()), 40)
+
+        with self.subTest(msg="Should renumber without gaps after deletes"):
+            self.assertEqual(renumbered, 400)
+            for numbers in seqs.values():
+                self.assertEqual(numbers, list(range(len(numbers))))
+
+    def test_row_counts_across_threads(self) -> None:
+        add_puzzles(db_name=self.test_db_name)
+        errors: list[Exception] = []
+
+        def run(func) -> None:
+            try:
+                for _ in range(200):
+                    func()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                errors.append(e)
+
+        threads = [
+            threading.Thread(target=run, args=(clear_row_counts,)) for _ in range(3)
+        ] + [
+            threading.Thread(
+                target=run,
+                args=(lambda: load_puzzle_from_db("easy", self.test_db_name),),
+            )
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [], "Should clear and fill the cache concurrently")
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.db_name = os.path.join(self.folder.name, "pool.db")
+        self.pool = ConnectionPool(max_idle_readers=2)
+
+        with self.pool.writer(self.db_name) as conn:
+            conn.execute("CREATE TABLE items (value INTEGER);")
+
+    def tearDown(self) -> None:
+        self.pool.close()
+        self.folder.cleanup()
+
+    def test_reader(self) -> None:
+        with self.subTest(msg="Should reuse an idle reader"):
+            with self.pool.reader(self.db_name) as first:
+                pass
+            with self.pool.reader(self.db_name) as second:
+                pass
+            self.assertIs(first, second)
+
+        with self.subTest(msg="Should hand concurrent callers distinct readers"):
+            with self.pool.reader(self.db_name) as first:
+                with self.pool.reader(self.db_name) as second:
+                    self.assertIsNot(first, second)
+
+        with self.subTest(msg="Should open readers read-only"):
+            with self.pool.reader(self.db_name) as conn:
+                with self.assertRaises(sqlite3.OperationalError):
+                    conn.execute("INSERT INTO items VALUES (1);")
+
+        with self.subTest(msg="Should cap the idle readers"):
+            with self.pool.reader(self.db_name):
+                with self.pool.reader(self.db_name):
+                    with self.pool.reader(self.db_name):
+                        pass
+            idle = self.pool._readers[self.db_name]  # pylint: disable=W0212
+            self.assertEqual(len(idle), 2)
+
+    def test_writer(self) -> None:
+        with self.subTest(msg="Should commit when the block succeeds"):
+            with self.pool.writer(self.db_name) as conn:
+                conn.execute("INSERT INTO items VALUES (1);")
+
+            with self.pool.reader(self.db_name) as conn:
+                count = conn.execute("SELECT COUNT(*) FROM items;").fetchone()[0]
+            self.assertEqual(count, 1)
+
+        with self.subTest(msg="Should roll back when the block raises"):
+            with self.assertRaises(ValueError):
+                with self.pool.writer(self.db_name) as conn:
+                    conn.execute("INSERT INTO items VALUES (2);")
+                    raise ValueError
+
+            with self.pool.reader(self.db_name) as conn:
+                count = conn.execute("SELECT COUNT(*) FROM items;").fetchone()[0]
+            self.assertEqual(count, 1)
+
+        with self.subTest(msg="Should serialize writers across threads"):
+
+            def insert_many() -> None:
+                for value in range(50):
+                    with self.pool.writer(self.db_name) as conn:
+                        conn.execute("INSERT INTO items VALUES (?);", (value,))
+
+            threads = [threading.Thread(target=insert_many) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            with self.pool.reader(self.db_name) as conn:
+                count = conn.execute("SELECT COUNT(*) FROM items;").fetchone()[0]
+            self.assertEqual(count, 201)
+
+    def test_close(self) -> None:
+        with self.pool.reader(self.db_name) as conn:
+            pass
+
+        self.pool.close()
+
+        with self.subTest(msg="Should close idle connections"):
+            with self.assertRaises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1;")
+
+        with self.subTest(msg="Should reopen connections on demand"):
+            with self.pool.reader(self.db_name) as conn:
+                self.assertEqual(conn.execute("SELECT 1;").fetchone()[0], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,68 @@
+# pylint: disable=C0115
+# pylint: disable=C0111
+"""Tested functions
+
+- iter_solutions
+- solve
+- count_solutions
+- solve_many
+"""
+
+import unittest
+from itertools import islice
+
+import dlx
+import solver
+from logic import check_board
+from utils import parse_puzzle_string
+
+PUZZLE: str = (
+    "302401809001000300000000000"
+    "040708010780502036000090000"
+    "200609003900000008800070005"
+)
+
+
+class TestDlx(unittest.TestCase):
+
+    def test_solve_matches_solver(self) -> None:
+        grid = parse_puzzle_string(PUZZLE)
+
+        for select in (dlx.select_min, dlx.select_first):
+            with self.subTest(select=select.__name__):
+                self.assertEqual(dlx.solve(grid, select=select), solver.solve(grid))
+
+    def test_count_solutions(self) -> None:
+        test_cases: list[tuple[str, int, str]] = [
+            (PUZZLE, 1, "Should prove a unique solution"),
+            ("0" * 81, 2, "Should stop at the limit on an empty board"),
+            ("11" + "0" * 79, 0, "Should find no solution for clashing givens"),
+        ]
+
+        for puzzle_str, expected, description in test_cases:
+            with self.subTest(msg=description):
+                grid = parse_puzzle_string(puzzle_str)
+                self.assertEqual(dlx.count_solutions(grid), expected)
+
+    def test_iter_solutions_empty_board(self) -> None:
+        empty = [[0] * 9 for _ in range(9)]
+        solutions = list(islice(dlx.iter_solutions(empty), 50))
+
+        self.assertEqual(len(solutions), 50)
+        self.assertTrue(all(check_board(solution) for solution in solutions))
+        self.assertEqual(
+            len({str(solution) for solution in solutions}),
+            50,
+            "Should enumerate distinct solutions",
+        )
+
+    def test_solve_many(self) -> None:
+        puzzles = [PUZZLE, "bogus", "\u0663" * 81]
+        results = list(dlx.solve_many(puzzles))
+
+        self.assertEqual(results, list(solver.solve_many(puzzles)))
+        self.assertIsNone(results[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+# pylint: disable=C0115
+# pylint: disable=C0111
+"""Tested functions
+
+- random_grid
+- dig
+- generate
+- generate_many
+- generate_into_db
+"""
+
+import os
+import random
+import sqlite3
+import tempfile
+import unittest
+
+from db_utils import close_connections, setup_database
+from generator import (
+    BANDS,
+    dig,
+    generate,
+    generate_into_db,
+    generate_many,
+    random_grid,
+)
+from grader import grade_string
+from logic import check_board
+from solver import count_solutions
+from utils import parse_puzzle_string
+
+
+def to_grid(cells: list[int]) -> list[list[int]]:
+    return [cells[row : row + 9] for row in range(0, 81, 9)]
+
+
+class TestGenerator(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.rng = random.Random(4)
+
+    def test_random_grid(self) -> None:
+        grids = [random_grid(self.rng) for _ in range(5)]
+
+        for grid in grids:
+            with self.subTest(msg="Should be a full valid grid"):
+                self.assertNotIn(0, grid)
+                self.assertTrue(check_board(to_grid(grid)))
+
+        self.assertEqual(len({tuple(grid) for grid in grids}), 5, "Should vary")
+
+    def test_dig(self) -> None:
+        for _ in range(5):
+            solution = random_grid(self.rng)
+            cells, removed = dig(solution, self.rng)
+
+            with self.subTest(msg="Should keep a unique solution"):
+                self.assertEqual(count_solutions(to_grid(cells)), 1)
+
+            with self.subTest(msg="Should only remove the reported cells"):
+                self.assertEqual(
+                    sorted(removed), [idx for idx in range(81) if not cells[idx]]
+                )
+                for idx in range(81):
+                    if cells[idx]:
+                        self.assertEqual(cells[idx], solution[idx])
+
+            with self.subTest(msg="Should leave no removable clue"):
+                for idx in range(81):
+                    if cells[idx]:
+                        trial = cells[:]
+                        trial[idx] = 0
+                        self.assertEqual(count_solutions(to_grid(trial)), 2)
+
+        with self.subTest(msg="Should respect the clue floor"):
+            cells, _ = dig(random_grid(self.rng), self.rng, min_clues=40)
+            self.assertEqual(81 - cells.count(0), 40)
+
+    def test_generate_bands(self) -> None:
+        for difficulty, (low, high) in BANDS.items():
+            puzzle_str, score = generate(self.rng, low, high)
+
+            with self.subTest(msg=f"Should generate a unique {difficulty} puzzle"):
+                self.assertTrue(low <= score < high)
+                self.assertEqual(grade_string(puzzle_str).score, score)
+                grid = parse_puzzle_string(puzzle_str)
+                self.assertEqual(count_solutions(grid), 1)
+
+        with self.subTest(msg="Should give up on an empty band"):
+            self.assertIsNone(generate(self.rng, 5.0, 5.0, attempts=2))
+
+    def test_generate_many(self) -> None:
+        with self.subTest(msg="Should be reproducible with a seed"):
+            first = list(generate_many(3, "easy", seed=7, chunk_size=2))
+            self.assertEqual(len(first), 3)
+            self.assertEqual(
+                first, list(generate_many(3, "easy", seed=7, chunk_size=2))
+            )
+
+        with self.subTest(msg="Should give the same puzzles in parallel"):
+            parallel = list(generate_many(3, "easy", workers=2, seed=7, chunk_size=2))
+            self.assertEqual(parallel, first)
+
+        with self.subTest(msg="Should stop short when out of attempts"):
+            self.assertEqual(list(generate_many(3, "easy", seed=7, attempts=0)), [])
+
+        with self.subTest(msg="Should reject unknown difficulties"):
+            with self.assertRaises(ValueError):
+                list(generate_many(1, "impossible"))
+
+    def test_generate_into_db(self) -> None:
+        with tempfile.TemporaryDirectory() as folder:
+            db_name = os.path.join(folder, "generated.db")
+            setup_database(db_name=db_name)
+
+            report = generate_into_db(db_name, 4, "medium", batch_size=3)
+
+            with sqlite3.connect(db_name) as conn:
+                rows = conn.execute(
+                    "SELECT puzzle_string, difficulty FROM puzzles;"
+                ).fetchall()
+            conn.close()
+            close_connections()
+
+        self.assertEqual(report, (4, 4, 4))
+        self.assertEqual(report.shortfall, 0)
+        for puzzle_str, difficulty in rows:
+            with self.subTest(msg="Should store labelled puzzles"):
+                self.assertEqual(difficulty, "medium")
+                self.assertEqual(len(puzzle_str), 81)
+
+
+if __name__ == "__main__":
+    unittest.main()
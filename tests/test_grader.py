@@ -0,0 +1,160 @@
+# pylint: disable=C0115
+# pylint: disable=C0111
+"""Tested functions
+
+- grade
+- grade_string
+- grade_many
+- next_step
+"""
+
+import unittest
+
+from candidates import ALL_DIGITS, BIT, PEERS
+from grader import (
+    GUESS_RATING,
+    RATINGS,
+    TECHNIQUES,
+    grade,
+    grade_many,
+    grade_string,
+    next_step,
+)
+from solver import solve
+from utils import parse_puzzle_string
+
+EASY_PUZZLE: str = (
+    "050703060007000800000816000"
+    "000030000005000100730040086"
+    "906000204840572093000409000"
+)
+
+HARD_PUZZLE: str = (
+    "800000000003600000070090200"
+    "050007000000045700000100030"
+    "001000068008500010090000400"
+)
+
+# Rated 4.1 in the shipped puzzles.txt; needs an X-Wing and XY-Wings.
+XY_WING_PUZZLE: str = (
+    "108500406000070900530004007"
+    "001060008090408070800050600"
+    "700100069006080000904006205"
+)
+
+
+def candidates_of(cells: list[int]) -> list[int]:
+    cands = [0] * 81
+    for idx in range(81):
+        if not cells[idx]:
+            cands[idx] = ALL_DIGITS
+            for peer in PEERS[idx]:
+                cands[idx] &= ~BIT[cells[peer]]
+    return cands
+
+
+class TestGrader(unittest.TestCase):
+
+    def test_grade_easy(self) -> None:
+        result = grade_string(EASY_PUZZLE)
+
+        with self.subTest(msg="Should solve with singles only"):
+            self.assertIsNotNone(result)
+            self.assertLessEqual(
+                set(result.techniques),
+                {"hidden_single_square", "hidden_single_line", "naked_single"},
+            )
+            self.assertLess(result.score, 2.5)
+
+        with self.subTest(msg="Should return the solution"):
+            solution = solve(parse_puzzle_string(EASY_PUZZLE))
+            self.assertEqual(
+                result.solution, "".join(str(num) for row in solution for num in row)
+            )
+
+        with self.subTest(msg="Should count the steps of every technique"):
+            self.assertEqual(sum(result.techniques.values()), len(result.steps))
+            self.assertEqual(
+                sum(len(step.placements) for step in result.steps),
+                EASY_PUZZLE.count("0"),
+            )
+
+    def test_score_is_hardest_technique(self) -> None:
+        for puzzle_str in (EASY_PUZZLE, HARD_PUZZLE, XY_WING_PUZZLE):
+            result = grade_string(puzzle_str)
+            with self.subTest(msg=f"Should score {puzzle_str[:9]} by its hardest step"):
+                self.assertEqual(
+                    result.score, max(RATINGS[step.technique] for step in result.steps)
+                )
+
+        with self.subTest(msg="Should need a guess for a puzzle beyond the techniques"):
+            self.assertEqual(grade_string(HARD_PUZZLE).score, GUESS_RATING)
+
+        with self.subTest(msg="Should need advanced techniques"):
+            result = grade_string(XY_WING_PUZZLE)
+            self.assertEqual(result.score, RATINGS["xy_wing"])
+            self.assertIn("x_wing", result.techniques)
+
+    def test_steps_are_sound(self) -> None:
+        for puzzle_str in (EASY_PUZZLE, XY_WING_PUZZLE):
+            solution = grade_string(puzzle_str).solution
+            cells = [int(char) for char in puzzle_str]
+            cands = candidates_of(cells)
+
+            for step in grade_string(puzzle_str).steps:
+                with self.subTest(msg=f"Should only make true deductions ({step})"):
+                    for idx, num in step.placements:
+                        self.assertEqual(int(solution[idx]), num)
+                    for idx, num in step.eliminations:
+                        self.assertNotEqual(int(solution[idx]), num)
+                        self.assertTrue(cands[idx] & BIT[num])
+
+    def test_next_step(self) -> None:
+        cells = [int(char) for char in XY_WING_PUZZLE]
+        cands = candidates_of(cells)
+        step = next_step(cells, cands)
+
+        with self.subTest(msg="Should pick the easiest technique first"):
+            self.assertEqual(step.technique, TECHNIQUES[0][0])
+            self.assertEqual(len(step.placements), 1)
+
+        with self.subTest(msg="Should not change the position"):
+            self.assertEqual(cells, [int(char) for char in XY_WING_PUZZLE])
+
+        with self.subTest(msg="Should return None once solved"):
+            solved = [int(char) for char in grade_string(XY_WING_PUZZLE).solution]
+            self.assertIsNone(next_step(solved, [0] * 81))
+
+    def test_invalid_puzzles(self) -> None:
+        with self.subTest(msg="Should reject malformed strings"):
+            self.assertIsNone(grade_string("123"))
+            self.assertIsNone(grade_string("x" * 81))
+
+        with self.subTest(msg="Should reject clashing givens"):
+            self.assertIsNone(grade_string("11" + "0" * 79))
+
+        with self.subTest(msg="Should reject grids of the wrong shape"):
+            self.assertIsNone(grade([[0] * 9] * 8))
+
+        with self.subTest(msg="Should accept dots and nested grids"):
+            self.assertEqual(
+                grade_string(EASY_PUZZLE.replace("0", ".")).score,
+                grade(parse_puzzle_string(EASY_PUZZLE)).score,
+            )
+
+    def test_grade_many(self) -> None:
+        puzzles = [EASY_PUZZLE, "11" + "0" * 79, XY_WING_PUZZLE]
+        expected = [grade_string(EASY_PUZZLE).score, None]
+        expected.append(grade_string(XY_WING_PUZZLE).score)
+
+        with self.subTest(msg="Should score in order"):
+            self.assertEqual(list(grade_many(puzzles)), expected)
+
+        with self.subTest(msg="Should give the same scores in parallel"):
+            self.assertEqual(
+                list(grade_many(puzzles, workers=2, chunk_size=1)), expected
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+# pylint: disable=C0115
+# pylint: disable=C0111
+"""Tested functions
+
+- find_hint
+- apply_hint
+"""
+
+import unittest
+
+from board import Board
+from grader import grade_string
+from hints import TITLES, apply_hint, find_hint
+from utils import parse_puzzle_string
+
+EASY_PUZZLE: str = (
+    "050703060007000800000816000"
+    "000030000005000100730040086"
+    "906000204840572093000409000"
+)
+
+# Rated 4.1 in the shipped puzzles.txt; needs an X-Wing and XY-Wings.
+XY_WING_PUZZLE: str = (
+    "108500406000070900530004007"
+    "001060008090408070800050600"
+    "700100069006080000904006205"
+)
+
+
+def board_of(puzzle_str: str) -> Board:
+    return Board(parse_puzzle_string(puzzle_str))
+
+
+class TestHints(unittest.TestCase):
+
+    def test_find_hint(self) -> None:
+        board = board_of(EASY_PUZZLE)
+        hint = find_hint(board)
+        solution = grade_string(EASY_PUZZLE).solution
+
+        with self.subTest(msg="Should give the easiest technique"):
+            self.assertEqual(hint.technique, "hidden_single_square")
+            self.assertEqual(len(hint.placements), 1)
+
+        with self.subTest(msg="Should place the right digit"):
+            row, col, num = hint.placements[0]
+            self.assertEqual(int(solution[row * 9 + col]), num)
+
+        with self.subTest(msg="Should name the target cell in the explanation"):
+            self.assertIn(f"r{row + 1}c{col + 1} is {num}", hint.explanation)
+            self.assertTrue(hint.explanation.startswith(TITLES[hint.technique]))
+
+        with self.subTest(msg="Should point at the cells of the box"):
+            self.assertEqual(len(hint.cells), 9)
+            self.assertIn((row, col), hint.cells)
+
+        with self.subTest(msg="Should not change the board"):
+            self.assertEqual(board.state, parse_puzzle_string(EASY_PUZZLE))
+            self.assertEqual(board.cursor, 0)
+
+    def test_hinted_game(self) -> None:
+        board = board_of(XY_WING_PUZZLE)
+        solution = grade_string(XY_WING_PUZZLE).solution
+        techniques = set()
+
+        while (hint := find_hint(board, budget=None)) is not None:
+            techniques.add(hint.technique)
+            for row, col, num in hint.placements + hint.eliminations:
+                with self.subTest(msg=f"Should only make true deductions ({hint})"):
+                    is_placement = (row, col, num) in hint.placements
+                    self.assertEqual(int(solution[row * 9 + col]) == num, is_placement)
+            self.assertTrue(apply_hint(board, hint))
+
+        with self.subTest(msg="Should lead to the solution"):
+            self.assertTrue(board.is_solved())
+            self.assertIn("xy_wing", techniques)
+
+        with self.subTest(msg="Should undo a hint as one move"):
+            moves = board.cursor
+            board.undo()
+            self.assertEqual(board.cursor, moves - 1)
+            self.assertFalse(board.is_solved())
+
+    def test_pencil_marks(self) -> None:
+        board = board_of(XY_WING_PUZZLE)
+        while (hint := find_hint(board)) and not hint.eliminations:
+            apply_hint(board, hint)
+
+        with self.subTest(msg="Should pencil the grid to apply eliminations"):
+            apply_hint(board, hint)
+            for row, col, num in hint.eliminations:
+                self.assertNotIn(num, board.pencil_marks[row][col])
+            self.assertTrue(
+                all(
+                    board.marks[idx]
+                    for idx in range(81)
+                    if not board.state[idx // 9][idx % 9]
+                )
+            )
+
+        with self.subTest(msg="Should not repeat applied eliminations"):
+            self.assertNotEqual(find_hint(board), hint)
+
+    def test_no_hint(self) -> None:
+        with self.subTest(msg="Should give none for a solved board"):
+            solution = grade_string(EASY_PUZZLE).solution
+            self.assertIsNone(find_hint(board_of(solution)))
+
+        with self.subTest(msg="Should give none for clashing givens"):
+            self.assertIsNone(find_hint(board_of("11" + "0" * 79)))
+
+        with self.subTest(msg="Should give none once the budget is spent"):
+            board = board_of("0" * 81)
+            self.assertIsNone(find_hint(board, budget=0.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
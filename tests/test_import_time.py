@@ -0,0 +1,76 @@
+# pylint: disable=C0115
+# pylint: disable=C0111
+"""Tested modules
+
+- board, candidates, logic, solver, utils, constants
+- db_utils, prefetch, packed
+- grader, generator, canonical, compact_board, dlx
+- hints, render, analysis
+"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+# The headless core: everything but the Kivy UI (main, settings) and the
+# numpy-backed batch checker.
+CORE_MODULES: tuple[str, ...] = (
+    "board",
+    "candidates",
+    "logic",
+    "solver",
+    "utils",
+    "constants",
+    "db_utils",
+    "prefetch",
+    "packed",
+    "grader",
+    "generator",
+    "canonical",
+    "compact_board",
+    "dlx",
+    "hints",
+    "render",
+    "analysis",
+)
+
+# The import time itself is gated by benchmarks/suite.py, where timings are
+# compared on one machine instead of asserted on a shared runner.
+PROBE: str = f"""
+import json, sys
+import {", ".join(CORE_MODULES)}
+print(json.dumps(
+    sorted(name for name in sys.modules if name.split(".")[0] == "kivy")
+))
+"""
+
+
+def probe() -> list[str]:
+    """Imports the core in a fresh interpreter and returns the Kivy modules
+    it loaded."""
+
+    env = dict(os.environ, PYTHONPATH=SRC)
+
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_core_is_headless(self) -> None:
+        with self.subTest(msg="Should not import Kivy"):
+            self.assertEqual(probe(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
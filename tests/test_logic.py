@@ -5,12 +5,13 @@
 - check_row
 - check_col
 - check_sqr
+- check_move
 - check_board
 """
 
 import unittest
 
-from logic import check_row, check_col, check_sqr, check_board
+from logic import check_row, check_col, check_sqr, check_move, check_board
 
 
 class TestLogic(unittest.TestCase):
@@ -173,6 +174,29 @@ class TestLogic(unittest.TestCase):
             "Should be True even with zeroes present",
         )
 
+    def test_out_of_range_values(self):
+        state = [[0] * 9 for _ in range(9)]
+        state[0][0] = 10
+        state[0][1] = 10
+        state[1][1] = 5
+
+        # num: (row 0, column 0, square 0, move at (0, 0))
+        expected = {
+            10: (False, False, False, False),
+            11: (True, True, True, True),
+            5: (True, True, False, False),
+        }
+
+        for num, (row, col, sqr, move) in expected.items():
+            with self.subTest(msg="Should count numbers outside 1-9", num=num):
+                self.assertEqual(check_row(state, 0, num), row)
+                self.assertEqual(check_col(state, 0, num), col)
+                self.assertEqual(check_sqr(state, 0, num), sqr)
+                self.assertEqual(check_move(state, 0, 0, num), move)
+
+        with self.subTest(msg="Should ignore cells above 9 when checking duplicates"):
+            self.assertTrue(check_board(state))
+
 
 if __name__ == "__main__":
     unittest.main()
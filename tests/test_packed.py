@@ -0,0 +1,149 @@
+# pylint: disable=C0115
+# pylint: disable=C0111
+"""Tested functions
+
+- pack_puzzle
+- unpack_puzzle
+- write_packed
+- convert_text
+- convert_db
+- PackedPuzzles
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from packed import (
+    HEADER,
+    RECORD_SIZE,
+    PackedPuzzles,
+    convert_db,
+    convert_text,
+    pack_puzzle,
+    unpack_puzzle,
+    write_packed,
+)
+
+PUZZLE_A = (
+    "050703060007000800000816000"
+    "000030000005000100730040086"
+    "906000204840572093000409000"
+)
+PUZZLE_B = "0" * 80 + "9"
+
+
+class TestPacking(unittest.TestCase):
+
+    def test_pack_puzzle(self) -> None:
+        with self.subTest(msg="Should pack two cells per byte"):
+            packed = pack_puzzle(PUZZLE_A)
+            self.assertEqual(len(packed), 41)
+            self.assertEqual(packed[0], 0x05)
+            self.assertEqual(packed[-1], 0x00)
+
+        with self.subTest(msg="Should round-trip through unpack_puzzle"):
+            for puzzle in (PUZZLE_A, PUZZLE_B, "9" * 81):
+                self.assertEqual(unpack_puzzle(pack_puzzle(puzzle)), puzzle)
+
+        with self.subTest(msg="Should reject malformed strings"):
+            for puzzle in ("0" * 80, "0" * 82, "." * 81, "a" * 81, "\u0663" * 81):
+                with self.assertRaises(ValueError, msg=f"Failed for {puzzle!r}"):
+                    pack_puzzle(puzzle)
+
+
+class TestPackedPuzzles(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.folder = tempfile.TemporaryDirectory()  # pylint: disable=R1732
+        self.path = os.path.join(self.folder.name, "puzzles.sdkp")
+
+    def tearDown(self) -> None:
+        self.folder.cleanup()
+
+    def test_write_packed(self) -> None:
+        rows = [(PUZZLE_A, "easy"), (PUZZLE_B, None), (PUZZLE_A, "legendary")]
+        count = write_packed(self.path, rows)
+
+        with self.subTest(msg="Should write a header and fixed-size records"):
+            self.assertEqual(count, 3)
+            self.assertEqual(os.path.getsize(self.path), HEADER.size + 3 * RECORD_SIZE)
+
+        with PackedPuzzles(self.path) as puzzles:
+            with self.subTest(msg="Should read records back by index"):
+                self.assertEqual(len(puzzles), 3)
+                self.assertEqual(puzzles[0], (PUZZLE_A, "easy"))
+                self.assertEqual(puzzles[-2], (PUZZLE_B, None))
+                self.assertEqual(puzzles.difficulty(0), "easy")
+                self.assertEqual(puzzles.grid(1)[8][8], 9)
+
+            with self.subTest(msg="Should store unknown difficulties as unrated"):
+                self.assertIsNone(puzzles.difficulty(2))
+
+            with self.subTest(msg="Should iterate in file order"):
+                self.assertEqual(
+                    [puzzle for puzzle, _ in puzzles], [PUZZLE_A, PUZZLE_B, PUZZLE_A]
+                )
+
+            with self.subTest(msg="Should expose records without copying"):
+                record = puzzles.record(1)
+                self.assertIsInstance(record, memoryview)
+                self.assertEqual(len(record), RECORD_SIZE)
+                self.assertEqual(len(puzzles.buffer), 3 * RECORD_SIZE)
+                record.release()
+
+            with self.subTest(msg="Should reject out of range indices"):
+                with self.assertRaises(IndexError):
+                    puzzles.record(3)
+
+    def test_invalid_files(self) -> None:
+        with self.subTest(msg="Should reject a file without the header"):
+            with open(self.path, "wb") as file:
+                file.write(b"SDK")
+            with self.assertRaises(ValueError):
+                PackedPuzzles(self.path)
+
+        with self.subTest(msg="Should reject a foreign file"):
+            with open(self.path, "wb") as file:
+                file.write(b"x" * 64)
+            with self.assertRaises(ValueError):
+                PackedPuzzles(self.path)
+
+        with self.subTest(msg="Should reject a truncated file"):
+            write_packed(self.path, [(PUZZLE_A, "easy"), (PUZZLE_B, "hard")])
+            with open(self.path, "r+b") as file:
+                file.truncate(HEADER.size + RECORD_SIZE)
+            with self.assertRaises(ValueError):
+                PackedPuzzles(self.path)
+
+    def test_convert_text(self) -> None:
+        dump = os.path.join(self.folder.name, "dump.txt")
+        with open(dump, "w", encoding="utf-8") as file:
+            file.write(f"id1 {PUZZLE_A}  1.2\nnot a puzzle\n{PUZZLE_B}\n")
+
+        self.assertEqual(convert_text(dump, self.path), 2)
+        with PackedPuzzles(self.path) as puzzles:
+            self.assertEqual(list(puzzles), [(PUZZLE_A, "easy"), (PUZZLE_B, None)])
+
+    def test_convert_db(self) -> None:
+        db_name = os.path.join(self.folder.name, "puzzles.db")
+        conn = sqlite3.connect(db_name)
+        with conn:
+            conn.execute(
+                "CREATE TABLE puzzles (id INTEGER PRIMARY KEY, "
+                "puzzle_string TEXT, difficulty TEXT);"
+            )
+            conn.executemany(
+                "INSERT INTO puzzles VALUES (?, ?, ?);",
+                [(2, PUZZLE_B, "hard"), (1, PUZZLE_A, "medium")],
+            )
+        conn.close()
+
+        self.assertEqual(convert_db(db_name, self.path), 2)
+        with PackedPuzzles(self.path) as puzzles:
+            self.assertEqual(list(puzzles), [(PUZZLE_A, "medium"), (PUZZLE_B, "hard")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+# pylint: disable=C0115
+# pylint: disable=C0111
+"""Tested functions
+
+- PuzzlePrefetcher
+- load_solution
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+import db_utils
+import solver
+from constants import EXAMPLE_BOARD
+from prefetch import PuzzlePrefetcher, load_solution
+
+SOLUTION = solver.solve(EXAMPLE_BOARD)
+
+
+def wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestPuzzlePrefetcher(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.calls: list[str] = []
+        self.solved_on: list[str] = []
+        self.lock = threading.Lock()
+
+    def loader(self, difficulty: str, db_name: str) -> list[list[int]]:
+        with self.lock:
+            self.calls.append(difficulty)
+        if difficulty == "broken":
+            raise sqlite3.OperationalError("database is locked")
+        if difficulty == "missing":
+            return [[]]
+        return [row[:] for row in EXAMPLE_BOARD]
+
+    def solution_loader(
+        self, grid: list[list[int]], db_name: str
+    ) -> list[list[int]] | None:
+        with self.lock:
+            self.solved_on.append(threading.current_thread().name)
+        return solver.solve(grid)
+
+    def make(self, **kwargs) -> PuzzlePrefetcher:
+        kwargs.setdefault("solution_loader", self.solution_loader)
+        prefetcher = PuzzlePrefetcher("unused.db", loader=self.loader, **kwargs)
+        self.addCleanup(prefetcher.stop)
+        return prefetcher
+
+    def test_get(self) -> None:
+        prefetcher = self.make(difficulties=("easy", "hard"), depth=2)
+
+        with self.subTest(msg="Should load synchronously before the worker starts"):
+            self.assertEqual(prefetcher.get("easy"), EXAMPLE_BOARD)
+            self.assertEqual((prefetcher.hits, prefetcher.misses), (0, 1))
+
+        prefetcher.start()
+
+        with self.subTest(msg="Should fill every queue up to the depth"):
+            filled = wait_for(
+                lambda: prefetcher.ready("easy") == 2 and prefetcher.ready("hard") == 2
+            )
+            self.assertTrue(filled, "Queues should fill in the background")
+
+        with self.subTest(msg="Should serve ready grids as hits"):
+            self.assertEqual(prefetcher.get("hard"), EXAMPLE_BOARD)
+            self.assertEqual((prefetcher.hits, prefetcher.misses), (1, 1))
+
+        with self.subTest(msg="Should refill after a pop"):
+            self.assertTrue(wait_for(lambda: prefetcher.ready("hard") == 2))
+
+        with self.subTest(msg="Should hand out independent grids"):
+            first, second = prefetcher.get("easy"), prefetcher.get("easy")
+            first[0][0] = 9
+            self.assertNotEqual(first, second)
+
+        with self.subTest(msg="Should start a queue for a new difficulty"):
+            prefetcher.get("medium")
+            self.assertTrue(wait_for(lambda: prefetcher.ready("medium") == 2))
+
+    def test_get_game(self) -> None:
+        prefetcher = self.make(difficulties=("easy",), depth=2)
+        prefetcher.start()
+        self.assertTrue(wait_for(lambda: prefetcher.ready("easy") == 2))
+
+        with self.subTest(msg="Should find solutions on the worker thread"):
+            with self.lock:
+                self.assertEqual(
+                    self.solved_on, [prefetcher._thread.name] * 2
+                )  # pylint: disable=W0212
+
+        with self.subTest(msg="Should hand out each grid with its solution"):
+            self.assertEqual(prefetcher.get_game("easy"), (EXAMPLE_BOARD, SOLUTION))
+
+        with self.subTest(msg="Should not solve again on the caller's thread"):
+            with self.lock:
+                self.assertNotIn(threading.current_thread().name, self.solved_on)
+
+        with self.subTest(msg="Should give no solution when loading fails"):
+            self.assertEqual(prefetcher.get_game("broken"), ([[]], None))
+
+    def test_errors(self) -> None:
+        prefetcher = self.make(difficulties=("broken", "missing"), retry_delay=60)
+        prefetcher.start()
+
+        self.assertTrue(wait_for(lambda: prefetcher.errors == 2))
+
+        with self.subTest(msg="Should return an empty grid when loading fails"):
+            self.assertEqual(prefetcher.get("broken"), [[]])
+            self.assertEqual(prefetcher.get("missing"), [[]])
+
+        with self.subTest(msg="Should back off instead of retrying in a loop"):
+            time.sleep(0.1)
+            with self.lock:
+                calls = len(self.calls)
+            time.sleep(0.1)
+            with self.lock:
+                self.assertLessEqual(len(self.calls), calls + 2)
+
+    def test_stop(self) -> None:
+        prefetcher = self.make()
+        prefetcher.start()
+        prefetcher.stop()
+
+        self.assertIsNone(prefetcher._thread)  # pylint: disable=W0212
+        with self.subTest(msg="Should still load synchronously once stopped"):
+            self.assertEqual(prefetcher.get("easy"), EXAMPLE_BOARD)
+
+
+class TestLoadSolution(unittest.TestCase):
+
+    def setUp(self) -> None:
+        handle, self.db_name = tempfile.mkstemp(suffix=".db")
+        os.close(handle)
+        self.addCleanup(os.remove, self.db_name)
+        self.addCleanup(db_utils.close_connections)
+        db_utils.setup_database(db_name=self.db_name)
+
+    def test_load_solution(self) -> None:
+        with self.subTest(msg="Should solve puzzles without a stored solution"):
+            self.assertEqual(load_solution(EXAMPLE_BOARD, self.db_name), SOLUTION)
+
+        with self.subTest(msg="Should return the stored solution"):
+            puzzle_str = "".join(str(num) for row in EXAMPLE_BOARD for num in row)
+            db_utils.insert_puzzles(self.db_name, [(puzzle_str, "easy")])
+            db_utils.backfill_solution(self.db_name)
+            self.assertIsNotNone(db_utils.load_solution(puzzle_str, self.db_name))
+            db_utils.close_connections()
+            self.assertEqual(load_solution(EXAMPLE_BOARD, self.db_name), SOLUTION)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,267 @@
+# pylint: disable=C0115
+# pylint: disable=C0111
+"""Tested functions
+
+- mark_text
+- mark_content
+- MarkTextures
+- GridRenderer.render
+- GridRenderer.content
+- GridRenderer.set_board
+- GridRenderer.resize
+- GridRenderer.timed_render
+"""
+
+import unittest
+from copy import deepcopy as copy
+from types import SimpleNamespace
+
+import constants as c
+from board import Board
+from constants import TEST_BOARD
+from render import MARK_CACHE_SIZE, GridRenderer, MarkTextures, mark_content, mark_text
+
+
+class Widget(SimpleNamespace):
+    """Stand-in for a cell button that counts property writes."""
+
+    def __init__(self):
+        super().__init__(text=None, font_size=None, color=None, mark_texture=None)
+        object.__setattr__(self, "writes", 0)
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, "writes", self.writes + 1)
+        object.__setattr__(self, name, value)
+
+
+class Clock:
+    """Stand-in for kivy.clock.Clock that runs callbacks on demand."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def schedule_once(self, callback, timeout):
+        self.scheduled.append((callback, timeout))
+
+    def tick(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for callback, _ in scheduled:
+            callback(1 / 60)
+
+
+class TestRender(unittest.TestCase):
+
+    def setUp(self):
+        self.board = Board(copy(TEST_BOARD))
+        self.cells = [[Widget() for _ in range(9)] for _ in range(9)]
+        self.renderer = GridRenderer(self.board, self.cells, 30)
+        self.renderer.render(full=True)
+
+    def writes(self) -> int:
+        return sum(widget.writes for row in self.cells for widget in row)
+
+    def test_mark_text(self):
+        with self.subTest(msg="Should keep every digit in its spot"):
+            self.assertEqual(
+                mark_text(0b100010001),
+                "1" + " " * 12 + "\n" + " " * 6 + "5" + " " * 6 + "\n" + " " * 12 + "9",
+            )
+
+        with self.subTest(msg="Should lay out three lines"):
+            self.assertEqual(mark_text(0x1FF), "1   2   3\n4   5   6\n7   8   9")
+
+    def test_full_render(self):
+        with self.subTest(msg="Should draw the givens and empty cells"):
+            for i in range(9):
+                for j in range(9):
+                    number = TEST_BOARD[i][j]
+                    widget = self.cells[i][j]
+                    self.assertEqual(widget.text, str(number) if number else "")
+                    self.assertEqual(widget.font_size, 30)
+                    self.assertEqual(widget.color, c.BLACK)
+
+        with self.subTest(msg="Should write nothing when nothing changed"):
+            before = self.writes()
+            self.assertEqual(self.renderer.render(), 0)
+            self.assertEqual(self.renderer.render(full=True), 0)
+            self.assertEqual(self.writes(), before)
+
+    def test_set_cell(self):
+        self.board.set_cell(3, 3, 5)
+
+        with self.subTest(msg="Should only update the changed cell"):
+            before = self.writes()
+            self.assertEqual(self.renderer.render(), 1)
+            self.assertEqual(self.cells[3][3].text, "5")
+            self.assertEqual(self.writes() - before, 1)
+
+        with self.subTest(msg="Should update peers whose marks changed"):
+            board = Board()
+            cells = [[Widget() for _ in range(9)] for _ in range(9)]
+            renderer = GridRenderer(board, cells, 30)
+            board.set_marks(0, 1, 0b11)
+            board.set_marks(8, 8, 0b11)
+            renderer.render(full=True)
+
+            board.set_cell(0, 0, 1)
+            self.assertEqual(renderer.render(), 2)
+            self.assertEqual(cells[0][0].text, "1")
+            self.assertEqual(cells[0][1].text, mark_text(0b10))
+            self.assertEqual(cells[8][8].text, mark_text(0b11))
+
+    def test_undo_and_reset(self):
+        self.board.set_marks(6, 7, 0b11)
+        self.board.set_cell(3, 3, 5)
+        self.renderer.render()
+
+        with self.subTest(msg="Should redraw the cells an undo changes"):
+            self.board.undo()
+            self.assertEqual(self.renderer.render(), 1)
+            self.assertEqual(self.cells[3][3].text, "")
+
+        with self.subTest(msg="Should redraw the cells a reset clears"):
+            self.board.reset()
+            self.assertEqual(self.renderer.render(), 1)
+            self.assertEqual(self.cells[6][7].text, "")
+            self.assertEqual(self.cells[6][7].font_size, 30)
+
+    def test_mistake(self):
+        # Not a valid solution, but it makes 5 at (3, 3) a mistake.
+        solution = copy(TEST_BOARD)
+        solution[3][3], solution[6][7] = 9, 1
+        board = Board(copy(TEST_BOARD), solution)
+        self.renderer.set_board(board)
+        self.renderer.render(full=True)
+
+        with self.subTest(msg="Should draw a wrong digit in red"):
+            board.set_cell(3, 3, 5)
+            self.assertEqual(self.renderer.render(), 1)
+            self.assertEqual(self.cells[3][3].color, c.RED)
+
+        with self.subTest(msg="Should go back to black when cleared"):
+            board.clear_cell(3, 3)
+            board.set_cell(6, 7, 1)
+            self.renderer.render()
+            self.assertEqual(self.cells[3][3].color, c.BLACK)
+            self.assertEqual(self.cells[6][7].color, c.BLACK)
+
+    def test_set_board(self):
+        self.board.set_cell(3, 3, 5)
+        self.renderer.render()
+
+        board = Board(copy(TEST_BOARD))
+        self.renderer.set_board(board)
+
+        with self.subTest(msg="Should only rewrite the cells that differ"):
+            self.assertEqual(self.renderer.render(full=True), 1)
+            self.assertEqual(self.cells[3][3].text, "")
+
+        with self.subTest(msg="Should follow the new board"):
+            board.set_cell(6, 7, 1)
+            self.assertEqual(self.renderer.render(), 1)
+            self.assertEqual(self.cells[6][7].text, "1")
+
+    def test_mark_content(self):
+        mark_content.cache_clear()
+
+        with self.subTest(msg="Should build each mask's content once"):
+            first = mark_content(0b101, 30)
+            self.assertIs(mark_content(0b101, 30), first)
+            self.assertEqual(first, (mark_text(0b101), 10, c.DGRAY, None))
+            self.assertEqual(mark_content.cache_info().misses, 1)
+
+        with self.subTest(msg="Should stay bounded"):
+            for mask in range(512):
+                for size in (30, 45):
+                    mark_content(mask, size)
+            self.assertEqual(mark_content.cache_info().currsize, MARK_CACHE_SIZE)
+
+    def test_mark_textures(self):
+        built = []
+
+        def make_texture(text, font_size, color):
+            built.append((text, font_size, color))
+            return object()
+
+        board = Board()
+        cells = [[Widget() for _ in range(9)] for _ in range(9)]
+        renderer = GridRenderer(board, cells, 30, make_texture)
+        board.set_marks(0, 0, 0b11)
+        board.set_marks(8, 8, 0b11)
+        renderer.render(full=True)
+
+        with self.subTest(msg="Should draw marks from one shared texture"):
+            self.assertEqual(cells[0][0].text, "")
+            self.assertIsNotNone(cells[0][0].mark_texture)
+            self.assertIs(cells[0][0].mark_texture, cells[8][8].mark_texture)
+            self.assertEqual(built, [(mark_text(0b11), 10, c.DGRAY)])
+
+        with self.subTest(msg="Should reuse cached textures"):
+            board.set_marks(0, 0, 0b1)
+            renderer.render()
+            board.set_marks(0, 0, 0b11)
+            before = sum(widget.writes for row in cells for widget in row)
+            self.assertEqual(renderer.render(), 1)
+            self.assertEqual(
+                sum(widget.writes for row in cells for widget in row), before + 1
+            )
+            self.assertIs(cells[0][0].mark_texture, cells[8][8].mark_texture)
+            self.assertEqual(len(built), 2)
+
+        with self.subTest(msg="Should hide the texture under a digit"):
+            board.set_cell(0, 0, 1)
+            renderer.render()
+            self.assertIsNone(cells[0][0].mark_texture)
+            self.assertEqual(cells[0][0].text, "1")
+
+        with self.subTest(msg="Should rebuild the textures at a new size"):
+            renderer.resize(45)
+            self.assertEqual(built[-1], (mark_text(0b11), 15, c.DGRAY))
+            self.assertEqual(len(built), 3)
+
+        with self.subTest(msg="Should stay bounded"):
+            textures = MarkTextures(make_texture, maxsize=4)
+            for mask in range(1, 10):
+                textures.content(mask, 30)
+            self.assertEqual(textures.content.cache_info().currsize, 4)
+
+    def test_resize(self):
+        self.board.set_marks(6, 7, 0b11)
+        self.renderer.render()
+
+        with self.subTest(msg="Should redraw every cell at the new size"):
+            self.assertEqual(self.renderer.resize(45), 81)
+            self.assertEqual(self.cells[6][7].font_size, 15)
+            self.assertEqual(self.cells[0][0].font_size, 45)
+
+        with self.subTest(msg="Should drop the marks of the old size"):
+            self.assertEqual(mark_content.cache_info().currsize, 1)
+
+        with self.subTest(msg="Should write nothing for the same size"):
+            self.assertEqual(self.renderer.resize(45), 0)
+
+    def test_timed_render(self):
+        clock = Clock()
+        records = []
+        self.board.set_cell(3, 3, 5)
+
+        updated = self.renderer.timed_render(clock, lambda *args: records.append(args))
+
+        with self.subTest(msg="Should render before the frame"):
+            self.assertEqual(updated, 1)
+            self.assertEqual(self.cells[3][3].text, "5")
+            self.assertEqual(records, [])
+            self.assertEqual(len(clock.scheduled), 1)
+            self.assertEqual(clock.scheduled[0][1], 0)
+
+        with self.subTest(msg="Should log once the frame is drawn"):
+            clock.tick()
+            self.assertEqual(len(records), 1)
+            fmt, cells, render_ms, frame_ms = records[0]
+            self.assertEqual(cells, 1)
+            self.assertTrue(0 <= render_ms <= frame_ms)
+            self.assertIn("on screen after", fmt % (cells, render_ms, frame_ms))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+# pylint: disable=C0115
+# pylint: disable=C0111
+"""Tested functions
+
+- solve
+- count_solutions
+- solve_cells
+- solve_many
+"""
+
+import unittest
+
+from logic import check_board
+from solver import count_solutions, solve, solve_cells, solve_many
+from utils import parse_puzzle_string
+
+PUZZLE: str = (
+    "050703060007000800000816000"
+    "000030000005000100730040086"
+    "906000204840572093000409000"
+)
+
+HARD_PUZZLE: str = (
+    "800000000003600000070090200"
+    "050007000000045700000100030"
+    "001000068008500010090000400"
+)
+
+
+class TestSolver(unittest.TestCase):
+
+    def test_solve(self) -> None:
+        for puzzle_str in (PUZZLE, HARD_PUZZLE):
+            grid = parse_puzzle_string(puzzle_str)
+            solution = solve(grid)
+
+            with self.subTest(msg="Should return a complete valid board"):
+                self.assertIsNotNone(solution)
+                self.assertTrue(check_board(solution))
+                self.assertFalse(any(0 in row for row in solution))
+
+            with self.subTest(msg="Should keep the givens"):
+                for row in range(9):
+                    for col in range(9):
+                        if grid[row][col]:
+                            self.assertEqual(grid[row][col], solution[row][col])
+
+            with self.subTest(msg="Should not modify the input grid"):
+                self.assertEqual(grid, parse_puzzle_string(puzzle_str))
+
+    def test_solve_invalid(self) -> None:
+        clashing = parse_puzzle_string("11" + "0" * 79)
+
+        self.assertIsNone(solve(clashing), "Should not solve clashing givens")
+        self.assertIsNone(solve([[]]), "Should not solve a malformed grid")
+
+    def test_count_solutions(self) -> None:
+        test_cases: list[tuple[str, int, int, str]] = [
+            (PUZZLE, 2, 1, "Should find a unique solution"),
+            (HARD_PUZZLE, 2, 1, "Should prove uniqueness of a hard puzzle"),
+            ("0" * 81, 2, 2, "Should stop at the limit on an empty board"),
+            ("0" * 81, 5, 5, "Should honour a custom limit"),
+            ("11" + "0" * 79, 2, 0, "Should find no solution for clashing givens"),
+        ]
+
+        for puzzle_str, limit, expected, description in test_cases:
+            with self.subTest(msg=description):
+                grid = parse_puzzle_string(puzzle_str)
+                self.assertEqual(count_solutions(grid, limit=limit), expected)
+
+    def test_solve_cells(self) -> None:
+        cells = [int(char) for char in PUZZLE]
+        solution = solve_cells(cells)[0]
+
+        with self.subTest(msg="Should match the grid solver"):
+            self.assertEqual(
+                [solution[row : row + 9] for row in range(0, 81, 9)],
+                solve(parse_puzzle_string(PUZZLE)),
+            )
+
+        idx = cells.index(0)
+        with self.subTest(msg="Should find nothing with the only digit excluded"):
+            self.assertEqual(solve_cells(cells, 2, exclude=((idx, solution[idx]),)), [])
+
+        with self.subTest(msg="Should find nothing with a given excluded"):
+            self.assertEqual(solve_cells(cells, exclude=((1, cells[1]),)), [])
+
+        with self.subTest(msg="Should keep excluded digits out of solutions"):
+            solutions = solve_cells([0] * 81, 5, exclude=((0, 1), (0, 2), (40, 5)))
+            self.assertEqual(len(solutions), 5)
+            for found in solutions:
+                self.assertNotIn(found[0], (1, 2))
+                self.assertNotEqual(found[40], 5)
+
+    def test_solve_many(self) -> None:
+        results = list(solve_many([PUZZLE, "bogus", "11" + "0" * 79]))
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(
+            parse_puzzle_string(results[0]), solve(parse_puzzle_string(PUZZLE))
+        )
+        self.assertIsNone(results[1], "Should yield None for malformed input")
+        self.assertIsNone(results[2], "Should yield None for unsolvable input")
+        self.assertIsNone(
+            next(solve_many(["\u0663" * 81])), "Should yield None for non-ASCII digits"
+        )
+
+        with self.subTest(msg="Should give the same results with workers"):
+            puzzles = [PUZZLE, "bogus", HARD_PUZZLE, "11" + "0" * 79]
+            self.assertEqual(
+                list(solve_many(puzzles, workers=2, chunk_size=1)),
+                list(solve_many(puzzles)),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,7 +5,10 @@
 - has_nonzero_duplicate
 - count_zeroes
 - is_valid_input
+- is_puzzle_string
 - parse_puzzle_string
+- parse_puzzle_line
+- flatten
 """
 
 import unittest
@@ -14,9 +17,12 @@ from utils import (
     has_nonzero_duplicate,
     count_zeroes,
     is_valid_input,
+    is_puzzle_string,
     parse_puzzle_string,
-    EXAMPLE_BOARD,
+    parse_puzzle_line,
+    flatten,
 )
+from constants import EXAMPLE_BOARD
 
 
 class TestUtils(unittest.TestCase):
@@ -143,6 +149,22 @@ class TestUtils(unittest.TestCase):
             with self.subTest(msg=description, entry=entry):
                 self.assertEqual(is_valid_input(entry), expected)
 
+    def test_is_puzzle_string(self) -> None:
+        with self.subTest(msg="Should accept 81 ASCII digits"):
+            self.assertTrue(is_puzzle_string("0123456789" * 8 + "9"))
+
+        with self.subTest(msg="Should accept dots only when asked to"):
+            self.assertFalse(is_puzzle_string("." * 81))
+            self.assertTrue(is_puzzle_string("." * 81, dots=True))
+
+        with self.subTest(msg="Should reject non-ASCII digits"):
+            self.assertFalse(is_puzzle_string("\u0663" * 81))
+            self.assertFalse(is_puzzle_string("\u0663" * 81, dots=True))
+
+        with self.subTest(msg="Should reject other lengths"):
+            self.assertFalse(is_puzzle_string("0" * 80))
+            self.assertFalse(is_puzzle_string("0" * 82))
+
     def test_parse_puzzle_string(self) -> None:
         valid_string: str = "123456789" * 9
         parsed_valid_board: list[list[int]] = [
@@ -187,6 +209,65 @@ class TestUtils(unittest.TestCase):
             with self.subTest(msg=description):
                 self.assertEqual(parse_puzzle_string(puzzle_str), expected)
 
+    def test_parse_puzzle_line(self) -> None:
+        puzzle_str: str = "123456789" * 9
+
+        test_cases: list[tuple[str, tuple | None, str]] = [
+            (
+                f"0000183b305c {puzzle_str}  1.2\n",
+                ("0000183b305c", puzzle_str, 1.2),
+                "Should parse the puzzles.txt layout",
+            ),
+            (
+                f"id\t{puzzle_str}   3\n",
+                ("id", puzzle_str, 3.0),
+                "Should accept any whitespace between fields",
+            ),
+            (
+                puzzle_str,
+                ("", puzzle_str, None),
+                "Should accept a bare puzzle string",
+            ),
+            (
+                f"id {puzzle_str} n/a",
+                ("id", puzzle_str, None),
+                "Should ignore a rating that is not a number",
+            ),
+            (
+                "id " + "." * 81,
+                ("id", "0" * 81, None),
+                "Should read dots as empty cells",
+            ),
+            (
+                f"id {puzzle_str[:80]} 1.2",
+                None,
+                "Should reject a line without an 81-cell puzzle",
+            ),
+            (
+                "",
+                None,
+                "Should reject an empty line",
+            ),
+        ]
+
+        for line, expected, description in test_cases:
+            with self.subTest(msg=description):
+                self.assertEqual(parse_puzzle_line(line), expected)
+
+    def test_flatten(self) -> None:
+        with self.subTest(msg="Should list the cells row by row"):
+            cells = flatten(EXAMPLE_BOARD)
+            self.assertEqual(cells[:9], EXAMPLE_BOARD[0])
+            self.assertEqual(cells[-9:], EXAMPLE_BOARD[8])
+
+        with self.subTest(msg="Should reject grids that are not 9x9"):
+            self.assertIsNone(flatten([[]]))
+            self.assertIsNone(flatten([row[:8] for row in EXAMPLE_BOARD]))
+
+        with self.subTest(msg="Should reject values outside 0-9"):
+            self.assertIsNone(flatten([[10] * 9] + EXAMPLE_BOARD[1:]))
+            self.assertIsNone(flatten([["1"] * 9] + EXAMPLE_BOARD[1:]))
+
 
 if __name__ == "__main__":
     unittest.main()